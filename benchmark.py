@@ -0,0 +1,416 @@
+"""
+ZebzeToon bot'unun sıcak yollarını çevrimdışı ölçen benchmark / yük testi.
+
+Sentetik liste.csv katalogları üretir, yerel bir HTTP sunucusundan servis eder
+ve bot kodunu sahte Discord kanal/mesaj nesneleriyle çalıştırır.
+Sonuçlar JSON olarak yazdırılır.
+
+Kullanım:
+    python benchmark.py
+    python benchmark.py --sizes 100,1000,10000,50000 --output bench_output.txt
+"""
+import os
+import sys
+import json
+import time
+import random
+import asyncio
+import hashlib
+import argparse
+import tracemalloc
+from urllib.parse import quote
+
+from aiohttp import web
+
+import main
+
+CSV_HEADER = "İsim,Klasör,User,Repo,Aralık,Kapak,Banner,Tür,Durum,Yazar,Özet,Puan,Tarih,Kilitli,KilitliBolumSayisi"
+
+WORDS = [
+    "Ölüm", "Paktı", "Işık", "Gölge", "İmparator", "Şövalye", "Çağ", "Ğurur",
+    "Kılıç", "Büyücü", "Ejderha", "Yıldız", "Sonsuz", "Kayıp", "Krallık", "Savaşçı",
+]
+SUMMARY_PARTS = [
+    'Genç bir savaşçı, kaderini değiştirmek için yola çıkar',
+    '"Sonsuz Kule"nin sırrı, yüzyıllardır saklanıyor',
+    'İmparatorluk çöküyor; ama umut, hâlâ var',
+    'Bir gün, her şey "olması gerektiği gibi" değildi',
+    'Şehrin altında, kimsenin bilmediği bir dünya uyanıyor',
+]
+STATUSES = ["Devam Ediyor", "Tamamlandı", "Bırakıldı", "Ara Verildi"]
+GENRES = ["Aksiyon, Fantastik", "Dram", "Romantik, Komedi", "Macera", "Gizem, Gerilim"]
+
+# Duyuru patlaması testinde bölümü artırılan seri sayısı ve duyuru alan sunucu sayısı
+BURST_SIZE = 30
+BURST_GUILDS = 3
+
+
+# ───────────────────────────────────────────────
+# SENTETİK KATALOG
+# ───────────────────────────────────────────────
+def csv_field(value):
+    """Değeri CSV kurallarına göre tırnaklar"""
+    if any(char in value for char in ',"\n'):
+        return '"' + value.replace('"', '""') + '"'
+    return value
+
+
+def series_name(index):
+    rng = random.Random(index)
+    return f"{rng.choice(WORDS)} {rng.choice(WORDS)} {index}"
+
+
+def generate_catalog(size, bump=0, seed=42):
+    """
+    size serilik liste.csv üretir. bump > 0 ise ilk bump serinin son bölümü 1 artar.
+    Özetlerde virgül, tırnak ve satır sonu bulunur.
+    """
+    rng = random.Random(seed)
+    lines = [CSV_HEADER]
+    for index in range(size):
+        name = series_name(index)
+        last_chapter = rng.randint(1, 300) + (1 if index < bump else 0)
+        summary = " ".join(rng.sample(SUMMARY_PARTS, 2))
+        if rng.random() < 0.1:
+            summary += "\nİkinci paragraf, yeni satırda."
+        row = [
+            name,
+            f"seri{index}",
+            "toonarc",
+            "seriler",
+            f"1-{last_chapter}",
+            f"kapaklar/seri{index}.jpg",
+            "",
+            rng.choice(GENRES),
+            rng.choice(STATUSES),
+            f"Yazar {rng.randint(1, 500)}",
+            summary,
+            f"{rng.uniform(5, 10):.1f}",
+            f"2024-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+            rng.choice(["true", "false"]),
+            str(rng.randint(0, 3)),
+        ]
+        lines.append(",".join(csv_field(value) for value in row))
+    return ("\n".join(lines) + "\n").encode("utf-8")
+
+
+# ───────────────────────────────────────────────
+# YEREL HTTP SUNUCUSU
+# ───────────────────────────────────────────────
+class CatalogServer:
+    """liste.csv'yi yerelden servis eden sunucu - gecikme ve hata enjekte edilebilir, ETag destekler"""
+
+    def __init__(self, port=0):
+        self.port = port
+        self.body = b""
+        self.delay = 0.0
+        self.fail_next = 0
+        self.requests = 0
+        self.runner = None
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.port}/liste.csv"
+
+    async def handle(self, request):
+        self.requests += 1
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        if self.fail_next:
+            self.fail_next -= 1
+            return web.Response(status=503)
+        etag = '"' + hashlib.md5(self.body).hexdigest() + '"'
+        if request.headers.get("If-None-Match") == etag:
+            return web.Response(status=304, headers={"ETag": etag})
+        return web.Response(body=self.body, content_type="text/csv", headers={"ETag": etag})
+
+    async def start(self):
+        app = web.Application()
+        app.router.add_get("/liste.csv", self.handle)
+        self.runner = web.AppRunner(app)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, "127.0.0.1", self.port)
+        await site.start()
+        self.port = site._server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        await self.runner.cleanup()
+
+
+# ───────────────────────────────────────────────
+# SAHTE DISCORD
+# ───────────────────────────────────────────────
+class FakeRest:
+    """Gönderilen REST çağrılarını sayar"""
+
+    def __init__(self):
+        self.calls = 0
+
+    def reset(self):
+        self.calls = 0
+
+
+class FakeChannel:
+    def __init__(self, rest, channel_id, guild=None):
+        self.rest = rest
+        self.id = channel_id
+        self.guild = guild
+        self.messages = []
+
+    async def send(self, content=None, **kwargs):
+        self.rest.calls += 1
+        self.messages.append((content, kwargs))
+        return FakeMessage(content or "", self, author=FakeUser(0, bot=True))
+
+
+class FakeGuild:
+    def __init__(self, rest, guild_id=1):
+        self.rest = rest
+        self.id = guild_id
+        self.threads = {}
+        self.channels = {}
+
+    def get_thread(self, thread_id):
+        if thread_id not in self.threads:
+            self.threads[thread_id] = FakeChannel(self.rest, thread_id, self)
+        return self.threads[thread_id]
+
+    def get_channel(self, channel_id):
+        return self.channels.get(channel_id)
+
+
+class FakeWebhook:
+    """Kanal webhook'u - kanala ve thread'lere yapılan gönderimleri sayar"""
+
+    def __init__(self, channel):
+        self.channel = channel
+
+    async def send(self, thread=None, **kwargs):
+        self.channel.rest.calls += 1
+        self.channel.messages.append((None, kwargs))
+
+
+class FakeUser:
+    def __init__(self, user_id, bot=False):
+        self.id = user_id
+        self.bot = bot
+
+
+class FakeMessage:
+    def __init__(self, content, channel, author=None):
+        self.content = content
+        self.channel = channel
+        self.author = author or FakeUser(42)
+
+    async def edit(self, **kwargs):
+        self.channel.rest.calls += 1
+
+
+async def skip_commands(message):
+    """Komut işleme discord.py'ye ait - ölçüm dışında bırakılır"""
+
+
+class FakeContext:
+    def __init__(self, channel):
+        self.channel = channel
+        self.author = FakeUser(42)
+
+    async def send(self, content=None, **kwargs):
+        return await self.channel.send(content, **kwargs)
+
+
+# ───────────────────────────────────────────────
+# ÖLÇÜMLER
+# ───────────────────────────────────────────────
+async def measure_parse(server, body):
+    """fetch_zebzetoon_data: indirme + parse süresi ve bellek tepe noktası"""
+    server.body = body
+    main.series_cache.data = {}
+    main.series_cache.digest = None
+
+    tracemalloc.start()
+    started = time.perf_counter()
+    series_data = await main.fetch_zebzetoon_data(force=True)
+    elapsed = time.perf_counter() - started
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "series": len(series_data),
+        "csv_bytes": len(body),
+        "parse_seconds": elapsed,
+        "parse_peak_bytes": peak,
+        "catalog_bytes": current,
+    }
+
+
+async def measure_diff(server, size):
+    """Değişmiş ve değişmemiş sürüm için diff_snapshots maliyeti"""
+    old = main.series_cache.data
+    server.body = generate_catalog(size, bump=BURST_SIZE)
+    new = await main.fetch_zebzetoon_data(force=True)
+
+    started = time.perf_counter()
+    events = main.diff_snapshots(old, new)
+    diff_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    unchanged = main.diff_snapshots(new, dict(new))
+    unchanged_seconds = time.perf_counter() - started
+
+    return {
+        "diff_seconds": diff_seconds,
+        "diff_events": len(events),
+        "diff_unchanged_seconds": unchanged_seconds,
+        "diff_unchanged_events": len(unchanged),
+    }
+
+
+async def measure_on_message(rest, size, count=5000):
+    """on_message: link içeren ve içermeyen karışık mesajlarla saniyedeki mesaj sayısı"""
+    channel = FakeChannel(rest, 10)
+    rng = random.Random(1)
+    messages = []
+    for index in range(count):
+        if index % 10 == 0:
+            name = quote(series_name(rng.randrange(size)))
+            content = f"Şuna bakın: https://zebzetoon.vercel.app/?seri={name}&bolum={rng.randint(1, 50)}"
+        else:
+            content = "Bugün yeni bölüm gelir mi acaba, bekliyorum"
+        messages.append(FakeMessage(content, channel))
+
+    rest.reset()
+    started = time.perf_counter()
+    for message in messages:
+        await main.on_message(message)
+    elapsed = time.perf_counter() - started
+
+    return {
+        "on_message_count": count,
+        "on_message_per_second": count / elapsed,
+        "on_message_rest_calls": rest.calls,
+    }
+
+
+async def measure_seriler(rest):
+    """++seriler: tek çağrıda yapılan REST çağrısı sayısı"""
+    channel = FakeChannel(rest, 20)
+    rest.reset()
+    started = time.perf_counter()
+    await main.seriler.callback(FakeContext(channel))
+    return {
+        "seriler_rest_calls": rest.calls,
+        "seriler_seconds": time.perf_counter() - started,
+    }
+
+
+async def measure_announcement_burst(server, rest, size):
+    """BURST_SIZE serinin bölümü aynı anda artınca BURST_GUILDS sunucuya yapılan çağrılar"""
+    guilds = {}
+    for guild_id in range(1, BURST_GUILDS + 1):
+        guild = FakeGuild(rest, guild_id)
+        for channel_id in (guild_id * 100, guild_id * 100 + 1):
+            guild.channels[channel_id] = FakeChannel(rest, channel_id, guild)
+        guilds[guild_id] = guild
+        main.guild_configs[guild_id] = main.GuildConfig(guild_id, guild_id * 100, guild_id * 100 + 1)
+    main.client.get_guild = guilds.get
+
+    result = {"burst_series": BURST_SIZE, "burst_guilds": BURST_GUILDS}
+    result.update(await run_burst(server, rest, size, "burst"))
+
+    # Webhook modu: kanal duyuruları birleşir, thread'ler üst kanalın webhook'unu kullanır
+    async def get_webhook(channel):
+        return FakeWebhook(channel)
+
+    main.ANNOUNCE_MODE = "webhook"
+    main.webhook_cache.get = get_webhook
+    try:
+        result.update(await run_burst(server, rest, size, "burst_webhook"))
+    finally:
+        main.ANNOUNCE_MODE = "bot"
+        del main.webhook_cache.get
+
+    return result
+
+
+async def run_burst(server, rest, size, prefix):
+    # Önceki sürümü temel al, tüm seriler için thread'ler indekste olsun
+    server.body = generate_catalog(size)
+    baseline = await main.fetch_zebzetoon_data(force=True)
+    main.last_chapters.clear()
+    main.series_threads.clear()
+    for position, series_info in enumerate(baseline.values()):
+        main.last_chapters[series_info.isim] = series_info.son_bolum
+        for guild_id in range(1, BURST_GUILDS + 1):
+            key = (guild_id * 100 + 1, main.thread_key(series_info.isim))
+            main.series_threads[key] = guild_id * 1_000_000 + position
+    main.last_snapshot = baseline
+    main.last_snapshot_digest = main.series_cache.digest
+
+    server.body = generate_catalog(size, bump=BURST_SIZE)
+    rest.reset()
+    upstream_requests = server.requests
+    started = time.perf_counter()
+    await main.check_new_chapters()
+    while main.delivery_queue.depth:
+        await asyncio.sleep(0.001)
+
+    return {
+        f"{prefix}_rest_calls": rest.calls,
+        f"{prefix}_upstream_requests": server.requests - upstream_requests,
+        f"{prefix}_seconds": time.perf_counter() - started,
+    }
+
+
+async def run(sizes):
+    server = CatalogServer()
+    await server.start()
+    main.catalog_fetcher = main.CatalogFetcher([server.url], main.FETCH_HEDGE_DELAY)
+    main.state_store = main.StateStore(":memory:")
+    main.SNAPSHOT_PATH = None
+    main.client.process_commands = skip_commands
+    rest = FakeRest()
+
+    results = []
+    try:
+        for size in sizes:
+            body = generate_catalog(size)
+            result = {"size": size}
+            result.update(await measure_parse(server, body))
+            result.update(await measure_diff(server, size))
+            result.update(await measure_on_message(rest, size))
+            result.update(await measure_seriler(rest))
+            result.update(await measure_announcement_burst(server, rest, size))
+            results.append(result)
+            print(f"[benchmark] {size} seri tamamlandı", file=sys.stderr)
+    finally:
+        await main.close_http_session()
+        await server.stop()
+
+    return {
+        "python": sys.version.split()[0],
+        "timestamp": time.time(),
+        "results": results,
+    }
+
+
+# ───────────────────────────────────────────────
+# BAŞLAT
+# ───────────────────────────────────────────────
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="ZebzeToon bot benchmark")
+    parser.add_argument("--sizes", default="100,1000,10000", help="Virgülle ayrılmış katalog boyutları")
+    parser.add_argument("--output", help="JSON sonucun yazılacağı dosya (varsayılan: stdout)")
+    args = parser.parse_args()
+
+    # Benchmark çıktısını bot loglarından ayır
+    sys.stdout, log_stream = open(os.devnull, "w"), sys.stdout
+    report = asyncio.run(run([int(size) for size in args.sizes.split(",")]))
+    sys.stdout = log_stream
+
+    output = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output)
+    else:
+        print(output)
@@ -1,11 +1,37 @@
 import os
 import re
 import random
-import requests
+import io
+import csv
+import sys
+import asyncio
+import sqlite3
+import zlib
+import hashlib
+import tempfile
+import json
+import time
+import logging
+import inspect
+import heapq
+import bisect
+import unicodedata
+import aiohttp
 import discord
-from discord.ext import commands, tasks
-from datetime import datetime
-from urllib.parse import unquote
+from aiohttp import web
+from discord import app_commands
+from discord.ext import commands
+from collections import Counter, OrderedDict, defaultdict, deque
+from contextlib import contextmanager
+from dataclasses import dataclass, field, fields
+from datetime import datetime, timedelta
+from functools import partial
+from urllib.parse import quote, unquote
+
+try:
+    import fcntl  # Olay kuyruğu dosya kilidi (POSIX)
+except ImportError:
+    fcntl = None
 
 # ───────────────────────────────────────────────
 # EMBED RENKLERİ (Rastgele seçilecek)
@@ -31,586 +57,4283 @@ EMBED_COLORS = [
 intents = discord.Intents.default()
 intents.message_content = True
 
-client = commands.Bot(command_prefix="++", intents=intents)
+
+class ZebzeBot(commands.AutoShardedBot):
+    async def setup_hook(self):
+        global state_store
+        # Duyurulan bölümleri önceki çalışmadan yükle
+        state_store = StateStore(STATE_DB_PATH)
+        last_chapters.update(state_store.load_chapters())
+        series_threads.update(state_store.load_threads())
+        guild_configs.update(state_store.load_guild_configs())
+        webhook_cache.urls.update(state_store.load_webhooks())
+        for series_key, user_id in state_store.load_subscriptions():
+            series_subscribers[series_key].add(user_id)
+        dm_fanout.failures = state_store.load_dm_failures()
+        cover_checker.restore(state_store.load_covers())
+        unlock_scheduler.unlocked = state_store.load_unlocks()
+        
+        # Son iyi katalog varsa komutlar upstream beklenmeden hemen çalışsın
+        if BOT_MODE == 'gateway':
+            # Katalog poller'ın anlık görüntüsünden gelir, upstream'e sadece hiç veri yoksa gidilir
+            series_cache.ttl = float('inf')
+            series_cache.on_update = None
+        await asyncio.to_thread(load_catalog_snapshot)
+        
+        # Metrik endpoint'i, loop gecikmesi ölçümü ve rate-limit log yakalayıcı
+        self.metrics_runner = await start_metrics_server()
+        self.loop_lag_task = asyncio.create_task(monitor_loop_lag())
+        logging.getLogger('discord.http').addHandler(RateLimitLogHandler())
+        
+        await self.sync_commands()
+    
+    async def sync_commands(self):
+        """
+        Slash komutlarını Discord'a kaydeder - sync rate-limit'li olduğu için sadece
+        komut seti son kayıttan beri değiştiyse veya SYNC_COMMANDS=1 ise yapılır.
+        """
+        payload = json.dumps([command.to_dict(self.tree) for command in self.tree.get_commands()], sort_keys=True)
+        digest = hashlib.sha256(payload.encode()).hexdigest()
+        if not SYNC_COMMANDS and state_store.get_meta('command_tree_digest') == digest:
+            return
+        
+        try:
+            await self.tree.sync()
+            state_store.set_meta('command_tree_digest', digest)
+            print("[setup_hook] Slash komutları senkronize edildi")
+        except discord.HTTPException as e:
+            print(f"[setup_hook] Slash komutları senkronize edilemedi: {e}")
+    
+    async def close(self):
+        # Zamanlayıcıyı durdur, paylaşılan HTTP oturumunu gateway ile birlikte kapat
+        poll_scheduler.stop()
+        event_consumer.stop()
+        cover_checker.stop()
+        unlock_scheduler.stop()
+        if getattr(self, 'loop_lag_task', None):
+            self.loop_lag_task.cancel()
+        if getattr(self, 'metrics_runner', None):
+            await self.metrics_runner.cleanup()
+        await close_http_session()
+        if state_store is not None:
+            state_store.close()
+        if catalog_recorder is not None:
+            catalog_recorder.close()
+        await super().close()
+
+
+# Slash komutlarını komut seti değişmemiş olsa da yeniden kaydet
+SYNC_COMMANDS = os.getenv("SYNC_COMMANDS", "0") == "1"
+
+# Shard sayısı - 0 ise Discord'un önerdiği sayı kullanılır
+SHARD_COUNT = int(os.getenv("SHARD_COUNT", "0")) or None
+
+client = ZebzeBot(command_prefix="++", intents=intents, shard_count=SHARD_COUNT)
 
 # ───────────────────────────────────────────────
 # SECRETS
 # ───────────────────────────────────────────────
 DISCORD_TOKEN = os.getenv("DISCORD_TOKEN", "")
+# Sunucu ayarı (++ayar) olmayan tek sunucu kurulumları için varsayılan kanallar
 CHANNEL_ID = int(os.getenv("CHANNEL_ID", "0"))
 SERIES_THREAD_CHANNEL_ID = int(os.getenv("SERIES_THREAD_CHANNEL_ID", "0"))
 ZEBZETOON_CSV_URL = "https://zebzetoon.vercel.app/liste.csv"
 ZEBZETOON_BASE_URL = "https://zebzetoon.vercel.app"
 ZEBZETOON_CDN_BASE = "https://cdn.jsdelivr.net/gh/toonarc/kapaklar/"
+STATE_DB_PATH = os.getenv("STATE_DB_PATH", "zebzetoon_state.db")
+
+# Çalışma modu: all (tek süreç), poller (sadece katalog kontrolü), gateway (sadece Discord)
+# poller ve gateway aynı EVENT_QUEUE_PATH ve SNAPSHOT_PATH'i, ayrı STATE_DB_PATH'leri kullanır
+# Kuyruğu tek bir gateway süreci okur (tüm shard'lar o süreçte); ikinci gateway açılışta reddedilir
+BOT_MODE = os.getenv("BOT_MODE", "all").lower()
+EVENT_QUEUE_PATH = os.getenv("EVENT_QUEUE_PATH", "zebzetoon_events.jsonl")
+EVENT_QUEUE_INTERVAL = float(os.getenv("EVENT_QUEUE_INTERVAL", "1"))  # Gateway kuyruk okuma aralığı (saniye)
 
 # ───────────────────────────────────────────────
 # ZebzeToon VERİ YAPISI
 # ───────────────────────────────────────────────
-# CSV cache (bellekte tutulacak)
-series_cache = {}
-cache_timestamp = None
-CACHE_DURATION = 300  # 5 dakika
+# CSV cache süresi - bu süre dolunca veri arka planda yenilenir
+CACHE_DURATION = int(os.getenv("CACHE_DURATION", "300"))  # 5 dakika
+
+# İndirilen CSV bu boyuta kadar bellekte, üstünde geçici dosyada tutulur
+CSV_SPOOL_SIZE = 1024 * 1024
+CSV_CHUNK_SIZE = 64 * 1024
+
+# Son iyi katalog (sıkıştırılmış JSON seri satırları) - açılışta upstream beklenmeden buradan servis edilir
+SNAPSHOT_PATH = os.getenv("SNAPSHOT_PATH", "zebzetoon_catalog.snapshot")
+# CSV sürüm geçmişi (ör. zebzetoon_history.db, replay.py ile yeniden oynatılır) - boşsa kayıt tutulmaz
+CATALOG_HISTORY_PATH = os.getenv("CATALOG_HISTORY_PATH", "")
+SNAPSHOT_VERSION = 4  # Series alanları veya dosya formatı değişince artır
+
+# HTTP bağlantı havuzu ayarları (saniye)
+HTTP_TIMEOUT = float(os.getenv("HTTP_TIMEOUT", "10"))
+HTTP_CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT", "5"))
+HTTP_KEEPALIVE = float(os.getenv("HTTP_KEEPALIVE", "60"))
+HTTP_DNS_TTL = int(os.getenv("HTTP_DNS_TTL", "300"))
+HTTP_POOL_SIZE = int(os.getenv("HTTP_POOL_SIZE", "20"))
+
+# Yedek liste.csv kaynakları (virgülle ayrılmış) - varsayılan: aynı reponun jsDelivr kopyası
+ZEBZETOON_CSV_MIRRORS = [
+    url.strip()
+    for url in os.getenv("ZEBZETOON_CSV_MIRRORS", f"{ZEBZETOON_CDN_BASE}liste.csv").split(",")
+    if url.strip()
+]
+# Kaynak bu süre içinde yanıt vermezse sıradakine paralel istek atılır (saniye)
+FETCH_HEDGE_DELAY = float(os.getenv("FETCH_HEDGE_DELAY", "2"))
+# Üst üste BREAKER_FAILURES hata alan kaynak BREAKER_COOLDOWN saniye atlanır
+BREAKER_FAILURES = int(os.getenv("BREAKER_FAILURES", "3"))
+BREAKER_COOLDOWN = float(os.getenv("BREAKER_COOLDOWN", "60"))
+
+# Kapak doğrulama: eşzamanlı HEAD isteği sayısı ve saklanan en fazla URL sonucu
+COVER_CHECK_WORKERS = int(os.getenv("COVER_CHECK_WORKERS", "8"))
+COVER_CACHE_SIZE = int(os.getenv("COVER_CACHE_SIZE", "10000"))
+
+# Prometheus metrik endpoint'i (METRICS_PORT=0 ile kapatılır)
+METRICS_HOST = os.getenv("METRICS_HOST", "127.0.0.1")
+METRICS_PORT = int(os.getenv("METRICS_PORT", "9108"))
+LOOP_LAG_INTERVAL = 1.0  # Event loop gecikmesi ölçüm aralığı (saniye)
+
+# Tek, uzun ömürlü aiohttp oturumu (get_http_session ile oluşturulur)
+http_session = None
 
 # Son bölüm takibi (otomatik duyuru için)
-# {seri_adı: son_bölüm_numarası}
+# {seri_adı: son_bölüm_numarası} - açılışta StateStore'dan yüklenir
 last_chapters = {}
 
+# Kalıcı durum deposu (setup_hook içinde açılır)
+state_store = None
+
+# Mesajlardaki ZebzeToon linkleri
+ZEBZETOON_LINK_MARKER = "zebzetoon.vercel.app"
+ZEBZETOON_LINK_RE = re.compile(r'https?://zebzetoon\.vercel\.app/\?seri=([^&\s]+)(?:&bolum=(\d+))?')
+# Aynı kanalda aynı seri/bölüm kartı bu süre içinde tekrar gönderilmez (saniye)
+LINK_COOLDOWN = int(os.getenv("LINK_COOLDOWN", "120"))
+
+# Bulanık aramada kabul edilen en düşük benzerlik skoru (0-1)
+SEARCH_MIN_SCORE = float(os.getenv("SEARCH_MIN_SCORE", "0.35"))
+
+# Yeni bölüm kontrol aralığı (saniye) - değişiklik oldukça sıklaşır, boşta seyrekleşir
+POLL_INTERVAL = float(os.getenv("POLL_INTERVAL", "600"))
+POLL_MIN_INTERVAL = float(os.getenv("POLL_MIN_INTERVAL", "60"))
+POLL_MAX_INTERVAL = float(os.getenv("POLL_MAX_INTERVAL", "1800"))
+POLL_ACTIVE_INTERVAL = float(os.getenv("POLL_ACTIVE_INTERVAL", "180"))  # Yoğun yayın saatlerinde üst sınır
+POLL_JITTER = 0.1  # Aralığın ±%10'u
+
+# Embed/View render cache boyutu (LRU)
+RENDER_CACHE_SIZE = int(os.getenv("RENDER_CACHE_SIZE", "512"))
+
+# ++seriler sayfa boyutu - Discord mesaj başına en fazla 10 embed kabul eder
+SERIES_PAGE_SIZE = 10
+SERIES_PAGE_TIMEOUT = 300  # saniye
+
+# Seri thread indeksi: {(üst_kanal_id, thread_key(seri_adı)): thread_id}
+series_threads = {}
+
+# Sunucu başına duyuru ayarları: {guild_id: GuildConfig} - açılışta StateStore'dan yüklenir
+guild_configs = {}
+
+# Duyuru teslimat kuyruğu ayarları
+DELIVERY_WORKERS = int(os.getenv("DELIVERY_WORKERS", "4"))  # Aynı anda en fazla gönderim
+DELIVERY_MAX_RETRIES = int(os.getenv("DELIVERY_MAX_RETRIES", "5"))
+DELIVERY_BACKOFF = float(os.getenv("DELIVERY_BACKOFF", "2"))  # saniye, her denemede 2 katına çıkar
+
+# Duyuru yolu: bot (her bölüm ayrı bot mesajı) veya webhook (kanal webhook'u, aynı turdaki
+# bölümler WEBHOOK_BATCH_SIZE embed'lik mesajlarda birleşir, thread'lere thread_id ile gider)
+ANNOUNCE_MODE = os.getenv("ANNOUNCE_MODE", "bot").lower()
+
+# Kilitli bölümler: Tarih'ten itibaren her UNLOCK_INTERVAL saniyede en eski kilitli bölüm
+# ücretsiz olur ve duyurulur (varsayılan haftalık, 0 ile kapatılır)
+UNLOCK_INTERVAL = float(os.getenv("UNLOCK_INTERVAL", str(7 * 24 * 60 * 60)))
+WEBHOOK_NAME = "ZebzeToon"
+WEBHOOK_BATCH_SIZE = 10  # Discord mesaj başına en fazla 10 embed kabul eder
+
+# Takip DM'leri: eşzamanlı gönderim, saniyedeki en fazla DM ve ölü takipçi eşiği
+DM_WORKERS = int(os.getenv("DM_WORKERS", "5"))
+DM_RATE = float(os.getenv("DM_RATE", "10"))
+DM_PRUNE_FAILURES = int(os.getenv("DM_PRUNE_FAILURES", "3"))
+TAKIP_LIMIT = int(os.getenv("TAKIP_LIMIT", "50"))  # Kullanıcı başına en fazla takip
+
+# Takip indeksi: {seri_anahtarı: {kullanıcı_id}} - açılışta StateStore'dan yüklenir
+series_subscribers = defaultdict(set)
+
 
 # ───────────────────────────────────────────────
-# ZebzeToon CSV OKUMA FONKSİYONU
+# HTTP OTURUMU
 # ───────────────────────────────────────────────
-def fetch_zebzetoon_data():
+def get_http_session():
     """
-    ZebzeToon'dan liste.csv dosyasını çeker ve parse eder.
-    CSV yapısı: İsim, Klasör, User, Repo, Aralık, Kapak, Banner, Tür, Durum, Yazar, Özet, Puan, Tarih, Kilitli, KilitliBolumSayisi
+    Bot genelinde paylaşılan aiohttp oturumunu döndürür.
+    Keep-alive ve DNS cache açık tek bir bağlantı havuzu kullanılır,
+    böylece her istekte yeni TCP/TLS bağlantısı kurulmaz.
     """
-    global series_cache, cache_timestamp
+    global http_session
     
-    # Cache kontrolü
-    if cache_timestamp and (datetime.now().timestamp() - cache_timestamp < CACHE_DURATION):
-        return series_cache
+    if http_session is None or http_session.closed:
+        connector = aiohttp.TCPConnector(
+            limit=HTTP_POOL_SIZE,
+            ttl_dns_cache=HTTP_DNS_TTL,
+            keepalive_timeout=HTTP_KEEPALIVE,
+        )
+        timeout = aiohttp.ClientTimeout(
+            total=HTTP_TIMEOUT,
+            sock_connect=HTTP_CONNECT_TIMEOUT,
+        )
+        http_session = aiohttp.ClientSession(connector=connector, timeout=timeout)
     
-    try:
-        response = requests.get(ZEBZETOON_CSV_URL, timeout=10)
-        response.raise_for_status()
+    return http_session
+
+
+async def close_http_session():
+    """Paylaşılan HTTP oturumunu kapatır"""
+    global http_session
+    
+    if http_session is not None and not http_session.closed:
+        await http_session.close()
+    http_session = None
+
+
+# ───────────────────────────────────────────────
+# METRİKLER
+# ───────────────────────────────────────────────
+# Gecikme histogramı kovaları (saniye)
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Histogram:
+    """Prometheus uyumlu kovalı histogram - ++durum için son ölçümleri de tutar"""
+    
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.sum = 0.0
+        self.count = 0
+        self.recent = deque(maxlen=256)
+    
+    def observe(self, value):
+        self.sum += value
+        self.count += 1
+        self.recent.append(value)
+        position = bisect.bisect_left(self.buckets, value)
+        if position < len(self.counts):
+            self.counts[position] += 1
+    
+    def quantile(self, q):
+        """Son ölçümlerden yaklaşık yüzdelik (ölçüm yoksa 0)"""
+        if not self.recent:
+            return 0.0
+        ordered = sorted(self.recent)
+        return ordered[min(int(q * len(ordered)), len(ordered) - 1)]
+
+
+class Metrics:
+    """
+    Sayaç, histogram ve gauge kaydı. Prometheus metin formatında dışa aktarılır.
+    Gauge'lar ve nesnelerin kendi tuttuğu sayaçlar okunma anında fonksiyon çağrısıyla hesaplanır.
+    """
+    
+    def __init__(self):
+        self.counters = defaultdict(float)  # {(isim, etiketler): değer}
+        self.histograms = {}                # {(isim, etiketler): Histogram}
+        self.gauges = {}                    # {isim: fonksiyon}
+        self.counter_funcs = {}             # {isim: fonksiyon} - sadece artan değerler
+    
+    @staticmethod
+    def _key(name, labels):
+        return (name, tuple(sorted(labels.items())))
+    
+    def inc(self, name, value=1, **labels):
+        self.counters[self._key(name, labels)] += value
+    
+    def observe(self, name, value, **labels):
+        key = self._key(name, labels)
+        histogram = self.histograms.get(key)
+        if histogram is None:
+            histogram = self.histograms[key] = Histogram()
+        histogram.observe(value)
+    
+    def histogram(self, name, **labels):
+        return self.histograms.get(self._key(name, labels)) or Histogram()
+    
+    @contextmanager
+    def timer(self, name, **labels):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - started, **labels)
+    
+    def gauge(self, name, func):
+        self.gauges[name] = func
+    
+    def counter(self, name, func):
+        """Başka bir nesnenin tuttuğu kümülatif sayacı counter olarak dışa aktarır"""
+        self.counter_funcs[name] = func
+    
+    def render(self):
+        """Prometheus metin formatı"""
+        def fmt(name, labels, extra=()):
+            pairs = list(labels) + list(extra)
+            if not pairs:
+                return name
+            return name + "{" + ",".join(f'{k}="{v}"' for k, v in pairs) + "}"
         
-        # CSV parse et
-        lines = response.text.strip().split('\n')
-        if len(lines) < 2:
-            print("[fetch_zebzetoon_data] CSV boş veya geçersiz")
-            return {}
+        lines = []
+        seen = set()
+        for (name, labels), value in sorted(self.counters.items()):
+            if name not in seen:
+                seen.add(name)
+                lines.append(f"# TYPE {name} counter")
+            lines.append(f"{fmt(name, labels)} {value}")
         
-        # Header'ı atla
-        data_lines = lines[1:]
+        for (name, labels), histogram in sorted(self.histograms.items(), key=lambda item: item[0]):
+            if name not in seen:
+                seen.add(name)
+                lines.append(f"# TYPE {name} histogram")
+            cumulative = 0
+            for bound, count in zip(histogram.buckets, histogram.counts):
+                cumulative += count
+                lines.append(f"{fmt(name + '_bucket', labels, [('le', bound)])} {cumulative}")
+            lines.append(f"{fmt(name + '_bucket', labels, [('le', '+Inf')])} {histogram.count}")
+            lines.append(f"{fmt(name + '_sum', labels)} {histogram.sum}")
+            lines.append(f"{fmt(name + '_count', labels)} {histogram.count}")
         
-        series_data = {}
-        for line in data_lines:
-            # Virgülle ayır ama özet içindeki virgülleri koru
-            # Basit CSV parser - 15 alan bekliyoruz
-            parts = line.split(',', 14)  # İlk 14 virgülde böl, kalanı son alana koy
-            
-            if len(parts) < 15:
-                continue
-            
-            series_name = parts[0].strip()
-            
-            # Boş satırları atla
-            if not series_name:
-                continue
-            
-            series_data[series_name.lower()] = {
-                'isim': parts[0].strip(),
-                'klasor': parts[1].strip(),
-                'user': parts[2].strip(),
-                'repo': parts[3].strip(),
-                'aralik': parts[4].strip(),
-                'kapak': parts[5].strip(),
-                'banner': parts[6].strip(),
-                'tur': parts[7].strip(),
-                'durum': parts[8].strip(),
-                'yazar': parts[9].strip(),
-                'ozet': parts[10].strip(),
-                'puan': parts[11].strip(),
-                'tarih': parts[12].strip(),
-                'kilitli': parts[13].strip(),
-                'kilitliBolumSayisi': parts[14].strip()
-            }
-        
-        series_cache = series_data
-        cache_timestamp = datetime.now().timestamp()
-        print(f"[fetch_zebzetoon_data] {len(series_data)} seri yüklendi")
-        return series_data
+        for kind, funcs in (('counter', self.counter_funcs), ('gauge', self.gauges)):
+            for name, func in sorted(funcs.items()):
+                try:
+                    value = func()
+                except Exception:
+                    continue
+                if value is None:
+                    continue
+                lines.append(f"# TYPE {name} {kind}")
+                lines.append(f"{name} {float(value)}")
         
-    except Exception as e:
-        print(f"[fetch_zebzetoon_data] Hata: {e}")
-        return series_cache  # Eski cache'i döndür
+        return "\n".join(lines) + "\n"
 
 
-def get_cover_image_url(kapak_path):
+metrics = Metrics()
+
+
+class RateLimitLogHandler(logging.Handler):
     """
-    Kapak resmi yolunu tam URL'ye çevirir.
-    - Eğer http ile başlıyorsa olduğu gibi kullan
-    - Değilse CDN base'i ekle ve 'kapaklar/' prefix'ini kaldır
+    discord.py 429 aldığında beklemeyi kendisi yapar ve sadece loglar.
+    Bu handler o log kayıtlarından bekleme sayısını ve süresini metriğe çevirir.
     """
-    if not kapak_path:
-        return None
-    
-    if kapak_path.startswith('http'):
-        return kapak_path
     
-    # 'kapaklar/' prefix'ini kaldır
-    clean_path = kapak_path.replace('kapaklar/', '')
-    return f"{ZEBZETOON_CDN_BASE}{clean_path}"
+    def emit(self, record):
+        if record.levelno < logging.WARNING or 'rate limited' not in str(record.msg):
+            return
+        
+        waits = [arg for arg in (record.args or ()) if isinstance(arg, (int, float))]
+        metrics.inc('zebzetoon_ratelimit_total', source='discord')
+        if waits and 'Retrying' in str(record.msg):
+            metrics.observe('zebzetoon_ratelimit_wait_seconds', float(waits[-1]), source='discord')
 
 
-def parse_chapter_range(aralik):
-    """
-    Bölüm aralığını parse eder ve son bölüm numarasını döndürür.
-    Örnek: "1-8" -> 8, "1-40" -> 40
-    """
-    if not aralik or '-' not in aralik:
+async def monitor_loop_lag():
+    """Event loop gecikmesini ölçer: planlanan uyanma ile gerçek uyanma farkı"""
+    while True:
+        started = time.perf_counter()
+        await asyncio.sleep(LOOP_LAG_INTERVAL)
+        lag = max(time.perf_counter() - started - LOOP_LAG_INTERVAL, 0.0)
+        metrics.observe('zebzetoon_loop_lag_seconds', lag)
+
+
+async def handle_metrics(request):
+    return web.Response(text=metrics.render(), content_type='text/plain', charset='utf-8')
+
+
+async def start_metrics_server():
+    """Yerel Prometheus endpoint'ini başlatır (/metrics)"""
+    if not METRICS_PORT:
         return None
     
+    app = web.Application()
+    app.router.add_get('/metrics', handle_metrics)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
     try:
-        parts = aralik.split('-')
-        return int(parts[1])
-    except (ValueError, IndexError):
+        await web.TCPSite(runner, METRICS_HOST, METRICS_PORT).start()
+    except OSError as e:
+        print(f"[start_metrics_server] Port açılamadı: {e}")
+        await runner.cleanup()
         return None
+    
+    print(f"[start_metrics_server] Metrikler: http://{METRICS_HOST}:{METRICS_PORT}/metrics")
+    return runner
 
 
 # ───────────────────────────────────────────────
-# SERİ THREAD'İ OLUŞTUR VEYA BUL
+# UPSTREAM KAYNAKLARI (YEDEKLİ İNDİRME)
 # ───────────────────────────────────────────────
-async def get_or_create_series_thread(guild, series_name, cover_url=None, status=None, genres=None):
+ORIGIN_STATE_ICONS = {'closed': '🟢', 'half_open': '🟡', 'open': '🔴'}
+
+
+class Origin:
+    """Tek bir liste.csv kaynağı: devre kesici, koşullu istek doğrulayıcıları ve sağlık istatistikleri"""
+    
+    def __init__(self, url):
+        self.url = url
+        self.name = url.split('/')[2] if '://' in url else url
+        
+        # Doğrulayıcılar sadece bu kaynağın son gövdesi elimizdeki sürümse gönderilir
+        self.etag = None
+        self.last_modified = None
+        self.digest = None
+        
+        # Devre kesici
+        self.failures = 0       # Üst üste hata sayısı
+        self.opened_at = None   # Devrenin açıldığı an (monotonic), kapalıysa None
+        self.probing = False    # Yarı açık devrede deneme isteği sürüyor
+        
+        # İstatistikler
+        self.requests = 0
+        self.successes = 0
+        self.errors = 0
+        self.latency = None     # Üstel hareketli ortalama (saniye)
+        self.last_error = None
+    
+    @property
+    def state(self):
+        if self.opened_at is None:
+            return 'closed'
+        if time.monotonic() - self.opened_at >= BREAKER_COOLDOWN:
+            return 'half_open'
+        return 'open'
+    
+    def available(self):
+        """Kapalı devre her zaman, yarı açık devre tek deneme için kullanılabilir"""
+        state = self.state
+        return state == 'closed' or (state == 'half_open' and not self.probing)
+    
+    def headers(self, digest):
+        headers = {}
+        if digest is not None and digest == self.digest:
+            if self.etag:
+                headers['If-None-Match'] = self.etag
+            if self.last_modified:
+                headers['If-Modified-Since'] = self.last_modified
+        return headers
+    
+    def record_success(self, latency):
+        if self.opened_at is not None:
+            print(f"[CatalogFetcher] {self.name} tekrar sağlıklı, devre kapandı")
+        self.successes += 1
+        self.failures = 0
+        self.opened_at = None
+        self.last_error = None
+        self.latency = latency if self.latency is None else 0.8 * self.latency + 0.2 * latency
+    
+    def record_failure(self, error):
+        self.errors += 1
+        self.failures += 1
+        self.last_error = error
+        # Yarı açık denemenin başarısızlığı devreyi hemen yeniden açar
+        if self.opened_at is not None or self.failures >= BREAKER_FAILURES:
+            if self.opened_at is None:
+                print(f"[CatalogFetcher] {self.name} devre dışı ({self.failures} hata): {error}")
+            self.opened_at = time.monotonic()
+    
+    def stats(self):
+        return {
+            'state': self.state,
+            'requests': self.requests,
+            'successes': self.successes,
+            'errors': self.errors,
+            'latency': self.latency,
+            'last_error': str(self.last_error) if self.last_error else None,
+        }
+
+
+@dataclass(slots=True)
+class FetchResult:
+    """Bir kaynaktan alınan yanıt - 304 ise gövde yoktur"""
+    origin: Origin
+    status: int
+    spool: object = None
+    digest: str = None
+
+
+class CatalogFetcher:
     """
-    Text channel altında seri için thread bulur veya oluşturur.
+    liste.csv'yi sıralı kaynak listesinden indirir.
+    - İlk kaynak FETCH_HEDGE_DELAY içinde yanıt vermezse sıradakine paralel istek atılır,
+      ilk başarılı yanıt kazanır, diğerleri iptal edilir
+    - Hata alan kaynaktan beklemeden sıradakine geçilir
+    - Devresi açık kaynaklar soğuma süresi dolana kadar atlanır
     """
-    if not series_name or not SERIES_THREAD_CHANNEL_ID:
-        return None
     
-    parent_channel = guild.get_channel(SERIES_THREAD_CHANNEL_ID)
-    if not parent_channel:
-        print(f"[get_or_create_series_thread] Kanal bulunamadı: {SERIES_THREAD_CHANNEL_ID}")
-        return None
+    def __init__(self, urls, hedge_delay):
+        self.origins = [Origin(url) for url in dict.fromkeys(urls)]
+        self.hedge_delay = hedge_delay
+    
+    def validators(self):
+        """Anlık görüntüye yazılacak kaynak doğrulayıcıları"""
+        return {
+            origin.url: (origin.etag, origin.last_modified, origin.digest)
+            for origin in self.origins
+            if origin.digest
+        }
     
-    series_lower = series_name.lower()
+    def restore_validators(self, validators):
+        for origin in self.origins:
+            if origin.url in validators:
+                origin.etag, origin.last_modified, origin.digest = validators[origin.url]
     
-    # Mevcut thread'leri kontrol et
-    if hasattr(parent_channel, 'threads'):
-        for thread in parent_channel.threads:
-            if thread.name.lower() == series_lower:
-                return thread
+    async def fetch(self, digest=None):
+        """
+        Kaynaklardan ilk başarılı yanıtı döndürür.
+        digest: elimizdeki sürümün özeti - aynı sürümü vermiş kaynaklara koşullu istek atılır
+        """
+        waiting = deque(origin for origin in self.origins if origin.available())
+        if not waiting:
+            raise RuntimeError("Tüm liste.csv kaynakları devre dışı")
+        
+        pending = set()
+        errors = []
+        
+        def launch():
+            origin = waiting.popleft()
+            pending.add(asyncio.create_task(self._attempt(origin, digest)))
+        
+        launch()
+        try:
+            while pending:
+                done, _ = await asyncio.wait(
+                    pending,
+                    timeout=self.hedge_delay if waiting else None,
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                if not done:
+                    # Yavaş yanıt: sıradaki kaynağa paralel istek
+                    metrics.inc('zebzetoon_fetch_hedges_total')
+                    launch()
+                    continue
+                
+                results = []
+                for task in done:
+                    pending.discard(task)
+                    if task.exception() is None:
+                        results.append(task.result())
+                    else:
+                        errors.append(task.exception())
+                        if waiting:
+                            launch()
+                
+                if results:
+                    for extra in results[1:]:
+                        if extra.spool is not None:
+                            extra.spool.close()
+                    return results[0]
+        finally:
+            # Kaybeden istekleri iptal et, bu arada tamamlananların gövdesini bırak
+            for task in pending:
+                task.cancel()
+            for result in await asyncio.gather(*pending, return_exceptions=True):
+                if isinstance(result, FetchResult) and result.spool is not None:
+                    result.spool.close()
+        
+        raise errors[-1]
     
-    # Aktif thread'leri kontrol et
+    async def _attempt(self, origin, digest):
+        origin.requests += 1
+        probe = origin.state == 'half_open'
+        if probe:
+            origin.probing = True
+        
+        started = time.perf_counter()
+        spool = None
+        try:
+            session = get_http_session()
+            async with session.get(origin.url, headers=origin.headers(digest)) as response:
+                if response.status == 304:
+                    result = FetchResult(origin, 304)
+                else:
+                    response.raise_for_status()
+                    
+                    # Gövdeyi parça parça oku: özeti hesapla, büyükse diske taşı
+                    spool = tempfile.SpooledTemporaryFile(max_size=CSV_SPOOL_SIZE)
+                    hasher = hashlib.sha256()
+                    async for chunk in response.content.iter_chunked(CSV_CHUNK_SIZE):
+                        hasher.update(chunk)
+                        spool.write(chunk)
+                    
+                    result = FetchResult(origin, response.status, spool, hasher.hexdigest())
+                    origin.etag = response.headers.get('ETag')
+                    origin.last_modified = response.headers.get('Last-Modified')
+                    origin.digest = result.digest
+        except asyncio.CancelledError:
+            if spool is not None:
+                spool.close()
+            raise
+        except Exception as e:
+            if spool is not None:
+                spool.close()
+            origin.record_failure(e)
+            metrics.inc('zebzetoon_origin_requests_total', origin=origin.name, result='error')
+            raise
+        finally:
+            if probe:
+                origin.probing = False
+        
+        latency = time.perf_counter() - started
+        origin.record_success(latency)
+        metrics.observe('zebzetoon_origin_fetch_seconds', latency, origin=origin.name)
+        metrics.inc(
+            'zebzetoon_origin_requests_total',
+            origin=origin.name,
+            result='not_modified' if result.status == 304 else 'ok',
+        )
+        return result
+
+
+catalog_fetcher = CatalogFetcher([ZEBZETOON_CSV_URL, *ZEBZETOON_CSV_MIRRORS], FETCH_HEDGE_DELAY)
+
+
+# ───────────────────────────────────────────────
+# ZebzeToon CSV OKUMA FONKSİYONU
+# ───────────────────────────────────────────────
+@dataclass(slots=True)
+class Series:
+    """liste.csv'deki tek bir seri kaydı (tipli alanlarla)"""
+    isim: str
+    klasor: str
+    user: str
+    repo: str
+    aralik: str
+    kapak: str
+    banner: str
+    tur: str
+    durum: str
+    yazar: str
+    ozet: str
+    puan: float | None
+    tarih: float | None  # Unix zaman damgası
+    kilitli: bool
+    kilitliBolumSayisi: int
+    ilk_bolum: int | None
+    son_bolum: int | None
+
+
+def _parse_float(value):
     try:
-        active_threads = await guild.active_threads()
-        for thread in active_threads:
-            if thread.parent_id == SERIES_THREAD_CHANNEL_ID and thread.name.lower() == series_lower:
-                return thread
-    except Exception as e:
-        print(f"[get_or_create_series_thread] Aktif thread hatası: {e}")
+        return float(value.replace(',', '.'))
+    except ValueError:
+        return None
+
+
+def _parse_int(value):
+    try:
+        return int(value)
+    except ValueError:
+        return 0
+
+
+def _parse_bool(value):
+    return value.strip().lower() in ('1', 'true', 'evet', 'yes', 'kilitli')
+
+
+def _parse_date(value):
+    """
+    Tarih alanını Unix zaman damgasına çevirir.
+    Sayı (saniye/milisaniye), ISO (2024-05-01) ve 01.05.2024 biçimleri desteklenir.
+    """
+    if not value:
+        return None
+    
+    if value.isdigit():
+        timestamp = float(value)
+        return timestamp / 1000 if timestamp > 1e12 else timestamp
     
-    # Arşivlenmiş thread'leri kontrol et
     try:
-        if hasattr(parent_channel, 'archived_threads'):
-            async for thread in parent_channel.archived_threads(limit=100):
-                if thread.name.lower() == series_lower:
-                    return thread
-    except Exception as e:
-        print(f"[get_or_create_series_thread] Arşiv thread hatası: {e}")
+        return datetime.fromisoformat(value).timestamp()
+    except ValueError:
+        pass
     
-    # Yeni thread oluştur
     try:
-        # Durum rengi
-        embed_color = 0x00BFFF
-        if status and "Devam" in status:
-            embed_color = 0x00FF7F
-        elif status and "Tamamlandı" in status:
-            embed_color = 0xFFD700
-        elif status and "Bırakıldı" in status:
-            embed_color = 0xFF4500
+        return datetime.strptime(value, "%d.%m.%Y").timestamp()
+    except ValueError:
+        return None
+
+
+def parse_zebzetoon_csv(lines):
+    """
+    liste.csv satırlarını akış halinde parse eder ve {seri_adı: Series} döndürür.
+    lines: dosya nesnesi veya satır iterable'ı (tırnaklı alan ve alan içi satır sonu desteklenir)
+    CSV yapısı: İsim, Klasör, User, Repo, Aralık, Kapak, Banner, Tür, Durum, Yazar, Özet, Puan, Tarih, Kilitli, KilitliBolumSayisi
+    """
+    reader = csv.reader(lines)
+    
+    # Header'ı atla
+    if next(reader, None) is None:
+        print("[parse_zebzetoon_csv] CSV boş veya geçersiz")
+        return {}
+    
+    series_data = {}
+    for row in reader:
+        # 15 alan bekliyoruz
+        if len(row) < 15:
+            continue
         
-        # İlk mesaj embed'i
-        desc_parts = []
-        if status:
-            desc_parts.append(f"**{status}**")
-        if genres:
-            desc_parts.append(f"🏷️ {genres}")
-        desc_parts.append("Yeni bölümler burada paylaşılacak!")
+        parts = [part.strip() for part in row[:15]]
+        series_name = parts[0]
         
-        embed = discord.Embed(
-            title=f"📚 {series_name}",
-            description="\n".join(desc_parts),
-            color=embed_color,
-        )
-        if cover_url:
-            embed.set_thumbnail(url=cover_url)
+        # Boş satırları atla
+        if not series_name:
+            continue
         
-        # Thread oluştur
-        if isinstance(parent_channel, discord.TextChannel):
-            msg = await parent_channel.send(embed=embed)
-            thread = await msg.create_thread(name=series_name)
-            print(f"[get_or_create_series_thread] Yeni thread oluşturuldu: {series_name}")
-            return thread
+        ilk_bolum, son_bolum = parse_chapter_bounds(parts[4])
         
-    except Exception as e:
-        print(f"[get_or_create_series_thread] Thread oluşturma hatası: {e}")
+        # Tekrarlayan kısa değerler tek kopya olarak tutulur
+        series_data[series_name] = Series(
+            isim=series_name,
+            klasor=parts[1],
+            user=sys.intern(parts[2]),
+            repo=sys.intern(parts[3]),
+            aralik=parts[4],
+            kapak=parts[5],
+            banner=parts[6],
+            tur=sys.intern(parts[7]),
+            durum=sys.intern(parts[8]),
+            yazar=sys.intern(parts[9]),
+            ozet=parts[10],
+            puan=_parse_float(parts[11]),
+            tarih=_parse_date(parts[12]),
+            kilitli=_parse_bool(parts[13]),
+            kilitliBolumSayisi=_parse_int(parts[14]),
+            ilk_bolum=ilk_bolum,
+            son_bolum=son_bolum,
+        )
     
-    return None
-
-
-# ───────────────────────────────────────────────
-# BOT AÇILDIĞINDA
-# ───────────────────────────────────────────────
-@client.event
-async def on_ready():
-    print("ZebzeToon Discord Bot aktif!")
-    # İlk veri yüklemesi
-    fetch_zebzetoon_data()
-    # Otomatik duyuru task'ını başlat
-    check_new_chapters.start()
-    await client.change_presence(activity=discord.Game(name="Manga Okuyor..."))
+    return series_data
 
 
 # ───────────────────────────────────────────────
-# ZebzeToon LINK YAKALAMA
+# KATALOG GEÇMİŞİ (KAYIT)
 # ───────────────────────────────────────────────
-@client.event
-async def on_message(message):
-    # Bot'un kendi mesajlarını ignore et
-    if message.author.bot:
-        return
+class CatalogRecorder:
+    """
+    Upstream'den gelen her farklı liste.csv sürümünü zaman damgasıyla saklar.
+    Gövdeler zlib ile sıkıştırılır ve özete göre tekilleştirilir (A→B→A'da A bir kez yazılır);
+    replay.py bu geçmişi çevrimdışı yeniden oynatır.
+    """
     
-    # ZebzeToon linki var mı kontrol et
-    zebzetoon_pattern = r'https?://zebzetoon\.vercel\.app/\?seri=([^&\s]+)(?:&bolum=(\d+))?'
-    matches = re.findall(zebzetoon_pattern, message.content)
+    def __init__(self, path):
+        self.path = path
+        self.conn = None
     
-    if matches:
-        # Veriyi çek
-        series_data = fetch_zebzetoon_data()
-        
-        for match in matches:
-            series_name_encoded = match[0]
-            chapter_num = match[1] if match[1] else None
-            
-            # URL decode
-            series_name = unquote(series_name_encoded)
-            
-            # Seriyi bul
-            series_info = series_data.get(series_name.lower())
-            
-            if not series_info:
-                print(f"[on_message] Seri bulunamadı: {series_name}")
-                continue
-            
-            # Kapak resmini al
-            cover_url = get_cover_image_url(series_info['kapak'])
-            
-            # Embed oluştur
-            embed = discord.Embed(
-                title=f"📖 {series_info['isim']}",
-                description=series_info['ozet'][:200] + "..." if len(series_info['ozet']) > 200 else series_info['ozet'],
-                color=random.choice(EMBED_COLORS),
-            )
-            
-            # Seri bilgileri
-            embed.add_field(
-                name="📚 Seri",
-                value=f"`{series_info['isim']}`",
-                inline=True,
-            )
-            
-            if chapter_num:
-                embed.add_field(
-                    name="📄 Bölüm",
-                    value=f"`{chapter_num}`",
-                    inline=True,
+    def _connect(self):
+        # Kayıt to_thread ile, okuma replay'de ana thread'de yapılır
+        if self.conn is None:
+            self.conn = sqlite3.connect(self.path, check_same_thread=False)
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            with self.conn:
+                self.conn.execute(
+                    "CREATE TABLE IF NOT EXISTS versions ("
+                    "digest TEXT PRIMARY KEY, size INTEGER NOT NULL, body BLOB NOT NULL)"
                 )
-            
-            # Durum
-            embed.add_field(
-                name="📊 Durum",
-                value=series_info['durum'],
-                inline=True,
-            )
-            
-            # Tür
-            if series_info['tur']:
-                embed.add_field(
-                    name="🏷️ Tür",
-                    value=series_info['tur'],
-                    inline=False,
+                self.conn.execute(
+                    "CREATE TABLE IF NOT EXISTS observations ("
+                    "id INTEGER PRIMARY KEY AUTOINCREMENT, timestamp REAL NOT NULL, digest TEXT NOT NULL)"
+                )
+        return self.conn
+    
+    def record(self, digest, spool, timestamp):
+        """Sürümü kaydeder - gövde sadece ilk görüldüğünde sıkıştırılıp yazılır"""
+        conn = self._connect()
+        with conn:
+            if conn.execute("SELECT 1 FROM versions WHERE digest = ?", (digest,)).fetchone() is None:
+                spool.seek(0)
+                compressor = zlib.compressobj()
+                size = 0
+                chunks = []
+                while chunk := spool.read(CSV_CHUNK_SIZE):
+                    size += len(chunk)
+                    chunks.append(compressor.compress(chunk))
+                chunks.append(compressor.flush())
+                conn.execute(
+                    "INSERT INTO versions (digest, size, body) VALUES (?, ?, ?)",
+                    (digest, size, b''.join(chunks)),
                 )
             
-            # Kapak resmi
-            if cover_url:
-                embed.set_image(url=cover_url)
-            
-            embed.set_footer(
-                text="Zebze Toon",
-            )
-            
-            # Buton ekle
-            view = discord.ui.View()
-            link_url = f"{ZEBZETOON_BASE_URL}/?seri={series_name_encoded}"
-            if chapter_num:
-                link_url += f"&bolum={chapter_num}"
-            
-            view.add_item(discord.ui.Button(
-                label="📖 Oku",
-                style=discord.ButtonStyle.link,
-                url=link_url
-            ))
-            
-            await message.channel.send(embed=embed, view=view)
+            # Yeniden başlatmada aynı sürüm tekrar gelirse yeni gözlem yazılmaz
+            last = conn.execute("SELECT digest FROM observations ORDER BY id DESC LIMIT 1").fetchone()
+            if last is None or last[0] != digest:
+                conn.execute("INSERT INTO observations (timestamp, digest) VALUES (?, ?)", (timestamp, digest))
     
-    # Komutları işle
-    await client.process_commands(message)
+    def history(self, since=None, until=None):
+        """[(zaman_damgası, özet)] - kronolojik sırada"""
+        rows = self._connect().execute(
+            "SELECT timestamp, digest FROM observations WHERE timestamp >= ? AND timestamp <= ? ORDER BY id",
+            (since if since is not None else float('-inf'), until if until is not None else float('inf')),
+        )
+        return rows.fetchall()
+    
+    def load(self, digest):
+        """Sürümün ham CSV gövdesi"""
+        row = self._connect().execute("SELECT body FROM versions WHERE digest = ?", (digest,)).fetchone()
+        if row is None:
+            raise KeyError(digest)
+        return zlib.decompress(row[0])
+    
+    def stats(self):
+        conn = self._connect()
+        versions, size, stored = conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0), COALESCE(SUM(LENGTH(body)), 0) FROM versions"
+        ).fetchone()
+        observations = conn.execute("SELECT COUNT(*) FROM observations").fetchone()[0]
+        return {'versions': versions, 'observations': observations, 'bytes': size, 'stored_bytes': stored}
+    
+    def close(self):
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
 
 
-# ───────────────────────────────────────────────
-# ++seriler KOMUTU - Tüm serileri listele
-# ───────────────────────────────────────────────
-@client.command()
-async def seriler(ctx):
-    """ZebzeToon'daki tüm serileri listeler"""
-    try:
-        loading_msg = await ctx.send("📚 Seriler yükleniyor...")
+catalog_recorder = CatalogRecorder(CATALOG_HISTORY_PATH) if CATALOG_HISTORY_PATH else None
+
+
+def parse_catalog_spool(spool):
+    """İndirilen liste.csv gövdesini baştan parse eder (thread'de çalışır)"""
+    spool.seek(0)
+    with io.TextIOWrapper(spool, encoding='utf-8-sig', newline='') as stream:
+        return parse_zebzetoon_csv(stream)
+
+
+class SeriesCache:
+    """
+    liste.csv için stale-while-revalidate cache.
+    - Elde veri varsa her zaman hemen döner, süresi dolmuşsa arka planda yeniler
+    - Aynı anda gelen yenileme istekleri tek bir upstream isteğinde birleşir
+    - Değişmeyen CSV için koşullu istek (ETag / Last-Modified) ve özet kontrolü yapar
+    - İndirme, yedek kaynaklı CatalogFetcher üzerinden yapılır
+    """
+    
+    def __init__(self, ttl):
+        self.ttl = ttl
+        self.data = {}
+        self.timestamp = None
         
-        # Veriyi çek
-        series_data = fetch_zebzetoon_data()
+        # Son gövdenin özeti (kaynak doğrulayıcıları CatalogFetcher'da)
+        self.digest = None
         
-        if not series_data:
-            await loading_msg.edit(content="❌ Hiç seri bulunamadı.")
-            return
+        # İstatistikler
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.refreshes = 0
+        self.last_error = None  # Son yenileme hatası, başarılıysa None
         
-        await loading_msg.delete()
+        self._refresh_task = None
         
-        # Her seri için embed gönder
-        for series_key, series_info in series_data.items():
-            # Kapak resmini al
-            cover_url = get_cover_image_url(series_info['kapak'])
-            
-            # Durum rengi
-            embed_color = 0x00BFFF  # Varsayılan mavi
-            if "Devam" in series_info['durum']:
-                embed_color = 0x00FF7F  # Yeşil
-            elif "Tamamlandı" in series_info['durum']:
-                embed_color = 0xFFD700  # Altın
-            elif "Bırakıldı" in series_info['durum']:
-                embed_color = 0xFF4500  # Kırmızı
-            
-            # Özet kısalt
-            ozet = series_info['ozet'][:150]
-            if len(series_info['ozet']) > 150:
-                ozet += "..."
-            
-            embed = discord.Embed(
-                title=series_info['isim'],
-                description=f"**Özet:**\n{ozet}" if ozet else "",
-                color=embed_color,
-            )
-            
-            # Field'lar
-            embed.add_field(name="Durum", value=series_info['durum'], inline=True)
-            embed.add_field(name="Türler", value=series_info['tur'] or "—", inline=True)
-            
-            # Thumbnail
-            if cover_url:
-                embed.set_thumbnail(url=cover_url)
+        # Yeni sürüm yüklenince çağrılan coroutine (anlık görüntü kaydı)
+        self.on_update = None
+        self._update_task = None
+    
+    def __len__(self):
+        return len(self.data)
+    
+    @property
+    def age(self):
+        """Son başarılı yenilemeden bu yana geçen süre (saniye), hiç yoksa None"""
+        if self.timestamp is None:
+            return None
+        return datetime.now().timestamp() - self.timestamp
+    
+    def is_stale(self):
+        return self.timestamp is None or self.age >= self.ttl
+    
+    def restore(self, data, digest, timestamp):
+        """Diskteki anlık görüntüden doldurur"""
+        self.data = data
+        self.digest = digest
+        self.timestamp = timestamp
+    
+    @property
+    def refreshing(self):
+        return self._refresh_task is not None and not self._refresh_task.done()
+    
+    async def get(self, force=False):
+        """
+        Seri verisini döndürür.
+        Cache boşsa (ilk yükleme) veya force=True ise yenilemeyi bekler,
+        aksi halde mevcut veriyi hemen döndürür.
+        """
+        if force:
+            return await self.refresh()
+        
+        if not self.data:
+            self.misses += 1
+            return await self.refresh()
+        
+        if self.is_stale():
+            self.stale_hits += 1
+            self._start_refresh()
+        else:
+            self.hits += 1
+        
+        return self.data
+    
+    async def refresh(self):
+        """Yenilemeyi başlatır (veya devam edeni paylaşır) ve sonucunu bekler"""
+        # shield: bekleyen çağıran iptal edilse bile ortak istek devam etsin
+        return await asyncio.shield(self._start_refresh())
+    
+    def _start_refresh(self):
+        if not self.refreshing:
+            self._refresh_task = asyncio.create_task(self._refresh())
+        return self._refresh_task
+    
+    async def _refresh(self):
+        try:
+            self.refreshes += 1
+            
+            # Elimizde veri varsa aynı sürümü vermiş kaynaklara koşullu istek gider (değişmediyse 304)
+            with metrics.timer('zebzetoon_csv_fetch_seconds'):
+                result = await catalog_fetcher.fetch(self.digest if self.data else None)
+            
+            self.last_error = None
+            if result.status == 304:
+                self.timestamp = datetime.now().timestamp()
+                metrics.inc('zebzetoon_csv_fetch_total', result='not_modified')
+                return self.data
+            
+            with result.spool as spool:
+                # İçerik aynıysa (validator desteklenmese bile) parse etmeyi atla
+                digest = result.digest
+                if self.data and digest == self.digest:
+                    self.timestamp = datetime.now().timestamp()
+                    metrics.inc('zebzetoon_csv_fetch_total', result='unchanged')
+                    return self.data
+                
+                if catalog_recorder is not None:
+                    try:
+                        await asyncio.to_thread(catalog_recorder.record, digest, spool, datetime.now().timestamp())
+                    except Exception as e:
+                        print(f"[fetch_zebzetoon_data] Sürüm geçmişe yazılamadı: {e}")
+                
+                # Büyük katalogda parse yüzlerce ms sürebilir - gateway'i bloklamasın
+                with metrics.timer('zebzetoon_csv_parse_seconds'):
+                    series_data = await asyncio.to_thread(parse_catalog_spool, spool)
+            
+            metrics.inc('zebzetoon_csv_fetch_total', result='updated')
+            if not series_data:
+                return self.data
+            
+            self.data = series_data
+            self.timestamp = datetime.now().timestamp()
+            self.digest = digest
+            print(f"[fetch_zebzetoon_data] {len(series_data)} seri yüklendi")
+            if self.on_update is not None:
+                self._update_task = asyncio.create_task(self.on_update())
+            return series_data
+            
+        except Exception as e:
+            print(f"[fetch_zebzetoon_data] Hata: {e}")
+            metrics.inc('zebzetoon_csv_fetch_total', result='error')
+            self.last_error = e
+            return self.data  # Eski cache'i döndür
+
+
+series_cache = SeriesCache(CACHE_DURATION)
+
+
+async def fetch_zebzetoon_data(force=False):
+    """
+    ZebzeToon seri verisini cache üzerinden döndürür.
+    force=True ise upstream'den yenilenmesini bekler.
+    """
+    return await series_cache.get(force=force)
+
+
+def get_cover_image_url(kapak_path):
+    """
+    Kapak resmi yolunu tam URL'ye çevirir.
+    - Eğer http ile başlıyorsa olduğu gibi kullan
+    - Değilse CDN base'i ekle ve 'kapaklar/' prefix'ini kaldır
+    """
+    if not kapak_path:
+        return None
+    
+    if kapak_path.startswith('http'):
+        return kapak_path
+    
+    # 'kapaklar/' prefix'ini kaldır
+    clean_path = kapak_path.replace('kapaklar/', '')
+    return f"{ZEBZETOON_CDN_BASE}{clean_path}"
+
+
+def parse_chapter_bounds(aralik):
+    """
+    Bölüm aralığını (ilk, son) olarak parse eder.
+    Örnek: "1-8" -> (1, 8), geçersizse (None, None)
+    """
+    if not aralik or '-' not in aralik:
+        return None, None
+    
+    try:
+        parts = aralik.split('-')
+        return int(parts[0]), int(parts[1])
+    except (ValueError, IndexError):
+        return None, None
+
+
+# ───────────────────────────────────────────────
+# ARAMA İNDEKSİ
+# ───────────────────────────────────────────────
+# str.lower() Türkçe İ/I harflerini yanlış çevirir ("İ" -> "i̇", "I" -> "i")
+TURKISH_CASE = str.maketrans({'İ': 'i', 'I': 'ı'})
+# Aksan duyarsız anahtar için Türkçe harflerin ASCII karşılıkları
+TURKISH_ASCII = str.maketrans('çğıöşüâîû', 'cgiosuaiu')
+NON_ALNUM_RE = re.compile(r'[^0-9a-z]+')
+
+
+def turkish_lower(text):
+    """Türkçe kurallarına göre küçük harfe çevirir"""
+    return text.translate(TURKISH_CASE).lower()
+
+
+def search_key(text):
+    """
+    Büyük/küçük harf, Türkçe karakter ve aksan duyarsız arama anahtarı.
+    Örnek: "Ölüm Paktı" -> "olum pakti", "IŞIK" -> "isik"
+    """
+    text = turkish_lower(text).translate(TURKISH_ASCII)
+    text = unicodedata.normalize('NFKD', text)
+    text = ''.join(char for char in text if not unicodedata.combining(char))
+    return NON_ALNUM_RE.sub(' ', text).strip()
+
+
+def trigrams(key):
+    padded = f"  {key} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class SearchIndex:
+    """
+    CSV sürümü başına bir kez kurulan seri arama indeksi.
+    - Tam eşleşme: normalize edilmiş anahtar ile sözlük araması
+    - Önek: sıralı anahtarlar üzerinde ikili arama
+    - Bulanık: trigram indeksi ve Jaccard benzerliği
+    """
+    
+    def __init__(self, series_data, version=None):
+        self.version = version
+        self.series = series_data  # {seri adı: Series}
+        
+        # Normalize edilmiş anahtar -> seri adları (farklı isimler aynı anahtara düşebilir)
+        self.keys = defaultdict(list)
+        for series_name in series_data:
+            self.keys[search_key(series_name)].append(series_name)
+        
+        self.sorted_keys = sorted(self.keys)
+        self.trigram_index = defaultdict(list)
+        self.trigram_counts = {}
+        for key in self.keys:
+            grams = trigrams(key)
+            self.trigram_counts[key] = len(grams)
+            for gram in grams:
+                self.trigram_index[gram].append(key)
+    
+    def get(self, query):
+        """Tam eşleşen seriyi döndürür (önce birebir isim, sonra tekil normalize anahtar), yoksa None"""
+        series_info = self.series.get(query)
+        if series_info is not None:
+            return series_info
+        
+        # Aynı anahtara düşen birden fazla seri varsa tahmin edilmez
+        names = self.keys.get(search_key(query), ())
+        return self.series[names[0]] if len(names) == 1 else None
+    
+    def title(self, key):
+        """Normalize edilmiş anahtarın katalogdaki ismi (aynı anahtarlı isimler ' / ' ile), yoksa None"""
+        names = self.keys.get(key)
+        return " / ".join(sorted(names)) if names else None
+    
+    def search(self, query, limit=10):
+        """En iyi eşleşmeleri [(skor, Series)] olarak skor sırasıyla döndürür"""
+        key = search_key(query)
+        if not key:
+            return [(0.0, self.series[name]) for k in self.sorted_keys[:limit] for name in self.keys[k]][:limit]
+        
+        scores = {}
+        
+        # Önek eşleşmeleri: 1 ile 2 arası skor
+        position = bisect.bisect_left(self.sorted_keys, key)
+        while position < len(self.sorted_keys) and self.sorted_keys[position].startswith(key):
+            candidate = self.sorted_keys[position]
+            scores[candidate] = 1.0 + len(key) / len(candidate)
+            position += 1
+        
+        # Trigram benzerliği: 0 ile 1 arası skor
+        grams = trigrams(key)
+        shared = Counter()
+        for gram in grams:
+            shared.update(self.trigram_index.get(gram, ()))
+        for candidate, count in shared.items():
+            similarity = count / (len(grams) + self.trigram_counts[candidate] - count)
+            if similarity >= SEARCH_MIN_SCORE and similarity > scores.get(candidate, 0):
+                scores[candidate] = similarity
+        
+        best = heapq.nlargest(limit, scores.items(), key=lambda item: item[1])
+        results = [(score, self.series[name]) for candidate, score in best for name in self.keys[candidate]]
+        return results[:limit]
+
+
+search_index = None
+
+
+def get_search_index():
+    """Güncel CSV sürümünün arama indeksini döndürür (sürüm değiştiyse yeniden kurar)"""
+    global search_index
+    
+    if search_index is None or search_index.version != series_cache.digest:
+        search_index = SearchIndex(series_cache.data, series_cache.digest)
+    
+    return search_index
+
+
+# ───────────────────────────────────────────────
+# KATALOG ANLIK GÖRÜNTÜSÜ (HIZLI AÇILIŞ)
+# ───────────────────────────────────────────────
+def write_catalog_snapshot(path, snapshot):
+    """
+    Anlık görüntüyü zlib ile sıkıştırılmış JSON olarak atomik yazar (yarım dosya bırakmaz).
+    Seriler alan sırasıyla satır listesi olarak saklanır.
+    """
+    columns = fields(Series)
+    payload = dict(snapshot)
+    payload['series'] = [
+        [getattr(series_info, item.name) for item in columns]
+        for series_info in snapshot['series'].values()
+    ]
+    data = zlib.compress(json.dumps(payload, ensure_ascii=False).encode('utf-8'))
+    
+    temp_path = f"{path}.tmp"
+    with open(temp_path, 'wb') as f:
+        f.write(data)
+    os.replace(temp_path, path)
+
+
+def read_catalog_snapshot(path):
+    """
+    Anlık görüntüyü okur ve arama indeksini kurar; yoksa, bozuksa veya eski formattaysa None.
+    Sadece veri okunur (JSON), dosyadan kod çalıştırılmaz.
+    """
+    try:
+        with open(path, 'rb') as f:
+            snapshot = json.loads(zlib.decompress(f.read()))
+        if not isinstance(snapshot, dict) or snapshot.get('version') != SNAPSHOT_VERSION:
+            return None
+        
+        series_data = {}
+        for row in snapshot['series']:
+            series_info = Series(*row)
+            series_data[series_info.isim] = series_info
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        print(f"[read_catalog_snapshot] Anlık görüntü okunamadı: {e}")
+        return None
+    
+    snapshot['series'] = series_data
+    snapshot['validators'] = {url: tuple(values) for url, values in snapshot['validators'].items()}
+    snapshot['index'] = SearchIndex(series_data, snapshot['digest'])
+    return snapshot
+
+
+def apply_catalog_snapshot(snapshot):
+    global search_index
+    
+    series_cache.restore(snapshot['series'], snapshot['digest'], snapshot['timestamp'])
+    catalog_fetcher.restore_validators(snapshot['validators'])
+    search_index = snapshot['index']
+    print(f"[load_catalog_snapshot] {len(series_cache)} seri anlık görüntüden yüklendi")
+
+
+def load_catalog_snapshot():
+    """
+    Son iyi katalogu diskten yükler (arama indeksi okunurken yeniden kurulur).
+    Cache bayat sayılır: ilk istekte upstream ile arka planda uzlaşılır.
+    """
+    if not SNAPSHOT_PATH or series_cache.data:
+        return False
+    
+    snapshot = read_catalog_snapshot(SNAPSHOT_PATH)
+    if snapshot is None:
+        return False
+    
+    apply_catalog_snapshot(snapshot)
+    return True
+
+
+async def save_catalog_snapshot():
+    """Yeni CSV sürümünün seri satırlarını diske yazar - event loop dışında"""
+    global search_index, snapshot_digest
+    
+    digest, series_data = series_cache.digest, series_cache.data
+    if not SNAPSHOT_PATH or digest == snapshot_digest:
+        return
+    
+    # Dosyaya yazılmaz; sadece ön ısıtma: yeni sürümün arama indeksi ilk komutu
+    # beklemeden thread'de kurulur, sürüm hâlâ güncelse paylaşılır
+    index = search_index
+    if index is None or index.version != digest:
+        index = await asyncio.to_thread(SearchIndex, series_data, digest)
+        if series_cache.digest == digest:
+            search_index = index
+    
+    snapshot = {
+        'version': SNAPSHOT_VERSION,
+        'digest': digest,
+        'validators': catalog_fetcher.validators(),
+        'timestamp': series_cache.timestamp,
+        'series': series_data,
+    }
+    try:
+        await asyncio.to_thread(write_catalog_snapshot, SNAPSHOT_PATH, snapshot)
+        snapshot_digest = digest
+    except Exception as e:
+        print(f"[save_catalog_snapshot] Anlık görüntü yazılamadı: {e}")
+
+
+snapshot_digest = None  # Diske yazılan son sürümün özeti
+series_cache.on_update = save_catalog_snapshot
+
+
+# ───────────────────────────────────────────────
+# KAPAK DOĞRULAMA
+# ───────────────────────────────────────────────
+@dataclass(slots=True)
+class CoverInfo:
+    """Bir kapak URL'sinin son kontrol sonucu"""
+    url: str
+    status: int
+    size: int
+    content_type: str
+    etag: str | None
+    checked: float  # Unix zaman damgası
+    
+    @property
+    def ok(self):
+        return 200 <= self.status < 300 and self.content_type.startswith('image/')
+
+
+class CoverChecker:
+    """
+    Kapak URL'lerini arka planda HEAD istekleriyle doğrular.
+    - Sonuçlar (durum, boyut, içerik türü, ETag) SQLite'ta saklanan bir LRU'da tutulur
+    - URL sadece ilk görüldüğünde veya serinin kapak alanı değişince kontrol edilir
+    - Embed çizimi sadece önbelleğe bakar: bilinmeyen kapak kullanılır, bozuk olan kullanılmaz
+    """
+    
+    def __init__(self, workers, max_size):
+        self.semaphore = asyncio.Semaphore(workers)
+        self.max_size = max_size
+        self.entries = OrderedDict()  # {url: CoverInfo}
+        self.pending = {}             # {url: {seri adı}} - kontrol bekleyen URL'ler
+        self.forced = set()           # Önbellekte olsa da yeniden kontrol edilecekler
+        self._task = None
+    
+    def __len__(self):
+        return len(self.entries)
+    
+    @property
+    def broken(self):
+        return sum(1 for info in self.entries.values() if not info.ok)
+    
+    def restore(self, infos):
+        for info in infos:
+            self.entries[info.url] = info
+    
+    def usable(self, url):
+        """Embed'de kullanılabilir mi - istek atmaz, henüz kontrol edilmemiş URL'ler kullanılır"""
+        info = self.entries.get(url)
+        if info is None:
+            return True
+        self.entries.move_to_end(url)
+        return info.ok
+    
+    def schedule(self, url, series_name, force=False):
+        """URL'yi kontrol sırasına ekler (önbellekteyse force olmadan atlanır)"""
+        if not url or (url in self.entries and not force):
+            return
+        
+        self.pending.setdefault(url, set()).add(series_name)
+        if force:
+            self.forced.add(url)
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+    
+    def sweep(self, series_data):
+        """Katalogda henüz kontrol edilmemiş kapakları sıraya ekler"""
+        for series_info in series_data.values():
+            self.schedule(get_cover_image_url(series_info.kapak), series_info.isim)
+    
+    def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+    
+    async def _run(self):
+        while self.pending:
+            batch, self.pending = self.pending, {}
+            forced, self.forced = self.forced, set()
+            batch = {url: names for url, names in batch.items() if url in forced or url not in self.entries}
+            
+            results = await asyncio.gather(*(self._check(url) for url in batch))
             
-            # Buton
-            view = discord.ui.View()
-            from urllib.parse import quote
-            series_url = f"{ZEBZETOON_BASE_URL}/?seri={quote(series_info['isim'])}"
-            view.add_item(discord.ui.Button(
-                label="📚 Seriye Git",
+            changed, evicted = set(), []
+            for url, info in zip(batch, results):
+                if info is None:
+                    continue
+                previous = self.entries.pop(url, None)
+                self.entries[url] = info
+                if info.ok != (previous.ok if previous else True):
+                    changed |= batch[url]
+                if not info.ok:
+                    print(f"[CoverChecker] Bozuk kapak ({info.status}, {info.content_type or '-'}): {url}")
+            
+            while len(self.entries) > self.max_size:
+                evicted.append(self.entries.popitem(last=False)[0])
+            
+            state_store.save_covers([info for info in results if info is not None], evicted)
+            
+            if changed:
+                # Kapak kullanılabilirliği değişen serilerin kartları yeniden çizilsin
+                render_cache.invalidate(changed)
+                self._schedule_banners(changed)
+    
+    def _schedule_banners(self, series_names):
+        # Kapağı bozuk serilerde yedek olarak banner kullanılır, onu da doğrula
+        for series_name in series_names:
+            series_info = series_cache.data.get(series_name)
+            if series_info and not self.usable(get_cover_image_url(series_info.kapak)):
+                self.schedule(get_cover_image_url(series_info.banner), series_name)
+    
+    async def _check(self, url):
+        """URL'ye koşullu HEAD isteği atar. Geçici hatada None döner (sonuç kaydedilmez)"""
+        previous = self.entries.get(url)
+        headers = {'If-None-Match': previous.etag} if previous and previous.etag else {}
+        
+        try:
+            async with self.semaphore:
+                async with get_http_session().head(url, headers=headers, allow_redirects=True) as response:
+                    status = response.status
+                    size = response.content_length or 0
+                    content_type = response.content_type or ''
+                    etag = response.headers.get('ETag')
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            print(f"[CoverChecker] {url} kontrol edilemedi: {e}")
+            metrics.inc('zebzetoon_cover_checks_total', result='error')
+            return None
+        
+        if status == 304 and previous is not None:
+            metrics.inc('zebzetoon_cover_checks_total', result='not_modified')
+            return CoverInfo(url, previous.status, previous.size, previous.content_type, previous.etag, time.time())
+        
+        if status == 429 or status >= 500:
+            metrics.inc('zebzetoon_cover_checks_total', result='error')
+            return None
+        
+        info = CoverInfo(url, status, size, content_type, etag, time.time())
+        metrics.inc('zebzetoon_cover_checks_total', result='ok' if info.ok else 'broken')
+        return info
+
+
+cover_checker = CoverChecker(COVER_CHECK_WORKERS, COVER_CACHE_SIZE)
+
+
+def cover_image(series_info):
+    """Embed resmi: kapak, bozuksa banner, o da bozuksa None"""
+    for path in (series_info.kapak, series_info.banner):
+        url = get_cover_image_url(path)
+        if url and cover_checker.usable(url):
+            return url
+    return None
+
+
+# ───────────────────────────────────────────────
+# EMBED ÇİZİMİ (RENDER CACHE)
+# ───────────────────────────────────────────────
+def status_color(durum):
+    """Seri durumuna göre embed rengi"""
+    if not durum:
+        return 0x00BFFF  # Varsayılan mavi
+    if "Devam" in durum:
+        return 0x00FF7F  # Yeşil
+    if "Tamamlandı" in durum:
+        return 0xFFD700  # Altın
+    if "Bırakıldı" in durum:
+        return 0xFF4500  # Kırmızı
+    return 0x00BFFF
+
+
+def shorten(text, limit):
+    """Metni limit karakterde keser ve '...' ekler"""
+    return text[:limit] + "..." if len(text) > limit else text
+
+
+def series_link(series_info, chapter=None):
+    url = f"{ZEBZETOON_BASE_URL}/?seri={quote(series_info.isim)}"
+    if chapter:
+        url += f"&bolum={chapter}"
+    return url
+
+
+def link_view(label, url):
+    """Tek link butonlu view - link butonları state tutmaz, tekrar kullanılabilir"""
+    view = discord.ui.View(timeout=None)
+    view.add_item(discord.ui.Button(
+        label=label,
+        style=discord.ButtonStyle.link,
+        url=url
+    ))
+    return view
+
+
+def render_link_card(series_info, chapter):
+    """Mesajdaki ZebzeToon linki için kart"""
+    embed = discord.Embed(
+        title=f"📖 {series_info.isim}",
+        description=shorten(series_info.ozet, 200),
+        color=random.choice(EMBED_COLORS),
+    )
+    
+    # Seri bilgileri
+    embed.add_field(name="📚 Seri", value=f"`{series_info.isim}`", inline=True)
+    if chapter:
+        embed.add_field(name="📄 Bölüm", value=f"`{chapter}`", inline=True)
+    embed.add_field(name="📊 Durum", value=series_info.durum, inline=True)
+    if series_info.tur:
+        embed.add_field(name="🏷️ Tür", value=series_info.tur, inline=False)
+    
+    # Kapak resmi
+    cover_url = cover_image(series_info)
+    if cover_url:
+        embed.set_image(url=cover_url)
+    
+    embed.set_footer(text="Zebze Toon")
+    return embed, link_view("📖 Oku", series_link(series_info, chapter))
+
+
+def render_list_card(series_info, chapter):
+    """++seriler listesindeki kısa kart"""
+    ozet = shorten(series_info.ozet, 150)
+    embed = discord.Embed(
+        title=series_info.isim,
+        description=f"**Özet:**\n{ozet}" if ozet else "",
+        color=status_color(series_info.durum),
+    )
+    embed.add_field(name="Durum", value=series_info.durum, inline=True)
+    embed.add_field(name="Türler", value=series_info.tur or "—", inline=True)
+    
+    cover_url = cover_image(series_info)
+    if cover_url:
+        embed.set_thumbnail(url=cover_url)
+    
+    return embed, link_view("📚 Seriye Git", series_link(series_info))
+
+
+def render_detail_card(series_info, chapter):
+    """++seri komutundaki detaylı kart"""
+    embed = discord.Embed(
+        title=f"📚 {series_info.isim}",
+        description=f"**{series_info.durum}**\n\n🏷️ {series_info.tur}\n\n{series_info.ozet}",
+        color=status_color(series_info.durum),
+    )
+    
+    # Büyük kapak resmi
+    cover_url = cover_image(series_info)
+    if cover_url:
+        embed.set_image(url=cover_url)
+    
+    embed.set_footer(text="Zebze Toon • ++seri")
+    return embed, link_view("📚 Seriye Git", series_link(series_info))
+
+
+def render_announcement(series_info, chapter):
+    """
+    Yeni bölüm duyurusu kartı.
+    chapter tek bölüm ya da birden fazla bölüm eklendiyse (ilk, son) aralığıdır.
+    """
+    first, last = chapter if isinstance(chapter, tuple) else (chapter, chapter)
+    label = f"{first}-{last}" if first != last else f"{last}"
+    
+    embed = discord.Embed(
+        title=f"� {series_info.isim}",
+        description=f"**Bölüm {label}** yayınlandı!\n\n"
+                   f"━━━━━━━━━━━━━━━━━━━━━━",
+        color=random.choice(EMBED_COLORS),
+    )
+    
+    # Seri ve bölüm bilgisi
+    embed.add_field(name="📚 Seri", value=f"`{series_info.isim}`", inline=True)
+    embed.add_field(name="📄 Bölüm", value=f"`{label}`", inline=True)
+    # Boş alan
+    embed.add_field(name="\u200b", value="\u200b", inline=True)
+    
+    cover_url = cover_image(series_info)
+    if cover_url:
+        embed.set_image(url=cover_url)
+    
+    embed.set_footer(text="Zebze Toon")
+    # Okuyucuyu eklenen ilk bölüme götür
+    return embed, link_view("📖 Oku", series_link(series_info, first))
+
+
+def render_unlock(series_info, chapter):
+    """Kilidi açılan bölüm duyurusu kartı"""
+    embed = discord.Embed(
+        title=f"🔓 {series_info.isim}",
+        description=f"**Bölüm {chapter}** artık ücretsiz!",
+        color=status_color(series_info.durum),
+    )
+    embed.add_field(name="📚 Seri", value=f"`{series_info.isim}`", inline=True)
+    embed.add_field(name="📄 Bölüm", value=f"`{chapter}`", inline=True)
+    
+    cover_url = cover_image(series_info)
+    if cover_url:
+        embed.set_thumbnail(url=cover_url)
+    
+    embed.set_footer(text="Zebze Toon")
+    return embed, link_view("📖 Oku", series_link(series_info, chapter))
+
+
+RENDERERS = {
+    'link': render_link_card,
+    'list': render_list_card,
+    'detail': render_detail_card,
+    'announce': render_announcement,
+    'unlock': render_unlock,
+}
+
+
+class RenderCache:
+    """
+    Seri kartlarını (embed, view) CSV sürümü başına bir kez oluşturur.
+    Anahtar: (seri, bölüm, varyant) - LRU ile sınırlı, CSV değişince tamamen boşaltılır.
+    """
+    
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self.entries = OrderedDict()
+        self.pages = {}  # {filtre: [[Series, ...], ...]} - ++seriler sayfaları
+        self.version = None
+        self.hits = 0
+        self.misses = 0
+    
+    def __len__(self):
+        return len(self.entries)
+    
+    def _sync_version(self):
+        # Yeni CSV sürümü - eski kartlar ve sayfalar geçersiz
+        if series_cache.digest != self.version:
+            self.entries.clear()
+            self.pages.clear()
+            self.version = series_cache.digest
+    
+    def get(self, series_info, variant, chapter=None):
+        self._sync_version()
+        
+        key = (series_info.isim, chapter, variant)
+        card = self.entries.get(key)
+        if card is not None:
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return card
+        
+        self.misses += 1
+        with metrics.timer('zebzetoon_render_seconds', variant=variant):
+            card = RENDERERS[variant](series_info, chapter)
+        self.entries[key] = card
+        if len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+        return card
+    
+    def invalidate(self, series_names):
+        """Verilen serilerin kartlarını atar (ör. kapak doğrulama sonucu değişince)"""
+        for key in [key for key in self.entries if key[0] in series_names]:
+            del self.entries[key]
+    
+    def get_pages(self, series_data, filtre=None):
+        """
+        ++seriler sayfalarını döndürür (SERIES_PAGE_SIZE'lık seri grupları).
+        filtre durum veya tür içinde aranır; sonuç CSV sürümü boyunca saklanır.
+        """
+        self._sync_version()
+        
+        pages = self.pages.get(filtre)
+        if pages is None:
+            series_list = list(series_data.values())
+            if filtre:
+                needle = search_key(filtre)
+                series_list = [
+                    series_info for series_info in series_list
+                    if needle in search_key(series_info.durum) or needle in search_key(series_info.tur)
+                ]
+            pages = [
+                series_list[i:i + SERIES_PAGE_SIZE]
+                for i in range(0, len(series_list), SERIES_PAGE_SIZE)
+            ]
+            self.pages[filtre] = pages
+        
+        return pages
+
+
+render_cache = RenderCache(RENDER_CACHE_SIZE)
+
+
+def render_card(series_info, variant, chapter=None):
+    """Seri kartını render cache üzerinden döndürür: (embed, view)"""
+    return render_cache.get(series_info, variant, chapter)
+
+
+# ───────────────────────────────────────────────
+# KALICI DURUM DEPOSU
+# ───────────────────────────────────────────────
+class StateStore:
+    """
+    Duyurulan bölümleri ve son işlenen CSV özetini SQLite'ta saklar.
+    Bot yeniden başladığında kaçırılan bölümler bu duruma göre duyurulur.
+    """
+    
+    def __init__(self, path):
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        with self.conn:
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS chapters ("
+                "series TEXT PRIMARY KEY, chapter INTEGER NOT NULL)"
+            )
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS meta ("
+                "key TEXT PRIMARY KEY, value TEXT)"
+            )
+            # Eski şemada thread'ler tek üst kanala aitti - indeks açılışta zaten yeniden kurulur
+            columns = [row[1] for row in self.conn.execute("PRAGMA table_info(series_threads)")]
+            if columns and 'parent_id' not in columns:
+                self.conn.execute("DROP TABLE series_threads")
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS series_threads ("
+                "parent_id INTEGER NOT NULL, series_key TEXT NOT NULL, thread_id INTEGER NOT NULL, "
+                "PRIMARY KEY (parent_id, series_key))"
+            )
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS webhooks ("
+                "channel_id INTEGER PRIMARY KEY, url TEXT NOT NULL)"
+            )
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS guild_configs ("
+                "guild_id INTEGER PRIMARY KEY, channel_id INTEGER NOT NULL, "
+                "thread_channel_id INTEGER NOT NULL, series TEXT NOT NULL)"
+            )
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS subscriptions ("
+                "series_key TEXT NOT NULL, user_id INTEGER NOT NULL, "
+                "PRIMARY KEY (series_key, user_id))"
+            )
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS dm_failures ("
+                "user_id INTEGER PRIMARY KEY, failures INTEGER NOT NULL)"
+            )
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS unlocks ("
+                "series TEXT PRIMARY KEY, chapter INTEGER NOT NULL)"
+            )
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS covers ("
+                "url TEXT PRIMARY KEY, status INTEGER NOT NULL, size INTEGER NOT NULL, "
+                "content_type TEXT NOT NULL, etag TEXT, checked REAL NOT NULL)"
+            )
+    
+    def close(self):
+        self.conn.close()
+    
+    def load_chapters(self):
+        """{seri_adı: duyurulan_son_bölüm} döndürür"""
+        return dict(self.conn.execute("SELECT series, chapter FROM chapters"))
+    
+    def get_meta(self, key):
+        row = self.conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+    
+    def set_meta(self, key, value):
+        with self.conn:
+            self.conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+    
+    def save_chapters(self, updates, digest=None):
+        """
+        Bir kontrol turundaki tüm değişiklikleri tek transaction'da yazar.
+        digest verilirse son işlenen CSV özeti olarak kaydedilir.
+        """
+        if not updates and digest is None:
+            return
+        
+        with self.conn:
+            self.conn.executemany(
+                "INSERT INTO chapters (series, chapter) VALUES (?, ?) "
+                "ON CONFLICT(series) DO UPDATE SET chapter = excluded.chapter",
+                updates.items(),
+            )
+            if digest is not None:
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO meta (key, value) VALUES ('csv_digest', ?)",
+                    (digest,),
+                )
+    
+    def load_threads(self):
+        """{(üst_kanal_id, seri_anahtarı): thread_id} döndürür"""
+        return {
+            (parent_id, series_key): thread_id
+            for parent_id, series_key, thread_id in self.conn.execute(
+                "SELECT parent_id, series_key, thread_id FROM series_threads"
+            )
+        }
+    
+    def replace_threads(self, parent_ids, threads):
+        """Verilen üst kanalların thread indeksini baştan yazar (tam tarama sonrası)"""
+        with self.conn:
+            self.conn.executemany(
+                "DELETE FROM series_threads WHERE parent_id = ?",
+                [(parent_id,) for parent_id in parent_ids],
+            )
+            self.conn.executemany(
+                "INSERT INTO series_threads (parent_id, series_key, thread_id) VALUES (?, ?, ?)",
+                [(parent_id, series_key, thread_id) for (parent_id, series_key), thread_id in threads.items()],
+            )
+    
+    def save_thread(self, parent_id, series_key, thread_id):
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO series_threads (parent_id, series_key, thread_id) VALUES (?, ?, ?)",
+                (parent_id, series_key, thread_id),
+            )
+    
+    def delete_thread(self, parent_id, series_key):
+        with self.conn:
+            self.conn.execute(
+                "DELETE FROM series_threads WHERE parent_id = ? AND series_key = ?",
+                (parent_id, series_key),
+            )
+    
+    def load_webhooks(self):
+        """{kanal_id: webhook_url} döndürür"""
+        return dict(self.conn.execute("SELECT channel_id, url FROM webhooks"))
+    
+    def save_webhook(self, channel_id, url):
+        with self.conn:
+            self.conn.execute("INSERT OR REPLACE INTO webhooks (channel_id, url) VALUES (?, ?)", (channel_id, url))
+    
+    def delete_webhook(self, channel_id):
+        with self.conn:
+            self.conn.execute("DELETE FROM webhooks WHERE channel_id = ?", (channel_id,))
+    
+    def load_guild_configs(self):
+        """{guild_id: GuildConfig} döndürür"""
+        return {
+            guild_id: GuildConfig(guild_id, channel_id, thread_channel_id, frozenset(json.loads(series)))
+            for guild_id, channel_id, thread_channel_id, series in self.conn.execute(
+                "SELECT guild_id, channel_id, thread_channel_id, series FROM guild_configs"
+            )
+        }
+    
+    def save_guild_config(self, config):
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO guild_configs (guild_id, channel_id, thread_channel_id, series) "
+                "VALUES (?, ?, ?, ?)",
+                (config.guild_id, config.channel_id, config.thread_channel_id, json.dumps(sorted(config.series))),
+            )
+    
+    def load_subscriptions(self):
+        """[(seri_anahtarı, kullanıcı_id)] döndürür"""
+        return self.conn.execute("SELECT series_key, user_id FROM subscriptions").fetchall()
+    
+    def add_subscription(self, series_key, user_id):
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR IGNORE INTO subscriptions (series_key, user_id) VALUES (?, ?)",
+                (series_key, user_id),
+            )
+    
+    def remove_subscription(self, series_key, user_id):
+        with self.conn:
+            self.conn.execute(
+                "DELETE FROM subscriptions WHERE series_key = ? AND user_id = ?",
+                (series_key, user_id),
+            )
+    
+    def remove_subscriber(self, user_id):
+        """Kullanıcının tüm takiplerini ve hata sayacını siler"""
+        with self.conn:
+            self.conn.execute("DELETE FROM subscriptions WHERE user_id = ?", (user_id,))
+            self.conn.execute("DELETE FROM dm_failures WHERE user_id = ?", (user_id,))
+    
+    def load_dm_failures(self):
+        """{kullanıcı_id: üst üste başarısız DM} döndürür"""
+        return dict(self.conn.execute("SELECT user_id, failures FROM dm_failures"))
+    
+    def save_dm_failures(self, failures, cleared=()):
+        """Bir dağıtımdaki hata sayaçlarını tek transaction'da yazar"""
+        if not failures and not cleared:
+            return
+        
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO dm_failures (user_id, failures) VALUES (?, ?)",
+                failures.items(),
+            )
+            self.conn.executemany(
+                "DELETE FROM dm_failures WHERE user_id = ?",
+                [(user_id,) for user_id in cleared],
+            )
+    
+    def load_unlocks(self):
+        """{seri: duyurulan son açılan bölüm} döndürür"""
+        return dict(self.conn.execute("SELECT series, chapter FROM unlocks"))
+    
+    def save_unlock(self, series_name, chapter):
+        self.save_unlocks({series_name: chapter})
+    
+    def save_unlocks(self, unlocks):
+        """{seri: bölüm} kayıtlarını tek transaction'da yazar"""
+        if not unlocks:
+            return
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO unlocks (series, chapter) VALUES (?, ?)",
+                unlocks.items(),
+            )
+    
+    def load_covers(self):
+        """Kapak kontrol sonuçlarını en eskiden en yeniye döndürür (LRU sırası)"""
+        rows = self.conn.execute(
+            "SELECT url, status, size, content_type, etag, checked FROM covers ORDER BY checked"
+        )
+        return [CoverInfo(*row) for row in rows]
+    
+    def save_covers(self, infos, evicted=()):
+        """Bir kontrol turunun sonuçlarını ve LRU'dan düşenleri tek transaction'da yazar"""
+        if not infos and not evicted:
+            return
+        
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO covers (url, status, size, content_type, etag, checked) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                [(info.url, info.status, info.size, info.content_type, info.etag, info.checked) for info in infos],
+            )
+            self.conn.executemany("DELETE FROM covers WHERE url = ?", [(url,) for url in evicted])
+
+
+# ───────────────────────────────────────────────
+# SUNUCU AYARLARI
+# ───────────────────────────────────────────────
+@dataclass(slots=True)
+class GuildConfig:
+    """Bir sunucunun duyuru ayarları"""
+    guild_id: int
+    channel_id: int = 0              # Duyuru kanalı (0: kapalı)
+    thread_channel_id: int = 0       # Seri thread'lerinin üst kanalı (0: kapalı)
+    series: frozenset = frozenset()  # Duyurulacak seri anahtarları (boş: hepsi)
+    
+    def wants(self, series_key):
+        return not self.series or series_key in self.series
+
+
+def legacy_config():
+    """
+    CHANNEL_ID / SERIES_THREAD_CHANNEL_ID ile verilen tek sunucu ayarı.
+    O sunucu ++ayar ile kendi ayarını kaydettiyse kullanılmaz.
+    """
+    channel = client.get_channel(CHANNEL_ID) if CHANNEL_ID else None
+    if channel is None or channel.guild.id in guild_configs:
+        return None
+    return GuildConfig(channel.guild.id, CHANNEL_ID, SERIES_THREAD_CHANNEL_ID)
+
+
+def get_guild_config(guild_id):
+    config = guild_configs.get(guild_id)
+    if config is None:
+        legacy = legacy_config()
+        if legacy is not None and legacy.guild_id == guild_id:
+            return legacy
+    return config
+
+
+def active_guild_configs():
+    """Duyuru alan tüm sunucuların ayarları"""
+    configs = list(guild_configs.values())
+    legacy = legacy_config()
+    if legacy is not None:
+        configs.append(legacy)
+    return configs
+
+
+def series_wanted(series_key):
+    """Seriyi duyuran (kanal veya thread ayarlı) bir sunucu ayarı var mı - sunucu o an erişilemese de"""
+    return any(
+        (config.channel_id or config.thread_channel_id) and config.wants(series_key)
+        for config in active_guild_configs()
+    )
+
+
+def thread_parent_ids():
+    return {config.thread_channel_id for config in active_guild_configs() if config.thread_channel_id}
+
+
+# ───────────────────────────────────────────────
+# SERİ THREAD'İ OLUŞTUR VEYA BUL
+# ───────────────────────────────────────────────
+def thread_key(series_name):
+    """Thread indeksinde kullanılan seri anahtarı"""
+    return search_key(series_name)
+
+
+def index_series_thread(thread):
+    """Seri kanallarından birinin altındaki thread'i indekse ekler"""
+    if thread.parent_id not in thread_parent_ids():
+        return
+    
+    key = (thread.parent_id, thread_key(thread.name))
+    if series_threads.get(key) != thread.id:
+        series_threads[key] = thread.id
+        state_store.save_thread(*key, thread.id)
+
+
+def forget_series_thread(thread_id):
+    """Silinen thread'i indeksten çıkarır"""
+    for key, indexed_id in list(series_threads.items()):
+        if indexed_id == thread_id:
+            del series_threads[key]
+            state_store.delete_thread(*key)
+
+
+async def build_thread_index(parent_ids=None):
+    """
+    Seri kanallarındaki aktif ve tüm arşivlenmiş thread'leri bir kez tarayıp
+    indeksi yeniden kurar. Sonrasında indeks thread event'leri ile güncel tutulur.
+    parent_ids verilmezse tüm sunucuların seri kanalları taranır.
+    """
+    if parent_ids is None:
+        parent_ids = thread_parent_ids()
+        # Artık kullanılmayan kanalların kayıtlarını da bırak
+        stale_ids = {parent_id for parent_id, series_key in series_threads} - parent_ids
+        parent_ids = parent_ids | stale_ids
+    
+    threads = {}
+    scanned = set()
+    for parent_id in parent_ids:
+        parent_channel = client.get_channel(parent_id)
+        if not isinstance(parent_channel, discord.TextChannel):
+            scanned.add(parent_id)
+            continue
+        
+        try:
+            for thread in parent_channel.threads:
+                threads.setdefault((parent_id, thread_key(thread.name)), thread.id)
+            
+            # limit=None: tüm arşiv sayfalarını dolaş
+            async for thread in parent_channel.archived_threads(limit=None):
+                threads.setdefault((parent_id, thread_key(thread.name)), thread.id)
+            scanned.add(parent_id)
+            
+        except Exception as e:
+            print(f"[build_thread_index] {parent_id} taranamadı: {e}")
+    
+    for key in [key for key in series_threads if key[0] in scanned]:
+        del series_threads[key]
+    series_threads.update({key: thread_id for key, thread_id in threads.items() if key[0] in scanned})
+    state_store.replace_threads(scanned, {key: thread_id for key, thread_id in threads.items() if key[0] in scanned})
+    print(f"[build_thread_index] {len(scanned)} kanalda {len(threads)} seri thread'i indekslendi")
+
+
+async def get_or_create_series_thread(guild, parent_id, series_name, cover_url=None, status=None, genres=None):
+    """
+    parent_id kanalı altında seri için thread bulur veya oluşturur.
+    Mevcut thread'ler indeksten bulunur, keşif için API çağrısı yapılmaz.
+    İzin/kanal hatasında None döner, geçici HTTP hataları çağırana iletilir.
+    """
+    if not series_name or not parent_id:
+        return None
+    
+    # İndekste varsa doğrudan kullan (arşivdeyse mesaj göndermek thread'i açar)
+    thread_id = series_threads.get((parent_id, thread_key(series_name)))
+    if thread_id:
+        return guild.get_thread(thread_id) or client.get_partial_messageable(
+            thread_id,
+            guild_id=guild.id,
+            type=discord.ChannelType.public_thread,
+        )
+    
+    parent_channel = guild.get_channel(parent_id)
+    if not parent_channel:
+        print(f"[get_or_create_series_thread] Kanal bulunamadı: {parent_id}")
+        return None
+    
+    # Yeni thread oluştur
+    try:
+        # İlk mesaj embed'i
+        desc_parts = []
+        if status:
+            desc_parts.append(f"**{status}**")
+        if genres:
+            desc_parts.append(f"🏷️ {genres}")
+        desc_parts.append("Yeni bölümler burada paylaşılacak!")
+        
+        embed = discord.Embed(
+            title=f"📚 {series_name}",
+            description="\n".join(desc_parts),
+            color=status_color(status),
+        )
+        if cover_url:
+            embed.set_thumbnail(url=cover_url)
+        
+        # Thread oluştur
+        if isinstance(parent_channel, discord.TextChannel):
+            msg = await parent_channel.send(embed=embed)
+            thread = await msg.create_thread(name=series_name)
+            index_series_thread(thread)
+            print(f"[get_or_create_series_thread] Yeni thread oluşturuldu: {series_name}")
+            return thread
+        
+    except (discord.Forbidden, discord.NotFound) as e:
+        # Kalıcı hata - geçici hatalar (429, 5xx, bağlantı) teslimat kuyruğunda yeniden denenir
+        print(f"[get_or_create_series_thread] Thread oluşturma hatası: {e}")
+    
+    return None
+
+
+# ───────────────────────────────────────────────
+# BOT AÇILDIĞINDA
+# ───────────────────────────────────────────────
+@client.event
+async def on_ready():
+    print("ZebzeToon Discord Bot aktif!")
+    # İlk veri yüklemesi - anlık görüntü yüklendiyse beklemeden döner, arka planda yenilenir
+    await fetch_zebzetoon_data()
+    # Otomatik duyuru task'ını başlat
+    await start_chapter_polling()
+    await client.change_presence(activity=discord.Game(name="Manga Okuyor..."))
+
+
+# ───────────────────────────────────────────────
+# THREAD İNDEKSİ GÜNCELLEME
+# ───────────────────────────────────────────────
+@client.event
+async def on_thread_create(thread):
+    index_series_thread(thread)
+
+
+@client.event
+async def on_thread_update(before, after):
+    # İsim değiştiyse eski anahtarı bırak
+    if before.name != after.name:
+        forget_series_thread(after.id)
+    index_series_thread(after)
+
+
+@client.event
+async def on_raw_thread_delete(payload):
+    forget_series_thread(payload.thread_id)
+
+
+# ───────────────────────────────────────────────
+# ZebzeToon LINK YAKALAMA
+# ───────────────────────────────────────────────
+class CooldownCache:
+    """Anahtar başına süreli bekleme kaydı - süresi dolan kayıtlar toplu temizlenir"""
+    
+    def __init__(self, ttl, prune_size=1024):
+        self.ttl = ttl
+        self.prune_size = prune_size
+        self.expires = {}
+    
+    def __len__(self):
+        return len(self.expires)
+    
+    def check(self, key):
+        """Anahtar beklemedeyse True, değilse kaydeder ve False döndürür"""
+        now = time.monotonic()
+        if self.expires.get(key, 0) > now:
+            return True
+        
+        self.expires[key] = now + self.ttl
+        if len(self.expires) > self.prune_size:
+            self.expires = {k: expiry for k, expiry in self.expires.items() if expiry > now}
+        return False
+
+
+link_cooldowns = CooldownCache(LINK_COOLDOWN)
+
+
+@client.event
+async def on_message(message):
+    # Bot'un kendi mesajlarını ignore et
+    if message.author.bot:
+        return
+    
+    # Hızlı kontrol: link içeremeyecek mesajlarda regex çalıştırma
+    if ZEBZETOON_LINK_MARKER in message.content:
+        await send_link_cards(message)
+    
+    # Komutları işle
+    await client.process_commands(message)
+
+
+async def send_link_cards(message):
+    """Mesajdaki ZebzeToon linkleri için seri kartlarını gönderir"""
+    # Aynı link birden çok kez yapıştırıldıysa bir kez işle
+    matches = dict.fromkeys(ZEBZETOON_LINK_RE.findall(message.content))
+    if not matches:
+        return
+    
+    # Veriyi çek
+    await fetch_zebzetoon_data()
+    index = get_search_index()
+    
+    for series_name_encoded, chapter_num in matches:
+        # URL decode
+        series_name = unquote(series_name_encoded)
+        chapter = int(chapter_num) if chapter_num else None
+        
+        # Seriyi bul
+        series_info = index.get(series_name)
+        
+        if not series_info:
+            print(f"[on_message] Seri bulunamadı: {series_name}")
+            continue
+        
+        # Farklı yazılmış aynı link veya kanalda yakın zamanda gönderilmiş kart
+        if link_cooldowns.check((message.channel.id, series_info.isim, chapter)):
+            continue
+        
+        embed, view = render_card(series_info, 'link', chapter)
+        with metrics.timer('zebzetoon_discord_send_seconds', target='link'):
+            await message.channel.send(embed=embed, view=view)
+        metrics.inc('zebzetoon_discord_send_total', target='link', result='ok')
+
+
+# ───────────────────────────────────────────────
+# ++seriler KOMUTU - Tüm serileri listele
+# ───────────────────────────────────────────────
+class SeriesPaginator(discord.ui.View):
+    """
+    ++seriler için tek mesajlık sayfalı liste.
+    Her sayfada en fazla 10 seri kartı ve seriye giden link butonları bulunur,
+    sayfa değişimi ve durum filtresi mesajı yerinde düzenler.
+    """
+    
+    def __init__(self, author_id, series_data, filtre=None):
+        super().__init__(timeout=SERIES_PAGE_TIMEOUT)
+        self.author_id = author_id
+        self.series_data = series_data
+        self.message = None
+        self.link_buttons = []
+        
+        # Durum filtresi seçenekleri (select menü en fazla 25 seçenek alır)
+        statuses = sorted({series_info.durum for series_info in series_data.values() if series_info.durum})
+        self.status_select.options = [discord.SelectOption(label="Tümü", value="*")] + [
+            discord.SelectOption(label=durum[:100], value=durum[:100]) for durum in statuses[:24]
+        ]
+        
+        self.set_filter(filtre)
+    
+    def set_filter(self, filtre):
+        self.filtre = filtre
+        self.pages = render_cache.get_pages(self.series_data, filtre)
+        self.page = 0
+        self._sync_items()
+    
+    def _sync_items(self):
+        # Sayfadaki serilerin link butonları (ilk iki satır)
+        for button in self.link_buttons:
+            self.remove_item(button)
+        self.link_buttons = [
+            discord.ui.Button(
+                label=shorten(series_info.isim, 76),
                 style=discord.ButtonStyle.link,
-                url=series_url
+                url=series_link(series_info),
+                row=index // 5,
+            )
+            for index, series_info in enumerate(self.current_page())
+        ]
+        for button in self.link_buttons:
+            self.add_item(button)
+        
+        self.previous_page.disabled = self.page == 0
+        self.next_page.disabled = self.page >= len(self.pages) - 1
+    
+    def current_page(self):
+        return self.pages[self.page] if self.pages else []
+    
+    def render(self):
+        """Mesajın mevcut sayfa için içeriği: (content, embeds)"""
+        total = sum(len(page) for page in self.pages)
+        content = f"📊 Toplam **{total}** seri • Sayfa {self.page + 1}/{max(len(self.pages), 1)}"
+        if self.filtre:
+            content += f" • Filtre: `{self.filtre}`"
+        embeds = [render_card(series_info, 'list')[0] for series_info in self.current_page()]
+        return content, embeds
+    
+    async def show(self, interaction):
+        self._sync_items()
+        content, embeds = self.render()
+        await interaction.response.edit_message(content=content, embeds=embeds, view=self)
+    
+    async def interaction_check(self, interaction):
+        if interaction.user.id != self.author_id:
+            await interaction.response.send_message(
+                "❌ Bu liste başkasına ait, kendi listen için `++seriler` yaz.",
+                ephemeral=True,
+            )
+            return False
+        return True
+    
+    async def on_timeout(self):
+        # Süre dolunca sadece gezinme kontrollerini kapat, link butonları kalsın
+        self.previous_page.disabled = True
+        self.next_page.disabled = True
+        self.status_select.disabled = True
+        if self.message:
+            try:
+                await self.message.edit(view=self)
+            except discord.HTTPException:
+                pass
+    
+    @discord.ui.button(label="◀️ Önceki", style=discord.ButtonStyle.secondary, row=2)
+    async def previous_page(self, interaction, button):
+        self.page = max(self.page - 1, 0)
+        await self.show(interaction)
+    
+    @discord.ui.button(label="Sonraki ▶️", style=discord.ButtonStyle.secondary, row=2)
+    async def next_page(self, interaction, button):
+        self.page = min(self.page + 1, len(self.pages) - 1)
+        await self.show(interaction)
+    
+    @discord.ui.select(placeholder="Duruma göre filtrele", row=3)
+    async def status_select(self, interaction, select):
+        value = select.values[0]
+        self.set_filter(None if value == "*" else value)
+        await self.show(interaction)
+
+
+@client.command()
+async def seriler(ctx, *, filtre: str = None):
+    """ZebzeToon'daki serileri sayfalı listeler. Kullanım: ++seriler [durum veya tür]"""
+    try:
+        # Veriyi çek
+        series_data = await fetch_zebzetoon_data()
+        
+        if not series_data:
+            await ctx.send("❌ Hiç seri bulunamadı.")
+            return
+        
+        paginator = SeriesPaginator(ctx.author.id, series_data, filtre)
+        if not paginator.pages:
+            await ctx.send(f"❌ **{filtre}** ile eşleşen seri bulunamadı.")
+            return
+        
+        # Tek mesaj - sayfa değişimleri bu mesajı düzenler
+        content, embeds = paginator.render()
+        paginator.message = await ctx.send(content=content, embeds=embeds, view=paginator)
+        
+    except Exception as e:
+        print(f"[seriler] Hata: {e}")
+        await ctx.send("❌ Seriler yüklenirken hata oluştu.")
+
+
+# ───────────────────────────────────────────────
+# ++seri KOMUTU - Tek seri göster
+# ───────────────────────────────────────────────
+def find_series(query):
+    """
+    Seriyi indeksten bulur: tam eşleşme, yoksa tek aday veya önek eşleşmesi.
+    Dönüş: (Series veya None, öneri listesi)
+    """
+    index = get_search_index()
+    series_info = index.get(query)
+    if series_info:
+        return series_info, []
+    
+    # Normalize edilince aynı olan isimler (ör. "Işık" / "Isik") - kullanıcı seçsin
+    names = index.keys.get(search_key(query), ())
+    if len(names) > 1:
+        return None, [index.series[name] for name in names]
+    
+    results = index.search(query, limit=4)
+    if results and (results[0][0] >= 1.0 or len(results) == 1):
+        return results[0][1], []
+    return None, [result for score, result in results]
+
+
+def not_found_message(query, suggestions):
+    if suggestions:
+        names = ", ".join(f"`{result.isim}`" for result in suggestions)
+        return f"❌ **{query}** adında seri bulunamadı. Bunlardan biri olabilir mi: {names}"
+    return f"❌ **{query}** adında seri bulunamadı."
+
+
+@client.hybrid_command()
+@app_commands.rename(seri_adi="seri")
+@app_commands.describe(seri_adi="Seri adı (yazarken öneriler çıkar)")
+async def seri(ctx, *, seri_adi: str = None):
+    """Belirtilen seriyi gösterir. Kullanım: ++seri Ölüm Paktı"""
+    if not seri_adi:
+        await ctx.send("❌ Kullanım: `++seri <seri adı>`\nÖrnek: `++seri Ölüm Paktı`")
+        return
+    
+    # Slash komutunda ilk yüklemede upstream beklenebilir - 3 saniyelik yanıt sınırını aş
+    await ctx.defer()
+    
+    try:
+        # Veriyi çek
+        await fetch_zebzetoon_data()
+        
+        # Seriyi bul - tam eşleşme yoksa en yakın sonuç
+        series_info, suggestions = find_series(seri_adi)
+        if not series_info:
+            await ctx.send(not_found_message(seri_adi, suggestions))
+            return
+        
+        embed, view = render_card(series_info, 'detail')
+        await ctx.send(embed=embed, view=view)
+        
+    except Exception as e:
+        print(f"[seri] Hata: {e}")
+        await ctx.send("❌ Seri yüklenirken hata oluştu.")
+
+
+@seri.autocomplete('seri_adi')
+async def seri_autocomplete(interaction, current):
+    """Slash komutu için seri önerileri - ağa çıkmadan indeksten"""
+    if not series_cache.data:
+        return []
+    
+    return [
+        app_commands.Choice(name=series_info.isim[:100], value=series_info.isim[:100])
+        for score, series_info in get_search_index().search(current, limit=25)
+    ]
+
+
+# ───────────────────────────────────────────────
+# KATALOG DEĞİŞİKLİK MOTORU
+# ───────────────────────────────────────────────
+@dataclass(slots=True)
+class CatalogEvent:
+    """İki katalog sürümü arasındaki değişiklik"""
+    series: Series = field(repr=False)
+
+
+@dataclass(slots=True)
+class NewSeries(CatalogEvent):
+    pass
+
+
+@dataclass(slots=True)
+class SeriesRemoved(CatalogEvent):
+    pass
+
+
+@dataclass(slots=True)
+class ChapterBump(CatalogEvent):
+    old_chapter: int | None
+    new_chapter: int
+    
+    @property
+    def chapter_range(self):
+        """Eklenen bölümler: tek bölümse sayı, birden fazlaysa (ilk, son)"""
+        if self.old_chapter is None or self.new_chapter - self.old_chapter <= 1:
+            return self.new_chapter
+        return (self.old_chapter + 1, self.new_chapter)
+
+
+@dataclass(slots=True)
+class StatusChange(CatalogEvent):
+    old_status: str
+    new_status: str
+
+
+@dataclass(slots=True)
+class CoverChange(CatalogEvent):
+    old_cover: str
+    new_cover: str
+
+
+@dataclass(slots=True)
+class LockChange(CatalogEvent):
+    old_locked: bool
+    new_locked: bool
+    old_count: int
+    new_count: int
+    old_date: float | None = None  # Açılış zamanları Tarih'ten hesaplanır
+    new_date: float | None = None
+
+
+def diff_snapshots(old, new):
+    """
+    İki katalog sürümünü ({seri adı: Series}) tek geçişte karşılaştırır ve
+    değişiklikleri tipli event listesi olarak döndürür.
+    """
+    if old is new:
+        return []
+    
+    events = []
+    for key, series_info in new.items():
+        previous = old.get(key)
+        if previous is None:
+            events.append(NewSeries(series_info))
+            continue
+        
+        if series_info.son_bolum is not None and (
+            previous.son_bolum is None or series_info.son_bolum > previous.son_bolum
+        ):
+            events.append(ChapterBump(series_info, previous.son_bolum, series_info.son_bolum))
+        
+        if series_info.durum != previous.durum:
+            events.append(StatusChange(series_info, previous.durum, series_info.durum))
+        
+        if series_info.kapak != previous.kapak:
+            events.append(CoverChange(series_info, previous.kapak, series_info.kapak))
+        
+        # Kilitli seride Tarih değişmesi de açılış zamanlarını kaydırır
+        if (series_info.kilitli != previous.kilitli
+                or series_info.kilitliBolumSayisi != previous.kilitliBolumSayisi
+                or (series_info.kilitli and series_info.tarih != previous.tarih)):
+            events.append(LockChange(
+                series_info,
+                previous.kilitli,
+                series_info.kilitli,
+                previous.kilitliBolumSayisi,
+                series_info.kilitliBolumSayisi,
+                previous.tarih,
+                series_info.tarih,
             ))
+    
+    # Listeden kalkan seriler (sadece sayı farklıysa veya yeni seri eklendiyse olabilir)
+    if len(old) > len(new) - sum(isinstance(event, NewSeries) for event in events):
+        for key in old.keys() - new.keys():
+            events.append(SeriesRemoved(old[key]))
+    
+    return events
+
+
+def reconcile_with_state(series_data):
+    """
+    Önceki katalog sürümü yokken (bot açılışı) kaydedilen bölüm durumuyla karşılaştırır.
+    Bot kapalıyken eklenen bölümler ChapterBump olarak döner.
+    """
+    events = []
+    for series_info in series_data.values():
+        if series_info.isim not in last_chapters:
+            events.append(NewSeries(series_info))
+        elif series_info.son_bolum is not None and series_info.son_bolum > last_chapters[series_info.isim]:
+            events.append(ChapterBump(series_info, last_chapters[series_info.isim], series_info.son_bolum))
+    return events
+
+
+# Referansı tutulmayan task'lar iş bitmeden GC ile toplanabilir - burada tutulur
+background_tasks = set()
+
+
+def run_in_background(coro):
+    """Coroutine'i arka planda çalıştırır, bitene kadar referansını tutar ve hatasını loglar"""
+    task = asyncio.create_task(coro)
+    background_tasks.add(task)
+    task.add_done_callback(_background_task_done)
+    return task
+
+
+def _background_task_done(task):
+    background_tasks.discard(task)
+    if not task.cancelled() and task.exception() is not None:
+        print(f"[{task.get_coro().__qualname__}] Hata: {task.exception()}")
+
+
+class EventBus:
+    """
+    Süreç içi event dağıtıcı. Handler'lar event tipine (veya üst sınıfına) abone olur,
+    sync ya da async olabilir; bir handler'ın hatası diğerlerini etkilemez.
+    """
+    
+    def __init__(self):
+        self.handlers = defaultdict(list)
+    
+    def subscribe(self, event_type, handler=None):
+        """Handler'ı kaydeder - decorator olarak da kullanılabilir"""
+        if handler is None:
+            return partial(self.subscribe, event_type)
+        self.handlers[event_type].append(handler)
+        return handler
+    
+    async def publish(self, events):
+        """Event'leri sırayla dağıtır ve handler'ların dönüş değerlerini toplar"""
+        results = []
+        for event in events:
+            for event_type in type(event).__mro__:
+                for handler in self.handlers.get(event_type, ()):
+                    try:
+                        result = handler(event)
+                        if inspect.isawaitable(result):
+                            result = await result
+                    except Exception as e:
+                        print(f"[EventBus] {handler.__name__} hatası: {e}")
+                        continue
+                    if result is not None:
+                        results.append(result)
+        return results
+
+
+event_bus = EventBus()
+
+
+# ───────────────────────────────────────────────
+# DUYURU TESLİMAT KUYRUĞU
+# ───────────────────────────────────────────────
+class Announcement:
+    """Tek bir bölüm duyurusu - tüm hedeflere ulaşınca teslim edilmiş sayılır"""
+    
+    def __init__(self, series_name, chapter, embed, view, kind='chapter'):
+        self.series_name = series_name
+        self.chapter = chapter
+        self.kind = kind  # 'chapter': yeni bölüm, 'unlock': kilidi açılan bölüm
+        self.embed = embed
+        self.view = view
+        self.created = time.monotonic()
+        self.pending = 0
+        self.failed = False
+        self.done = asyncio.get_running_loop().create_future()
+    
+    @property
+    def key(self):
+        if self.kind == 'chapter':
+            return (self.series_name, self.chapter)
+        return (self.series_name, self.chapter, self.kind)
+
+
+class DeliveryQueue:
+    """
+    Duyuruları Discord rate-limit bucket'larına göre dağıtan teslimat kuyruğu.
+    - Mesaj gönderme bucket'ı kanal başınadır: her kanal/thread için ayrı bir
+      sıra (lane) tutulur, aynı kanala sırayla, farklı kanallara paralel gönderilir
+    - Toplam eşzamanlı gönderim DELIVERY_WORKERS ile sınırlıdır
+    - Geçici hatalar (429, 5xx, bağlantı) üstel geri çekilme ile yeniden denenir
+    - Duyuru ancak tüm hedeflere ulaştığında on_delivered ile işaretlenir
+    """
+    
+    def __init__(self, workers, max_retries, on_delivered):
+        self.workers = asyncio.Semaphore(workers)
+        self.max_retries = max_retries
+        self.on_delivered = on_delivered
+        
+        self.lanes = {}       # {route: asyncio.Queue}
+        self.tasks = set()    # Çalışan lane task'ları (GC'ye karşı referans)
+        self.in_flight = {}   # {Announcement.key: Announcement}
+        self.sent = set()     # Başarısız duyuruların zaten ulaştığı hedefler
+        self.undelivered = {} # {seri: bölüm} - sonraki turda yeniden denenecek
+        
+        # İstatistikler
+        self.depth = 0
+        self.delivered = 0
+        self.failed = 0
+        self.retries = 0
+        self.latencies = deque(maxlen=100)
+    
+    def submit(self, announcement, targets):
+        """
+        Duyuruyu kuyruğa ekler. targets: [(hedef_adı, route, send)] -
+        route rate-limit bucket'ını belirleyen kanal ID'si, send(announcement) bir coroutine.
+        Aynı duyuru zaten kuyruktaysa mevcut olanı döndürür.
+        """
+        if announcement.key in self.in_flight:
+            return self.in_flight[announcement.key]
+        
+        self.in_flight[announcement.key] = announcement
+        for name, route, send in targets:
+            # Önceki denemede bu hedefe ulaştıysa tekrar gönderme
+            if self.delivered_to(announcement, name):
+                continue
+            
+            announcement.pending += 1
+            self.depth += 1
+            self._lane(route).put_nowait((announcement, name, send))
+        
+        if announcement.pending == 0:
+            self._finish(announcement)
+        
+        return announcement
+    
+    def delivered_to(self, announcement, name):
+        """Duyuru önceki bir denemede bu hedefe ulaştı mı"""
+        return announcement.key + (name,) in self.sent
+    
+    def stats(self):
+        latencies = sorted(self.latencies)
+        return {
+            'depth': self.depth,
+            'lanes': len(self.lanes),
+            'in_flight': len(self.in_flight),
+            'delivered': self.delivered,
+            'failed': self.failed,
+            'retries': self.retries,
+            'latency_avg': sum(latencies) / len(latencies) if latencies else 0.0,
+            'latency_max': latencies[-1] if latencies else 0.0,
+        }
+    
+    def _lane(self, route):
+        queue = self.lanes.get(route)
+        if queue is None:
+            queue = self.lanes[route] = asyncio.Queue()
+            task = asyncio.create_task(self._run_lane(route, queue))
+            self.tasks.add(task)
+            task.add_done_callback(self.tasks.discard)
+        return queue
+    
+    async def _run_lane(self, route, queue):
+        while not queue.empty():
+            announcement, name, send = queue.get_nowait()
+            try:
+                result = await self._deliver(announcement, name, send)
+            except Exception as e:
+                print(f"[DeliveryQueue] {announcement.series_name} -> {name} hatası: {e}")
+                result = False
+            self.depth -= 1
+            self._settle(announcement, name, result)
+        
+        # Boşalan lane'i kapat (aynı tick içinde yeni iş eklenemez)
+        del self.lanes[route]
+    
+    async def _deliver(self, announcement, name, send):
+        """
+        Gönderimi dener. True: teslim edildi, None: kalıcı hata (yeniden denenmez),
+        False: yeniden denemeler tükendi.
+        """
+        # Hedef adları sunucu ID'si taşır ("kanal:<guild_id>"), metrikte sadece türü kullan
+        target = name.partition(':')[0]
+        for attempt in range(self.max_retries + 1):
+            try:
+                async with self.workers:
+                    with metrics.timer('zebzetoon_discord_send_seconds', target=target):
+                        await send(announcement)
+                metrics.inc('zebzetoon_discord_send_total', target=target, result='ok')
+                return True
+            
+            except (discord.Forbidden, discord.NotFound) as e:
+                print(f"[DeliveryQueue] {announcement.series_name} -> {name} gönderilemedi: {e}")
+                return None
+            
+            except discord.HTTPException as e:
+                if e.status != 429 and e.status < 500:
+                    print(f"[DeliveryQueue] {announcement.series_name} -> {name} reddedildi: {e}")
+                    return None
+                error = e
+            
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                error = e
+            
+            metrics.inc('zebzetoon_discord_send_total', target=target, result='retry')
+            if attempt < self.max_retries:
+                delay = DELIVERY_BACKOFF * (2 ** attempt) + random.uniform(0, 1)
+                if isinstance(error, discord.HTTPException) and error.status == 429:
+                    metrics.inc('zebzetoon_ratelimit_total', source='delivery')
+                    metrics.observe('zebzetoon_ratelimit_wait_seconds', delay, source='delivery')
+                print(f"[DeliveryQueue] {announcement.series_name} -> {name} tekrar denenecek ({delay:.1f}s): {error}")
+                self.retries += 1
+                await asyncio.sleep(delay)
+        
+        return False
+    
+    def _settle(self, announcement, name, result):
+        if result:
+            self.sent.add(announcement.key + (name,))
+        elif result is False:
+            announcement.failed = True
+        
+        announcement.pending -= 1
+        if announcement.pending == 0:
+            self._finish(announcement)
+    
+    def _finish(self, announcement):
+        del self.in_flight[announcement.key]
+        
+        if announcement.failed:
+            # Ulaşılan hedefler hatırlanır, sonraki turda sadece kalanlar denenir
+            # (kilit açılışları yeniden üretilmez)
+            self.failed += 1
+            if announcement.kind == 'chapter':
+                self.undelivered[announcement.series_name] = announcement.chapter
+            print(f"[DeliveryQueue] Duyuru teslim edilemedi: {announcement.series_name} - Bölüm {announcement.chapter}")
+        else:
+            latency = time.monotonic() - announcement.created
+            self.latencies.append(latency)
+            self.delivered += 1
+            self.sent = {entry for entry in self.sent if entry[:-1] != announcement.key}
+            # Kilit açılışı başka bir bölümün bekleyen yeniden denemesini silmemeli
+            if (announcement.kind == 'chapter'
+                    and self.undelivered.get(announcement.series_name, 0) <= announcement.chapter):
+                self.undelivered.pop(announcement.series_name, None)
+            self.on_delivered(announcement)
+            print(f"[DeliveryQueue] Duyuru teslim edildi: {announcement.series_name} - Bölüm {announcement.chapter} ({latency:.1f}s, kuyruk: {self.depth})")
+        
+        announcement.done.set_result(not announcement.failed)
+
+
+def mark_chapter_announced(announcement):
+    """Teslim edilen duyurunun bölümünü kaydeder"""
+    if announcement.kind != 'chapter':
+        return
+    series_name = announcement.series_name
+    if announcement.chapter > last_chapters.get(series_name, 0):
+        last_chapters[series_name] = announcement.chapter
+        state_store.save_chapters({series_name: announcement.chapter})
+
+
+delivery_queue = DeliveryQueue(DELIVERY_WORKERS, DELIVERY_MAX_RETRIES, mark_chapter_announced)
+
+
+async def send_to_channel(channel, announcement):
+    await channel.send(embed=announcement.embed, view=announcement.view)
+
+
+async def deliver_to_series_thread(guild, parent_id, series_info, announcement):
+    """Duyuruyu serinin parent_id altındaki thread'ine gönderir, gerekirse thread'i oluşturur"""
+    cover_url = cover_image(series_info)
+    series_thread = await get_or_create_series_thread(
+        guild,
+        parent_id,
+        series_info.isim,
+        cover_url,
+        series_info.durum,
+        series_info.tur
+    )
+    if not series_thread:
+        return
+    
+    parent_channel = guild.get_channel(parent_id)
+    try:
+        await send_to_thread(parent_channel, series_thread, announcement)
+    except discord.NotFound:
+        # İndeksteki thread artık yok - indeksten çıkar ve yeniden oluştur
+        forget_series_thread(series_thread.id)
+        series_thread = await get_or_create_series_thread(
+            guild,
+            parent_id,
+            series_info.isim,
+            cover_url,
+            series_info.durum,
+            series_info.tur
+        )
+        if series_thread:
+            await send_to_thread(parent_channel, series_thread, announcement)
+
+
+async def commit_digest_when_delivered(announcements, digest):
+    """Turdaki tüm duyurular teslim edilince CSV sürümünü işlenmiş olarak kaydeder"""
+    results = await asyncio.gather(*(announcement.done for announcement in announcements))
+    if all(results):
+        state_store.save_chapters({}, digest)
+
+
+# ───────────────────────────────────────────────
+# WEBHOOK İLE DUYURU (ANNOUNCE_MODE=webhook)
+# ───────────────────────────────────────────────
+class WebhookCache:
+    """
+    Kanal başına bot'un oluşturduğu webhook. URL'ler SQLite'ta saklanır,
+    gönderimler paylaşılan aiohttp oturumu üzerinden yapılır.
+    """
+    
+    def __init__(self):
+        self.urls = {}  # {kanal_id: webhook_url}
+        self.locks = defaultdict(asyncio.Lock)
+        self.unavailable = set()  # Webhook izni olmayan kanallar (bot ile gönderilir)
+    
+    async def get(self, channel):
+        """Kanalın webhook'unu döndürür, yoksa oluşturur. İzin yoksa None"""
+        if channel.id in self.unavailable:
+            return None
+        
+        url = self.urls.get(channel.id)
+        if url is None:
+            async with self.locks[channel.id]:
+                url = self.urls.get(channel.id)
+                if url is None:
+                    try:
+                        url = await self._find_or_create(channel)
+                    except discord.Forbidden:
+                        print(f"[WebhookCache] {channel.id} için webhook izni yok, bot ile gönderilecek")
+                        self.unavailable.add(channel.id)
+                        return None
+                    self.urls[channel.id] = url
+                    state_store.save_webhook(channel.id, url)
+        
+        return discord.Webhook.from_url(url, session=get_http_session(), client=client)
+    
+    async def _find_or_create(self, channel):
+        # Önceki çalışmalardan kalan webhook'u kullan
+        for webhook in await channel.webhooks():
+            if webhook.user and webhook.user.id == client.user.id and webhook.token:
+                return webhook.url
+        
+        webhook = await channel.create_webhook(name=WEBHOOK_NAME)
+        return webhook.url
+    
+    def forget(self, channel_id):
+        """Silinmiş webhook'u bırakır - bir sonraki gönderimde yeniden oluşturulur"""
+        self.urls.pop(channel_id, None)
+        state_store.delete_webhook(channel_id)
+
+
+webhook_cache = WebhookCache()
+
+
+async def post_via_webhook(channel, thread=None, **kwargs):
+    """
+    Mesajı kanalın webhook'u ile gönderir (thread verilirse thread'e).
+    Webhook kullanılamıyorsa bot ile gönderir, silinmiş webhook bir kez yenilenir.
+    """
+    for attempt in range(2):
+        webhook = await webhook_cache.get(channel)
+        if webhook is None:
+            break
+        
+        try:
+            await webhook.send(
+                thread=discord.Object(thread.id) if thread is not None else discord.utils.MISSING,
+                **kwargs,
+            )
+            return
+        except discord.NotFound as e:
+            # 10015: Unknown Webhook - diğer NotFound'lar (ör. silinmiş thread) çağırana kalır
+            if e.code != 10015:
+                raise
+            webhook_cache.forget(channel.id)
+    
+    await (thread or channel).send(**kwargs)
+
+
+class WebhookBatch:
+    """
+    Aynı kanala gidecek duyuruları tek mesajda (en fazla 10 embed) toplar.
+    Gruptaki ilk teslimat mesajı gönderir, diğerleri aynı sonucu paylaşır.
+    """
+    
+    def __init__(self, channel):
+        self.channel = channel
+        self.announcements = []
+        self.size = 0       # Toplam embed karakteri (mesaj başına sınır 6000)
+        self.closed = False # Gönderim başladıktan sonra yeni duyuru eklenmez
+        self.sent = False
+        self.lock = asyncio.Lock()
+    
+    def fits(self, announcement):
+        return (
+            not self.closed
+            and len(self.announcements) < WEBHOOK_BATCH_SIZE
+            and self.size + len(announcement.embed) <= 6000
+        )
+    
+    def add(self, announcement):
+        self.announcements.append(announcement)
+        self.size += len(announcement.embed)
+    
+    def view(self):
+        """Her seri için bir okuma butonu"""
+        view = discord.ui.View(timeout=None)
+        for announcement in self.announcements:
+            # Buton etiketi en fazla 80 karakter: bölüm görünsün diye seri adı kısaltılır
+            chapter = f" · {announcement.chapter}"
+            label = shorten(announcement.series_name, 77 - len(chapter)) + chapter
+            for item in announcement.view.children:
+                view.add_item(discord.ui.Button(
+                    label=label,
+                    url=item.url,
+                    emoji="📖",
+                ))
+        return view
+    
+    async def send(self, announcement):
+        async with self.lock:
+            self.closed = True
+            if self.sent:
+                return
             
-            await ctx.send(embed=embed, view=view)
+            await post_via_webhook(
+                self.channel,
+                embeds=[item.embed for item in self.announcements],
+                view=self.view(),
+            )
+            self.sent = True
+
+
+class WebhookBatcher:
+    """Kanal başına açık grubu tutar - dolan veya gönderilmeye başlanan grup yenisiyle değişir"""
+    
+    def __init__(self):
+        self.open = {}  # {kanal_id: WebhookBatch}
+    
+    def add(self, channel, announcement):
+        batch = self.open.get(channel.id)
+        if batch is None or not batch.fits(announcement):
+            batch = self.open[channel.id] = WebhookBatch(channel)
+        batch.add(announcement)
+        return batch
+
+
+webhook_batcher = WebhookBatcher()
+
+
+async def send_to_thread(parent_channel, series_thread, announcement):
+    """Thread'e duyuru gönderir - webhook modunda üst kanalın webhook'u ile"""
+    if ANNOUNCE_MODE == 'webhook' and parent_channel is not None:
+        await post_via_webhook(parent_channel, series_thread, embed=announcement.embed, view=announcement.view)
+    else:
+        await series_thread.send(embed=announcement.embed, view=announcement.view)
+
+
+# ───────────────────────────────────────────────
+# OTOMATİK YENİ BÖLÜM KONTROLÜ
+# ───────────────────────────────────────────────
+# Son karşılaştırılan katalog sürümü (diff için)
+last_snapshot = None
+last_snapshot_digest = None
+
+# Duyurulmadan kaydedilen bölümler - tur sonunda tek seferde yazılır
+pending_chapter_seeds = {}
+
+
+def seed_chapter(series_info):
+    """Seriyi duyurmadan mevcut bölümüyle kaydeder"""
+    if series_info.son_bolum is None:
+        return
+    last_chapters[series_info.isim] = series_info.son_bolum
+    pending_chapter_seeds[series_info.isim] = series_info.son_bolum
+
+
+@event_bus.subscribe(NewSeries)
+def record_new_series(event):
+    # Yeni eklenen seri - sadece kaydet, duyuru yapma
+    seed_chapter(event.series)
+
+
+@event_bus.subscribe(ChapterBump)
+def announce_chapter_bump(event):
+    """Yeni bölümü ana kanala ve seri thread'ine duyurmak üzere kuyruğa ekler"""
+    series_info = event.series
+    series_name = series_info.isim
+    current_chapter = event.new_chapter
+    
+    # Daha önce bölümü bilinmeyen seri - sadece kaydet
+    if series_name not in last_chapters:
+        seed_chapter(series_info)
+        return None
+    
+    # Zaten duyurulmuş veya kuyrukta bekleyen bölüm
+    if current_chapter <= last_chapters[series_name] or (series_name, current_chapter) in delivery_queue.in_flight:
+        return None
+    
+    # Tek render tüm sunucular için kullanılır
+    embed, view = render_card(series_info, 'announce', event.chapter_range)
+    announcement = Announcement(series_name, current_chapter, embed, view)
+    
+    targets = announcement_targets(series_info, announcement)
+    if not targets:
+        return None
+    
+    print(f"[check_new_chapters] Yeni bölüm bulundu: {series_name} - Bölüm {current_chapter} ({len(targets)} hedef)")
+    
+    # Duyuruyu kuyruğa ekle - her sunucunun kanalına ve seri thread'ine
+    # Bölüm, tüm hedeflere teslim edilince kaydedilir
+    return delivery_queue.submit(announcement, targets)
+
+
+def announcement_targets(series_info, announcement):
+    """Seriyi duyuracak tüm sunucuların teslimat hedefleri: [(hedef_adı, route, send)]"""
+    key = search_key(series_info.isim)
+    webhook = ANNOUNCE_MODE == 'webhook'
+    targets = []
+    for config in active_guild_configs():
+        if not config.wants(key):
+            continue
+        
+        guild = client.get_guild(config.guild_id)
+        if guild is None:
+            continue
+        
+        if config.channel_id:
+            channel = guild.get_channel(config.channel_id)
+            name = f"kanal:{guild.id}"
+            if channel is None:
+                print(f"[check_new_chapters] Kanal bulunamadı: {config.channel_id}")
+            elif not webhook:
+                targets.append((name, channel.id, partial(send_to_channel, channel)))
+            elif not delivery_queue.delivered_to(announcement, name):
+                # Aynı turdaki bölümler kanal başına tek mesajda birleşir (webhook bucket'ı)
+                batch = webhook_batcher.add(channel, announcement)
+                targets.append((name, ('webhook', channel.id), batch.send))
         
-        await ctx.send(f"📊 Toplam **{len(series_data)}** seri listelendi!")
+        if config.thread_channel_id:
+            # Thread henüz yoksa oluşturma isteği üst kanalın bucket'ına düşer,
+            # webhook modunda tüm thread mesajları üst kanalın webhook'unu paylaşır
+            parent_id = config.thread_channel_id
+            if webhook:
+                route = ('webhook', parent_id)
+            else:
+                route = series_threads.get((parent_id, thread_key(series_info.isim)), parent_id)
+            send = partial(deliver_to_series_thread, guild, parent_id, series_info)
+            targets.append((f"thread:{guild.id}", route, send))
+    
+    return targets
+
+
+@event_bus.subscribe(NewSeries)
+@event_bus.subscribe(CoverChange)
+def check_cover(event):
+    """Yeni serinin kapağını, değişen kapakta ise yeni URL'yi yeniden doğrular"""
+    force = isinstance(event, CoverChange)
+    cover_checker.schedule(get_cover_image_url(event.series.kapak), event.series.isim, force=force)
+
+
+@event_bus.subscribe(SeriesRemoved)
+@event_bus.subscribe(StatusChange)
+@event_bus.subscribe(CoverChange)
+@event_bus.subscribe(LockChange)
+def log_catalog_event(event):
+    print(f"[check_new_chapters] {event.series.isim}: {event}")
+
+
+def retry_undelivered(series_data):
+    """Önceki turlarda teslim edilemeyen duyurular için event'leri yeniden üretir"""
+    events = []
+    for series_name, chapter in list(delivery_queue.undelivered.items()):
+        del delivery_queue.undelivered[series_name]
+        series_info = series_data.get(series_name)
+        if series_info and chapter > last_chapters.get(series_name, 0):
+            events.append(ChapterBump(series_info, last_chapters.get(series_name), chapter))
+    return events
+
+
+async def check_new_chapters():
+    """
+    CSV'yi kontrol eder, önceki sürümle farkını event olarak yayınlar.
+    CSV değişmediyse iş yapılmaz.
+    Dönüş: değişiklik varsa True, yoksa False, upstream'e ulaşılamadıysa None
+    """
+    global last_snapshot, last_snapshot_digest
+    
+    digest = None
+    changed = False
+    
+    try:
+        # Veriyi çek - arka plan görevi olduğu için bayat veri yerine güncelini bekle
+        series_data = await fetch_zebzetoon_data(force=True)
+        
+        if series_cache.last_error is not None or not series_data:
+            return None
+        
+        current_digest = series_cache.digest
+        if current_digest == last_snapshot_digest:
+            events = []
+        elif last_snapshot is None:
+            # Açılıştan sonraki ilk tur: kayıtlı durumla karşılaştır
+            # (CSV son işlenen sürümle aynıysa kaçırılan bir şey yok)
+            if current_digest == state_store.get_meta('csv_digest'):
+                events = []
+            else:
+                events = reconcile_with_state(series_data)
+        else:
+            with metrics.timer('zebzetoon_diff_seconds'):
+                events = diff_snapshots(last_snapshot, series_data)
+        
+        for event in events:
+            metrics.inc('zebzetoon_catalog_events_total', type=type(event).__name__)
+        
+        # Açılış planı eski anlık görüntüden kurulmuş olabilir ve reconcile kilit/tarih
+        # değişikliklerini üretmez - ilk güncel katalogla tamamı yeniden planlanır
+        if last_snapshot is None and unlock_scheduler.running:
+            unlock_scheduler.replan_all(series_data)
+        
+        last_snapshot, last_snapshot_digest = series_data, current_digest
+        
+        changed = bool(events)
+        
+        # Teslim edilemeyen duyuruları yeniden dene
+        events += retry_undelivered(series_data)
+        
+        results = await event_bus.publish(events)
+        announcements = [result for result in results if isinstance(result, Announcement)]
+        
+        # Tur hatasız tamamlandı - duyurular teslim edilince bu CSV sürümü işlenmiş sayılır
+        if announcements:
+            print(f"[check_new_chapters] {len(announcements)} duyuru kuyruğa eklendi (kuyruk: {delivery_queue.depth})")
+            run_in_background(commit_digest_when_delivered(announcements, current_digest))
+        elif not delivery_queue.in_flight and not delivery_queue.undelivered:
+            digest = current_digest
         
     except Exception as e:
-        print(f"[seriler] Hata: {e}")
-        await ctx.send("❌ Seriler yüklenirken hata oluştu.")
+        print(f"[check_new_chapters] Hata: {e}")
+    
+    finally:
+        # Hata olsa bile yeni serileri kaydet
+        state_store.save_chapters(pending_chapter_seeds, digest)
+        pending_chapter_seeds.clear()
+    
+    return changed
+
+
+class PollScheduler:
+    """
+    Uyarlanabilir, jitter'lı kontrol zamanlayıcısı.
+    - Değişiklik bulununca aralığı en aza indirir, boş geçen her turda 1.5 katına çıkarır
+    - Geçmişte sık değişiklik görülen saatlerde aralık POLL_ACTIVE_INTERVAL'ı geçmez
+    - Upstream hatasında üstel olarak geri çekilir
+    - Eşzamanlı turları önlemek için aralığa ±%10 jitter eklenir
+    """
+    
+    def __init__(self, callback, interval, min_interval, max_interval, active_interval, jitter):
+        self.callback = callback
+        self.base_interval = interval
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.active_interval = active_interval
+        self.jitter = jitter
+        
+        self.interval = interval
+        self.next_run = None
+        self.failures = 0
+        # Saat bazında görülen değişiklik sayısı (0-23)
+        self.activity = [0.0] * 24
+        self._task = None
+    
+    @property
+    def running(self):
+        return self._task is not None and not self._task.done()
+    
+    def start(self):
+        """Zamanlayıcıyı başlatır (zaten çalışıyorsa bir şey yapmaz)"""
+        if not self.running:
+            self._task = asyncio.create_task(self._run())
+    
+    def stop(self):
+        if self.running:
+            self._task.cancel()
+    
+    def is_active_hour(self, hour):
+        """Bu saatte ortalamanın belirgin üstünde değişiklik görüldü mü"""
+        average = sum(self.activity) / 24
+        return self.activity[hour] >= max(2.0, average * 2)
+    
+    def record(self, result):
+        """Tur sonucuna göre bir sonraki aralığı hesaplar"""
+        hour = datetime.now().hour
+        
+        if result is None:
+            # Upstream hatası - üstel geri çekilme
+            self.failures += 1
+            self.interval = min(self.base_interval * (2 ** self.failures), self.max_interval)
+            return
+        
+        self.failures = 0
+        if result:
+            self.interval = self.min_interval
+            self.activity[hour] += 1
+            # Eski alışkanlıklar zamanla sönümlensin
+            if sum(self.activity) > 500:
+                self.activity = [count / 2 for count in self.activity]
+            state_store.set_meta('poll_activity', json.dumps(self.activity))
+        else:
+            self.interval = min(self.interval * 1.5, self.max_interval)
+        
+        if self.is_active_hour(hour):
+            self.interval = min(self.interval, self.active_interval)
+    
+    def status(self):
+        return {
+            'interval': self.interval,
+            'next_run': self.next_run.isoformat() if self.next_run else None,
+            'failures': self.failures,
+            'active_hour': self.is_active_hour(datetime.now().hour),
+        }
+    
+    async def _run(self):
+        while True:
+            try:
+                result = await self.callback()
+            except Exception as e:
+                print(f"[PollScheduler] Hata: {e}")
+                result = None
+            
+            previous = self.interval
+            self.record(result)
+            delay = self.interval * random.uniform(1 - self.jitter, 1 + self.jitter)
+            self.next_run = datetime.now() + timedelta(seconds=delay)
+            # Boş turlardaki kademeli gevşemeyi loglamaya gerek yok
+            if result is not False and self.interval != previous:
+                print(f"[PollScheduler] Kontrol aralığı {previous:.0f}s -> {self.interval:.0f}s")
+            
+            await asyncio.sleep(delay)
+
+
+poll_scheduler = PollScheduler(
+    check_new_chapters,
+    POLL_INTERVAL,
+    POLL_MIN_INTERVAL,
+    POLL_MAX_INTERVAL,
+    POLL_ACTIVE_INTERVAL,
+    POLL_JITTER,
+)
+
+
+async def start_chapter_polling():
+    """
+    Otomatik bölüm kontrolünü hazırlar ve zamanlayıcıyı başlatır (bir kez).
+    Gateway modunda kontrol yerine poller'ın olay kuyruğu okunur.
+    """
+    if poll_scheduler.running or event_consumer.running:
+        return
+    
+    # Seri thread indeksini tek seferlik tam tarama ile kur
+    await build_thread_index()
+    
+    # Kayıtlı durum varsa dokunma: ilk tur aradaki farkı bulup kaçırılanları duyurur
+    if last_chapters:
+        print(f"[check_new_chapters] {len(last_chapters)} serinin bölüm durumu yüklendi")
+    else:
+        # İlk kurulum - mevcut bölümleri duyurmadan kaydet
+        series_data = await fetch_zebzetoon_data()
+        for series_key, series_info in series_data.items():
+            series_name = series_info.isim
+            current_chapter = series_info.son_bolum
+            if current_chapter:
+                last_chapters[series_name] = current_chapter
+        state_store.save_chapters(last_chapters, series_cache.digest)
+    
+    # Daha önce kontrol edilmemiş kapakları arka planda doğrula
+    series_data = await fetch_zebzetoon_data()
+    cover_checker.sweep(series_data)
+    
+    # Kilitli bölümlerin açılışları tek seferlik planlanır, sonra sadece değişen seriler
+    if UNLOCK_INTERVAL > 0:
+        unlock_scheduler.start(series_data)
+    
+    if BOT_MODE == 'gateway':
+        event_consumer.start()
+        print(f"[check_new_chapters] Olay kuyruğu okunuyor: {event_queue.path}")
+        return
+    
+    # Geçmiş yayın saatleri
+    activity = state_store.get_meta('poll_activity')
+    if activity:
+        poll_scheduler.activity = json.loads(activity)
+    
+    poll_scheduler.start()
+    print("[check_new_chapters] Otomatik bölüm kontrolü başlatıldı")
 
 
 # ───────────────────────────────────────────────
-# ++seri KOMUTU - Tek seri göster
+# KİLİTLİ BÖLÜM AÇILIŞ ZAMANLAYICISI
 # ───────────────────────────────────────────────
-@client.command()
-async def seri(ctx, *, seri_adi: str = None):
-    """Belirtilen seriyi gösterir. Kullanım: ++seri Ölüm Paktı"""
-    if not seri_adi:
-        await ctx.send("❌ Kullanım: `++seri <seri adı>`\nÖrnek: `++seri Ölüm Paktı`")
-        return
+def unlock_times(series_info, interval):
+    """
+    Kilitli bölümlerin açılma zamanları: [(zaman, bölüm)].
+    Serinin son kilitliBolumSayisi bölümü kilitlidir; Tarih'ten itibaren her
+    interval saniyede en eski kilitli bölüm açılır.
+    """
+    count = series_info.kilitliBolumSayisi
+    if not series_info.kilitli or count <= 0 or series_info.tarih is None or series_info.son_bolum is None:
+        return []
     
-    try:
-        # Veriyi çek
-        series_data = fetch_zebzetoon_data()
+    first = max(series_info.son_bolum - count + 1, series_info.ilk_bolum or 1)
+    return [
+        (series_info.tarih + interval * (index + 1), chapter)
+        for index, chapter in enumerate(range(first, series_info.son_bolum + 1))
+    ]
+
+
+class UnlockScheduler:
+    """
+    Kilitli bölümlerin açılma zamanlarını min-heap'te tutar ve sıradaki zamana kadar uyur.
+    - Katalog taranmaz: değişen seri (NewSeries/ChapterBump/LockChange) yeniden planlanır,
+      eski kayıtları heap'ten silinmez, nesil numarası artar ve çıkarken atlanır
+    - Bekleme sırasında event loop'ta iş yapılmaz; daha erken bir zaman eklenince uyandırılır
+    - Duyurulan son açılan bölüm seri başına SQLite'ta saklanır, yeniden planlamada tekrarlanmaz
+    - Bot kapalıyken zamanı geçen açılışlar hemen, en yeni bölümle tek duyuruda açılır;
+      ilk kez görülen serinin geçmiş açılışları duyurulmadan kaydedilir
+    """
+    
+    def __init__(self, interval):
+        self.interval = interval
+        self.heap = []         # [(zaman, seri adı, nesil, bölüm)]
+        self.generations = {}  # {seri adı: nesil}
+        self.planned = {}      # {seri adı: [(zaman, bölüm)]}
+        self.unlocked = {}     # {seri adı: son duyurulan açılan bölüm}
+        self.live = 0          # Heap'teki geçerli kayıt sayısı
+        self.fired = 0
+        self._wakeup = asyncio.Event()
+        self._task = None
+    
+    @property
+    def running(self):
+        return self._task is not None and not self._task.done()
+    
+    @property
+    def next_unlock(self):
+        """Sıradaki açılış (zaman, seri adı, bölüm) - yoksa None"""
+        upcoming = [(times[0][0], key, times[0][1]) for key, times in self.planned.items()]
+        return min(upcoming, default=None)
+    
+    def start(self, series_data):
+        """Tüm katalogu bir kez planlar ve zamanlayıcıyı başlatır"""
+        if self.running:
+            return
         
-        # Seriyi bul
-        series_info = series_data.get(seri_adi.lower())
+        self.replan_all(series_data)
+        self._task = asyncio.create_task(self._run())
+        print(f"[UnlockScheduler] {self.live} kilitli bölüm planlandı")
+    
+    def replan_all(self, series_data):
+        """Heap'i boşaltıp tüm katalogu yeniden planlar - katalogdan kalkan seriler düşer"""
+        self.heap.clear()
+        self.planned.clear()
+        self.live = 0
+        seeds = {}
+        for series_info in series_data.values():
+            self.plan(series_info, seeds)
+        state_store.save_unlocks(seeds)
+        self._wakeup.set()
+    
+    def stop(self):
+        if self.running:
+            self._task.cancel()
+    
+    def plan(self, series_info, seeds=None):
+        """
+        Serinin açılış zamanlarını yeniden hesaplar - eski kayıtları geçersiz olur.
+        seeds verilirse ilk kez görülen serilerin kayıtları toplu yazılmak üzere oraya eklenir.
+        """
+        key = series_info.isim
+        generation = self.generations[key] = self.generations.get(key, 0) + 1
+        self.live -= len(self.planned.pop(key, ()))
         
-        if not series_info:
-            await ctx.send(f"❌ **{seri_adi}** adında seri bulunamadı.")
+        # Duyurulmuş bölümler planlanmaz
+        now = time.time()
+        unlocked = self.unlocked.get(key)
+        times = [(when, chapter) for when, chapter in unlock_times(series_info, self.interval) if unlocked is None or chapter > unlocked]
+        if not times:
             return
         
-        # Kapak resmini al
-        cover_url = get_cover_image_url(series_info['kapak'])
+        overdue = [(when, chapter) for when, chapter in times if when <= now]
+        times = [(when, chapter) for when, chapter in times if when > now]
+        if unlocked is None:
+            # İlk kez görülen kilitli seri: geçmiş açılışlar duyurulmadan kaydedilir (seed_chapter gibi)
+            self.unlocked[key] = overdue[-1][1] if overdue else 0
+            if seeds is None:
+                state_store.save_unlock(key, self.unlocked[key])
+            else:
+                seeds[key] = self.unlocked[key]
+        elif overdue:
+            # Bot kapalıyken açılanlar kaybolmaz: en yenisi hemen, tek duyuruda açılır
+            times.insert(0, overdue[-1])
+        if not times:
+            return
         
-        # Durum rengi
-        embed_color = 0x00BFFF
-        if "Devam" in series_info['durum']:
-            embed_color = 0x00FF7F
-        elif "Tamamlandı" in series_info['durum']:
-            embed_color = 0xFFD700
-        elif "Bırakıldı" in series_info['durum']:
-            embed_color = 0xFF4500
+        self.planned[key] = times
+        self.live += len(times)
+        for when, chapter in times:
+            heapq.heappush(self.heap, (when, key, generation, chapter))
         
-        embed = discord.Embed(
-            title=f"📚 {series_info['isim']}",
-            description=f"**{series_info['durum']}**\n\n🏷️ {series_info['tur']}\n\n{series_info['ozet']}",
-            color=embed_color,
-        )
+        # Yeni kayıt en öne geçtiyse uyuyan zamanlayıcı yeni zamana göre beklesin
+        if self.heap[0][1] == key and self.heap[0][2] == generation:
+            self._wakeup.set()
         
-        # Büyük kapak resmi
-        if cover_url:
-            embed.set_image(url=cover_url)
+        # Geçersiz kayıtlar birikince heap'i geçerli planlardan yeniden kur
+        if len(self.heap) > 2 * self.live + 64:
+            self.heap = [
+                (when, planned_key, self.generations[planned_key], chapter)
+                for planned_key, planned_times in self.planned.items()
+                for when, chapter in planned_times
+            ]
+            heapq.heapify(self.heap)
+    
+    def _pop_due(self, now):
+        """Zamanı gelmiş geçerli kayıtları heap'ten çıkarır: [(seri adı, bölüm)]"""
+        due = []
+        while self.heap and self.heap[0][0] <= now:
+            when, key, generation, chapter = heapq.heappop(self.heap)
+            if generation != self.generations.get(key):
+                continue
+            
+            times = self.planned[key]
+            times.remove((when, chapter))
+            if not times:
+                del self.planned[key]
+            self.live -= 1
+            due.append((key, chapter))
+        return due
+    
+    async def _run(self):
+        while True:
+            self._wakeup.clear()
+            
+            # Geçersiz kayıtları at, sıradaki geçerli kayda kadar uyu (yoksa yeni plana kadar)
+            while self.heap and self.heap[0][2] != self.generations.get(self.heap[0][1]):
+                heapq.heappop(self.heap)
+            timeout = max(0.0, self.heap[0][0] - time.time()) if self.heap else None
+            
+            if timeout != 0:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            
+            # Aynı anda açılan bölümler aynı tick'te kuyruğa girer (webhook modunda birleşir)
+            for key, chapter in self._pop_due(time.time()):
+                try:
+                    self._announce(key, chapter)
+                except Exception as e:
+                    print(f"[UnlockScheduler] {key} - Bölüm {chapter} duyurulamadı: {e}")
+    
+    def _announce(self, key, chapter):
+        series_info = series_cache.data.get(key)
+        if series_info is None or chapter <= self.unlocked.get(series_info.isim, 0):
+            return
         
-        embed.set_footer(text="Zebze Toon • ++seri")
+        self.unlocked[series_info.isim] = chapter
+        state_store.save_unlock(series_info.isim, chapter)
+        self.fired += 1
+        metrics.inc('zebzetoon_unlock_total')
         
-        # Buton
-        view = discord.ui.View()
-        from urllib.parse import quote
-        series_url = f"{ZEBZETOON_BASE_URL}/?seri={quote(series_info['isim'])}"
-        view.add_item(discord.ui.Button(
-            label="📚 Seriye Git",
-            style=discord.ButtonStyle.link,
-            url=series_url
-        ))
+        embed, view = render_card(series_info, 'unlock', chapter)
+        announcement = Announcement(series_info.isim, chapter, embed, view, kind='unlock')
+        targets = announcement_targets(series_info, announcement)
+        print(f"[UnlockScheduler] Bölüm ücretsiz oldu: {series_info.isim} - Bölüm {chapter} ({len(targets)} hedef)")
+        if targets:
+            delivery_queue.submit(announcement, targets)
+
+
+unlock_scheduler = UnlockScheduler(UNLOCK_INTERVAL)
+
+
+@event_bus.subscribe(NewSeries)
+@event_bus.subscribe(ChapterBump)
+@event_bus.subscribe(LockChange)
+def replan_unlocks(event):
+    """Kilit durumu veya bölümleri değişen seri yeniden planlanır"""
+    if unlock_scheduler.running:
+        unlock_scheduler.plan(event.series)
+
+
+# ───────────────────────────────────────────────
+# SÜREÇ AYRIMI - POLLER / GATEWAY
+# ───────────────────────────────────────────────
+CATALOG_EVENT_TYPES = {
+    event_type.__name__: event_type
+    for event_type in (NewSeries, SeriesRemoved, ChapterBump, StatusChange, CoverChange, LockChange)
+}
+
+
+def encode_event(event):
+    """Event'i seri verisiyle birlikte JSON'a uygun sözlüğe çevirir"""
+    payload = {item.name: getattr(event, item.name) for item in fields(event) if item.name != 'series'}
+    payload['type'] = type(event).__name__
+    payload['series'] = {item.name: getattr(event.series, item.name) for item in fields(Series)}
+    return payload
+
+
+def decode_event(payload):
+    payload = dict(payload)
+    event_type = CATALOG_EVENT_TYPES[payload.pop('type')]
+    series_info = Series(**payload.pop('series'))
+    return event_type(series=series_info, **payload)
+
+
+class EventQueue:
+    """
+    Dosya tabanlı, sadece sona eklenen olay kuyruğu (satır başına bir JSON kayıt).
+    Poller yazar, gateway okur; okuyucu ofseti bayt cinsindendir.
+    Tüm kayıtlar onaylanınca gateway dosyayı boşaltır - yazma ve boşaltma dosya kilidiyle sıralanır.
+    Okuyucu tektir: boşaltma sadece kendi ofsetine bakar, claim() ikinci okuyucuyu engeller.
+    """
+    
+    def __init__(self, path):
+        self.path = path
+        self._reader_lock = None
+    
+    def claim(self):
+        """Kuyruğun tek okuyucusu olarak kilitler - başka bir gateway okuyorsa False"""
+        if fcntl is None:
+            return True
+        f = open(self.path + ".lock", 'a')
+        try:
+            fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            f.close()
+            return False
+        self._reader_lock = f  # Süreç boyunca açık kalır
+        return True
+    
+    def size(self):
+        try:
+            return os.path.getsize(self.path)
+        except FileNotFoundError:
+            return 0
+    
+    def append(self, record):
+        """Kaydı ekler ve diske yazılmasını bekler (anlık görüntüden önce kalıcı olmalı)"""
+        line = json.dumps(record, ensure_ascii=False, separators=(',', ':')) + "\n"
+        with open(self.path, 'a', encoding='utf-8') as f:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_EX)
+            f.write(line)
+            f.flush()
+            os.fsync(f.fileno())
+    
+    def read(self, offset):
+        """offset'ten sonraki tam satırları [(satır_sonu_ofseti, kayıt)] olarak döndürür"""
+        records = []
+        try:
+            with open(self.path, 'rb') as f:
+                f.seek(offset)
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        break  # Yazımı süren yarım satır
+                    offset += len(line)
+                    records.append((offset, json.loads(line)))
+        except FileNotFoundError:
+            pass
+        return records
+    
+    def truncate(self, offset, reset_offset):
+        """
+        Dosya tam offset'te bitiyorsa (araya yeni kayıt girmediyse) boşaltır.
+        reset_offset() kesmeden önce çağrılır: arada çökülürse kayıtlar baştan
+        tekrar okunur (duyurulmuş bölümler atlanır), hiçbiri kaybolmaz.
+        Dönüş: dosya boşaltıldıysa True
+        """
+        if fcntl is None or offset == 0:
+            return False
+        try:
+            f = open(self.path, 'r+b')
+        except FileNotFoundError:
+            return False
+        with f:
+            # Poller'ın o sırada süren yazması bitene kadar bekler
+            fcntl.flock(f, fcntl.LOCK_EX)
+            if os.fstat(f.fileno()).st_size != offset:
+                return False
+            reset_offset()
+            f.truncate(0)
+            os.fsync(f.fileno())
+        return True
+
+
+event_queue = EventQueue(EVENT_QUEUE_PATH)
+
+
+async def produce_catalog_events():
+    """
+    Poller turu: CSV'yi çeker, önceki sürümle farkını kuyruğa yazar.
+    Kuyruk kaydı anlık görüntüden önce yazılır - arada çökülürse fark yeniden üretilir,
+    kaybolmaz (gateway tekrar eden bölümleri zaten duyurmaz).
+    Dönüş: check_new_chapters ile aynı
+    """
+    global last_snapshot, last_snapshot_digest
+    
+    series_data = await fetch_zebzetoon_data(force=True)
+    if series_cache.last_error is not None or not series_data:
+        return None
+    
+    digest = series_cache.digest
+    if digest == last_snapshot_digest:
+        return False
+    
+    events = []
+    if last_snapshot is not None:
+        with metrics.timer('zebzetoon_diff_seconds'):
+            events = diff_snapshots(last_snapshot, series_data)
+    for event in events:
+        metrics.inc('zebzetoon_catalog_events_total', type=type(event).__name__)
+    
+    record = {
+        'digest': digest,
+        'time': datetime.now().timestamp(),
+        'events': [encode_event(event) for event in events],
+    }
+    await asyncio.to_thread(event_queue.append, record)
+    await save_catalog_snapshot()
+    
+    last_snapshot, last_snapshot_digest = series_data, digest
+    if events:
+        print(f"[produce_catalog_events] {len(events)} değişiklik kuyruğa yazıldı")
+    return bool(events)
+
+
+class EventConsumer:
+    """
+    Gateway modunda poller'ın kuyruğa yazdığı olayları yayınlar.
+    - Poller'ın anlık görüntüsü değiştikçe katalog diskten yeniden yüklenir
+    - Ofset, o noktaya kadarki tüm duyurular teslim edilince SQLite'ta onaylanır (ack);
+      yeniden başlatmada onaylanmamış kayıtlar tekrar işlenir, duyurulmuş bölümler atlanır
+    - Teslim edilemeyen duyurular POLL_MIN_INTERVAL aralıkla yeniden denenir
+    - Dosyanın sonuna kadar onaylanınca kuyruk boşaltılır ve ofset sıfırlanır
+    """
+    
+    def __init__(self, queue, interval):
+        self.queue = queue
+        self.interval = interval
+        self.offset = 0   # Okunan
+        self.acked = 0    # Teslimi onaylanan
+        self.records = 0
+        self.snapshot_mtime = None
+        self._task = None
+    
+    @property
+    def running(self):
+        return self._task is not None and not self._task.done()
+    
+    def start(self):
+        if not self.running:
+            self.offset = self.acked = int(state_store.get_meta('event_queue_offset') or 0)
+            self._task = asyncio.create_task(self._run())
+    
+    def stop(self):
+        if self.running:
+            self._task.cancel()
+    
+    def ack(self):
+        """Bekleyen duyuru yoksa okunan ofseti kalıcı olarak onaylar"""
+        if self.acked == self.offset or delivery_queue.in_flight or delivery_queue.undelivered:
+            return
+        state_store.set_meta('event_queue_offset', str(self.offset))
+        self.acked = self.offset
+    
+    def compact(self):
+        """Tüm kayıtlar onaylandıysa kuyruk dosyasını boşaltır - sadece okuma döngüsünden çağrılır"""
+        if self.acked != self.offset:
+            return
+        if self.queue.truncate(self.offset, lambda: state_store.set_meta('event_queue_offset', '0')):
+            print(f"[EventConsumer] Kuyruk onaylandı, dosya boşaltıldı ({self.offset} bayt)")
+            self.offset = self.acked = 0
+    
+    def status(self):
+        return {
+            'offset': self.offset,
+            'acked': self.acked,
+            'lag': max(self.queue.size() - self.offset, 0),
+            'records': self.records,
+        }
+    
+    async def reload_catalog(self):
+        try:
+            mtime = os.stat(SNAPSHOT_PATH).st_mtime_ns
+        except (OSError, TypeError):
+            return
+        if mtime == self.snapshot_mtime:
+            return
         
-        await ctx.send(embed=embed, view=view)
+        self.snapshot_mtime = mtime
+        snapshot = await asyncio.to_thread(read_catalog_snapshot, SNAPSHOT_PATH)
+        if snapshot is not None and snapshot['digest'] != series_cache.digest:
+            apply_catalog_snapshot(snapshot)
+    
+    async def publish(self, events):
+        try:
+            results = await event_bus.publish(events)
+        finally:
+            state_store.save_chapters(pending_chapter_seeds)
+            pending_chapter_seeds.clear()
         
-    except Exception as e:
-        print(f"[seri] Hata: {e}")
-        await ctx.send("❌ Seri yüklenirken hata oluştu.")
+        for result in results:
+            if isinstance(result, Announcement):
+                result.done.add_done_callback(lambda future: self.ack())
+    
+    async def _run(self):
+        last_retry = time.monotonic()
+        while True:
+            try:
+                await self.reload_catalog()
+                
+                if self.queue.size() < self.offset:
+                    print("[EventConsumer] Kuyruk dosyası küçülmüş, baştan okunuyor")
+                    self.offset = self.acked = 0
+                
+                for end, record in await asyncio.to_thread(self.queue.read, self.offset):
+                    await self.publish([decode_event(payload) for payload in record['events']])
+                    self.offset = end
+                    self.records += 1
+                
+                if delivery_queue.undelivered and time.monotonic() - last_retry >= POLL_MIN_INTERVAL:
+                    last_retry = time.monotonic()
+                    await self.publish(retry_undelivered(series_cache.data))
+                
+                self.ack()
+                self.compact()
+                
+            except Exception as e:
+                print(f"[EventConsumer] Hata: {e}")
+            
+            await asyncio.sleep(self.interval)
+
+
+event_consumer = EventConsumer(event_queue, EVENT_QUEUE_INTERVAL)
+
+
+async def run_poller():
+    """BOT_MODE=poller: Discord'a bağlanmadan sadece katalog kontrolü yapar"""
+    global state_store, last_snapshot, last_snapshot_digest
+    
+    state_store = StateStore(STATE_DB_PATH)
+    
+    # Anlık görüntü kuyruğa yazıldıktan sonra elle kaydedilir
+    series_cache.on_update = None
+    if load_catalog_snapshot():
+        last_snapshot, last_snapshot_digest = series_cache.data, series_cache.digest
+    
+    metrics_runner = await start_metrics_server()
+    activity = state_store.get_meta('poll_activity')
+    if activity:
+        poll_scheduler.activity = json.loads(activity)
+    poll_scheduler.callback = produce_catalog_events
+    poll_scheduler.start()
+    print(f"[run_poller] Katalog kontrolü başlatıldı, olaylar: {event_queue.path}")
+    
+    try:
+        await asyncio.Event().wait()
+    finally:
+        poll_scheduler.stop()
+        if metrics_runner is not None:
+            await metrics_runner.cleanup()
+        await close_http_session()
+        state_store.close()
+        if catalog_recorder is not None:
+            catalog_recorder.close()
 
 
 # ───────────────────────────────────────────────
-# OTOMATİK YENİ BÖLÜM KONTROLÜ
+# TAKİP - YENİ BÖLÜM DM BİLDİRİMLERİ
 # ───────────────────────────────────────────────
-@tasks.loop(minutes=10)
-async def check_new_chapters():
+def user_subscriptions(user_id):
+    """Kullanıcının takip ettiği seri anahtarları"""
+    return [key for key, user_ids in series_subscribers.items() if user_id in user_ids]
+
+
+def prune_subscriber(user_id):
+    """DM alamayan kullanıcının tüm takiplerini siler"""
+    for key in user_subscriptions(user_id):
+        series_subscribers[key].discard(user_id)
+        if not series_subscribers[key]:
+            del series_subscribers[key]
+    state_store.remove_subscriber(user_id)
+
+
+class DMFanout:
     """
-    Her 10 dakikada bir CSV'yi kontrol eder ve yeni bölüm varsa duyuru yapar
+    Yeni bölüm duyurusunu takipçilere DM olarak dağıtır.
+    - Ana duyurunun teslimini bekler, kanal/thread duyurusunu geciktirmez
+    - Duyurunun embed/view'ı tüm alıcılar için yeniden kullanılır (tek render)
+    - En fazla `workers` eşzamanlı gönderim, toplamda saniyede en fazla `rate` DM
+    - 429/5xx üstel geri çekilmeyle yeniden denenir
+    - DM'i kapalı kullanıcı üst üste `prune_after` kez ulaşılamazsa, silinmiş
+      kullanıcı ise hemen takip listesinden çıkarılır
     """
-    global last_chapters
     
-    try:
-        # Veriyi çek
-        series_data = fetch_zebzetoon_data()
+    def __init__(self, workers, rate, max_retries, prune_after):
+        self.workers = workers
+        self.rate = rate
+        self.max_retries = max_retries
+        self.prune_after = prune_after
         
-        if not series_data:
-            return
+        self.failures = {}              # {kullanıcı_id: üst üste ulaşılamayan DM}
+        self.dispatched = OrderedDict() # Dağıtımı başlatılmış (seri, bölüm) anahtarları
+        self.tasks = set()
+        self._next_slot = 0.0
         
-        # Kanal kontrolü
-        channel = client.get_channel(CHANNEL_ID)
-        if not channel:
-            print(f"[check_new_chapters] Kanal bulunamadı: {CHANNEL_ID}")
+        # İstatistikler
+        self.sent = 0
+        self.blocked = 0
+        self.errors = 0
+        self.pruned = 0
+    
+    def dispatch(self, announcement, user_ids):
+        """Dağıtımı arka planda başlatır - aynı duyuru (ör. yeniden deneme) tekrar DM'lenmez"""
+        if announcement.key in self.dispatched:
             return
+        self.dispatched[announcement.key] = None
+        if len(self.dispatched) > 1024:
+            self.dispatched.popitem(last=False)
         
-        # Guild al
-        guild = channel.guild
+        task = asyncio.create_task(self._run(announcement, list(user_ids)))
+        self.tasks.add(task)
+        task.add_done_callback(self.tasks.discard)
+    
+    async def _pace(self):
+        """Toplam DM hızını sınırlar (DM kanalı açma + mesaj, global rate-limit'i paylaşır)"""
+        now = time.monotonic()
+        slot = max(self._next_slot, now)
+        self._next_slot = slot + 1 / self.rate
+        if slot > now:
+            await asyncio.sleep(slot - now)
+    
+    async def _run(self, announcement, user_ids):
+        # Önce kanal ve thread duyurusu
+        await asyncio.shield(announcement.done)
         
-        # Her seri için kontrol
-        for series_key, series_info in series_data.items():
-            series_name = series_info['isim']
-            current_chapter = parse_chapter_range(series_info['aralik'])
+        started = time.monotonic()
+        recipients = iter(user_ids)
+        results = Counter()
+        failed = {}
+        cleared = []
+        pruned = []
+        
+        async def worker():
+            for user_id in recipients:
+                result = await self._send(user_id, announcement)
+                results[result] += 1
+                if result == 'ok':
+                    if self.failures.pop(user_id, None) is not None:
+                        cleared.append(user_id)
+                elif result == 'gone':
+                    pruned.append(user_id)
+                elif result == 'blocked':
+                    failures = self.failures.get(user_id, 0) + 1
+                    if failures >= self.prune_after:
+                        self.failures.pop(user_id, None)
+                        pruned.append(user_id)
+                    else:
+                        self.failures[user_id] = failures
+                        failed[user_id] = failures
+        
+        try:
+            await asyncio.gather(*(worker() for _ in range(min(self.workers, len(user_ids)))))
+        finally:
+            for user_id in pruned:
+                prune_subscriber(user_id)
+            state_store.save_dm_failures(failed, cleared)
             
-            if current_chapter is None:
-                continue
+            self.sent += results['ok']
+            self.blocked += results['blocked']
+            self.errors += results['error']
+            self.pruned += len(pruned)
+            for result, count in results.items():
+                metrics.inc('zebzetoon_dm_total', count, result=result)
             
-            # İlk çalışma - sadece kaydet, duyuru yapma
-            if series_name not in last_chapters:
-                last_chapters[series_name] = current_chapter
-                continue
+            print(
+                f"[DMFanout] {announcement.series_name} - Bölüm {announcement.chapter}: "
+                f"{results['ok']}/{len(user_ids)} DM gönderildi, {len(pruned)} takipçi silindi "
+                f"({time.monotonic() - started:.1f}s)"
+            )
+    
+    async def _send(self, user_id, announcement):
+        """Tek DM gönderir. Dönüş: 'ok', 'blocked', 'gone' veya 'error'"""
+        for attempt in range(self.max_retries + 1):
+            await self._pace()
+            try:
+                channel = await client.create_dm(discord.Object(user_id))
+                with metrics.timer('zebzetoon_discord_send_seconds', target='dm'):
+                    await channel.send(embed=announcement.embed, view=announcement.view)
+                return 'ok'
+            except discord.Forbidden:
+                # DM'ler kapalı veya ortak sunucu kalmamış
+                return 'blocked'
+            except discord.NotFound:
+                return 'gone'
+            except discord.HTTPException as e:
+                if e.status != 429 and e.status < 500:
+                    return 'error'
+            except (aiohttp.ClientError, asyncio.TimeoutError):
+                pass
             
-            # Yeni bölüm kontrolü
-            if current_chapter > last_chapters[series_name]:
-                print(f"[check_new_chapters] Yeni bölüm bulundu: {series_name} - Bölüm {current_chapter}")
-                
-                # Kapak resmini al
-                cover_url = get_cover_image_url(series_info['kapak'])
-                
-                # Seri thread'ini bul veya oluştur
-                series_thread = await get_or_create_series_thread(
-                    guild, 
-                    series_name, 
-                    cover_url, 
-                    series_info['durum'], 
-                    series_info['tur']
-                )
-                
-                # Embed oluştur
-                embed = discord.Embed(
-                    title=f"� {series_name}",
-                    description=f"**Bölüm {current_chapter}** yayınlandı!\n\n"
-                               f"━━━━━━━━━━━━━━━━━━━━━━",
-                    color=random.choice(EMBED_COLORS),
-                )
-                
-                # Seri ve bölüm bilgisi
-                embed.add_field(
-                    name="📚 Seri",
-                    value=f"`{series_name}`",
-                    inline=True,
-                )
-                
-                embed.add_field(
-                    name="📄 Bölüm",
-                    value=f"`{current_chapter}`",
-                    inline=True,
-                )
-                
-                # Boş alan
-                embed.add_field(
-                    name="\u200b",
-                    value="\u200b",
-                    inline=True,
-                )
-                
-                # Kapak resmi
-                if cover_url:
-                    embed.set_image(url=cover_url)
-                
-                embed.set_footer(text="Zebze Toon")
-                
-                # Buton ekle
-                view = discord.ui.View()
-                from urllib.parse import quote
-                chapter_url = f"{ZEBZETOON_BASE_URL}/?seri={quote(series_name)}&bolum={current_chapter}"
-                view.add_item(discord.ui.Button(
-                    label="📖 Oku",
-                    style=discord.ButtonStyle.link,
-                    url=chapter_url
-                ))
-                
-                # Duyuru gönder - hem ana kanala hem thread'e
-                await channel.send(embed=embed, view=view)
-                
-                if series_thread:
-                    await series_thread.send(embed=embed, view=view)
-                
-                # Son bölümü güncelle
-                last_chapters[series_name] = current_chapter
+            if attempt < self.max_retries:
+                await asyncio.sleep(DELIVERY_BACKOFF * (2 ** attempt) + random.uniform(0, 1))
         
-    except Exception as e:
-        print(f"[check_new_chapters] Hata: {e}")
+        return 'error'
 
 
-@check_new_chapters.before_loop
-async def before_check_new_chapters():
-    """Task başlamadan önce bot'un hazır olmasını bekle"""
-    await client.wait_until_ready()
-    # İlk çalışmada mevcut bölümleri kaydet
-    series_data = fetch_zebzetoon_data()
-    for series_key, series_info in series_data.items():
-        series_name = series_info['isim']
-        current_chapter = parse_chapter_range(series_info['aralik'])
-        if current_chapter:
-            last_chapters[series_name] = current_chapter
-    print("[check_new_chapters] Otomatik bölüm kontrolü başlatıldı")
+dm_fanout = DMFanout(DM_WORKERS, DM_RATE, DELIVERY_MAX_RETRIES, DM_PRUNE_FAILURES)
+
+
+@event_bus.subscribe(ChapterBump)
+def notify_subscribers(event):
+    """
+    Yeni bölümü takipçilere DM olarak iletir.
+    announce_chapter_bump'tan sonra kaydedilir: duyuru kuyruktaysa onun kartı kullanılır ve
+    kanal teslimi beklenir. Seriyi duyuracak sunucu ayarı hiç yoksa (sunucu yok veya hepsi seriyi
+    filtreliyor) kart burada çizilir ve bölüm DM'lerle duyurulmuş sayılır.
+    Zaten duyurulmuş veya yeni kaydedilmiş seride DM gönderilmez.
+    """
+    series_info = event.series
+    user_ids = series_subscribers.get(search_key(series_info.isim))
+    if not user_ids:
+        return None
+    
+    announcement = delivery_queue.in_flight.get((series_info.isim, event.new_chapter))
+    if announcement is None:
+        if event.new_chapter <= last_chapters.get(series_info.isim, event.new_chapter):
+            return None
+        
+        # Hedefler geçici olarak çözülemediyse (sunucu erişilemez) kanal duyurusu sonra
+        # yapılacak - bölüm burada kaydedilirse o duyuru kaybolur
+        if series_wanted(search_key(series_info.isim)):
+            return None
+        
+        embed, view = render_card(series_info, 'announce', event.chapter_range)
+        announcement = Announcement(series_info.isim, event.new_chapter, embed, view)
+        announcement.done.set_result(True)
+        mark_chapter_announced(announcement)
+    
+    dm_fanout.dispatch(announcement, user_ids)
+    return None
+
+
+@client.command()
+async def takip(ctx, *, seri_adi: str = None):
+    """Seriyi takip et, yeni bölüm gelince DM al. Kullanım: ++takip Ölüm Paktı"""
+    await fetch_zebzetoon_data()
+    
+    if not seri_adi:
+        followed = user_subscriptions(ctx.author.id)
+        if not followed:
+            await ctx.send("📭 Takip ettiğin seri yok.\nKullanım: `++takip <seri adı>`")
+            return
+        
+        index = get_search_index()
+        names = sorted(
+            index.title(key) or key
+            for key in followed
+        )
+        await ctx.send(f"🔔 **Takip ettiğin seriler ({len(names)}):**\n" + "\n".join(f"• {name}" for name in names))
+        return
+    
+    series_info, suggestions = find_series(seri_adi)
+    if not series_info:
+        await ctx.send(not_found_message(seri_adi, suggestions))
+        return
+    
+    key = search_key(series_info.isim)
+    if ctx.author.id in series_subscribers.get(key, ()):
+        await ctx.send(f"ℹ️ **{series_info.isim}** zaten takip ediliyor.")
+        return
+    
+    if len(user_subscriptions(ctx.author.id)) >= TAKIP_LIMIT:
+        await ctx.send(f"❌ En fazla {TAKIP_LIMIT} seri takip edebilirsin. `++birak <seri adı>` ile yer aç.")
+        return
+    
+    series_subscribers[key].add(ctx.author.id)
+    state_store.add_subscription(key, ctx.author.id)
+    await ctx.send(f"🔔 **{series_info.isim}** takip ediliyor. Yeni bölüm gelince DM ile haber vereceğim.")
+
+
+@client.command()
+async def birak(ctx, *, seri_adi: str = None):
+    """Seri takibini bırak. Kullanım: ++birak Ölüm Paktı"""
+    if not seri_adi:
+        await ctx.send("❌ Kullanım: `++birak <seri adı>`")
+        return
+    
+    # Katalogdan kaldırılmış seriler de bırakılabilsin: önce takip listesinde ara
+    key = search_key(seri_adi)
+    if ctx.author.id not in series_subscribers.get(key, ()):
+        await fetch_zebzetoon_data()
+        series_info, suggestions = find_series(seri_adi)
+        key = search_key(series_info.isim) if series_info else None
+    
+    if key is None or ctx.author.id not in series_subscribers.get(key, ()):
+        await ctx.send(f"❌ **{seri_adi}** takip listende yok. Liste için: `++takip`")
+        return
+    
+    series_subscribers[key].discard(ctx.author.id)
+    if not series_subscribers[key]:
+        del series_subscribers[key]
+    state_store.remove_subscription(key, ctx.author.id)
+    
+    name = get_search_index().title(key) or seri_adi
+    await ctx.send(f"🔕 **{name}** takibi bırakıldı.")
+
+
+# ───────────────────────────────────────────────
+# ++ayar KOMUTU - Sunucu duyuru ayarları
+# ───────────────────────────────────────────────
+def editable_guild_config(guild_id):
+    """Sunucunun ayarını döndürür - yoksa env varsayılanından (veya boş) yeni bir kopya"""
+    config = get_guild_config(guild_id)
+    if config is None:
+        return GuildConfig(guild_id)
+    return GuildConfig(config.guild_id, config.channel_id, config.thread_channel_id, config.series)
+
+
+def save_guild_config(config):
+    guild_configs[config.guild_id] = config
+    state_store.save_guild_config(config)
+
+
+@client.group(invoke_without_command=True)
+@commands.guild_only()
+@commands.has_permissions(manage_guild=True)
+async def ayar(ctx):
+    """++ayar - Sunucunun duyuru ayarlarını gösterir"""
+    config = get_guild_config(ctx.guild.id) or GuildConfig(ctx.guild.id)
+    
+    if config.series:
+        index = get_search_index()
+        names = sorted(
+            index.title(key) or key
+            for key in config.series
+        )
+        series_text = shorten(", ".join(names), 1000)
+    else:
+        series_text = "Hepsi"
+    
+    embed = discord.Embed(title="⚙️ Duyuru Ayarları", color=0x45B7D1)
+    embed.add_field(name="📢 Duyuru kanalı", value=f"<#{config.channel_id}>" if config.channel_id else "Kapalı", inline=True)
+    embed.add_field(name="🧵 Seri thread kanalı", value=f"<#{config.thread_channel_id}>" if config.thread_channel_id else "Kapalı", inline=True)
+    embed.add_field(name="📚 Duyurulan seriler", value=series_text, inline=False)
+    embed.add_field(
+        name="Kullanım",
+        value=(
+            "`++ayar kanal #kanal` · `++ayar kanal` (kapat)\n"
+            "`++ayar thread #kanal` · `++ayar thread` (kapat)\n"
+            "`++ayar seri ekle <seri>` · `++ayar seri cikar <seri>` · `++ayar seri hepsi`"
+        ),
+        inline=False,
+    )
+    if ctx.guild.id not in guild_configs and config.channel_id:
+        embed.set_footer(text="Varsayılan ayarlar kullanılıyor")
+    await ctx.send(embed=embed)
+
+
+@ayar.command(name="kanal")
+async def ayar_kanal(ctx, kanal: discord.TextChannel = None):
+    """Duyuru kanalını ayarlar, kanal verilmezse duyuruları kapatır"""
+    config = editable_guild_config(ctx.guild.id)
+    config.channel_id = kanal.id if kanal else 0
+    save_guild_config(config)
+    
+    if kanal:
+        await ctx.send(f"✅ Yeni bölüm duyuruları {kanal.mention} kanalına gönderilecek.")
+    else:
+        await ctx.send("🔕 Kanal duyuruları kapatıldı.")
+
+
+@ayar.command(name="thread")
+async def ayar_thread(ctx, kanal: discord.TextChannel = None):
+    """Seri thread'lerinin açılacağı kanalı ayarlar, kanal verilmezse kapatır"""
+    config = editable_guild_config(ctx.guild.id)
+    previous = config.thread_channel_id
+    config.thread_channel_id = kanal.id if kanal else 0
+    save_guild_config(config)
+    
+    # Eski kanalın kayıtlarını bırak (taranmaz), sadece yeni kanalın thread'lerini indeksle
+    if previous and previous != config.thread_channel_id:
+        for key in [key for key in series_threads if key[0] == previous]:
+            del series_threads[key]
+        state_store.replace_threads({previous}, {})
+    if config.thread_channel_id:
+        run_in_background(build_thread_index({config.thread_channel_id}))
+    
+    if kanal:
+        await ctx.send(f"✅ Seri thread'leri {kanal.mention} kanalında açılacak.")
+    else:
+        await ctx.send("🔕 Seri thread duyuruları kapatıldı.")
+
+
+@ayar.command(name="seri")
+async def ayar_seri(ctx, islem: str = None, *, seri_adi: str = None):
+    """Sunucuda duyurulacak serileri sınırlar: ekle / cikar / hepsi"""
+    islem = search_key(islem or "")
+    config = editable_guild_config(ctx.guild.id)
+    
+    if islem == "hepsi":
+        config.series = frozenset()
+        save_guild_config(config)
+        await ctx.send("✅ Tüm seriler duyurulacak.")
+        return
+    
+    if islem not in ("ekle", "cikar") or not seri_adi:
+        await ctx.send("❌ Kullanım: `++ayar seri ekle <seri>` · `++ayar seri cikar <seri>` · `++ayar seri hepsi`")
+        return
+    
+    await fetch_zebzetoon_data()
+    series_info, suggestions = find_series(seri_adi)
+    if not series_info:
+        await ctx.send(not_found_message(seri_adi, suggestions))
+        return
+    
+    key = search_key(series_info.isim)
+    if islem == "ekle":
+        config.series = config.series | {key}
+        save_guild_config(config)
+        await ctx.send(f"✅ **{series_info.isim}** duyurulacaklar listesine eklendi ({len(config.series)} seri).")
+    elif key in config.series:
+        config.series = config.series - {key}
+        save_guild_config(config)
+        remaining = f"{len(config.series)} seri" if config.series else "liste boş, tüm seriler duyurulacak"
+        await ctx.send(f"✅ **{series_info.isim}** listeden çıkarıldı ({remaining}).")
+    else:
+        await ctx.send(f"ℹ️ **{series_info.isim}** zaten listede değil.")
+
+
+@ayar.error
+@ayar_kanal.error
+@ayar_thread.error
+@ayar_seri.error
+async def ayar_error(ctx, error):
+    if isinstance(error, commands.NoPrivateMessage):
+        await ctx.send("❌ Bu komut sadece sunucularda kullanılabilir.")
+    elif isinstance(error, commands.MissingPermissions):
+        await ctx.send("❌ Bu komut için **Sunucuyu Yönet** yetkisi gerekli.")
+    elif isinstance(error, commands.ChannelNotFound):
+        await ctx.send(f"❌ Kanal bulunamadı: {error.argument}")
+    else:
+        raise error
+
+
+# ───────────────────────────────────────────────
+# ++durum KOMUTU
+# ───────────────────────────────────────────────
+def hit_ratio(hits, total):
+    """İsabet oranı - henüz istek yoksa None (metrik yazılmaz)"""
+    return hits / total if total else None
+
+
+def register_gauges():
+    """Okunma anında hesaplanan durum metrikleri ve nesnelerin tuttuğu sayaçlar"""
+    metrics.counter('zebzetoon_cache_hits_total', lambda: series_cache.hits)
+    metrics.counter('zebzetoon_cache_stale_hits_total', lambda: series_cache.stale_hits)
+    metrics.counter('zebzetoon_cache_misses_total', lambda: series_cache.misses)
+    metrics.counter('zebzetoon_render_cache_hits_total', lambda: render_cache.hits)
+    metrics.counter('zebzetoon_render_cache_misses_total', lambda: render_cache.misses)
+    metrics.counter('zebzetoon_delivery_delivered_total', lambda: delivery_queue.delivered)
+    metrics.counter('zebzetoon_delivery_failed_total', lambda: delivery_queue.failed)
+    metrics.counter('zebzetoon_delivery_retries_total', lambda: delivery_queue.retries)
+    
+    # Bayat veri de cache'ten hemen döner - isabet sayılır
+    metrics.gauge('zebzetoon_cache_hit_ratio', lambda: hit_ratio(
+        series_cache.hits + series_cache.stale_hits,
+        series_cache.hits + series_cache.stale_hits + series_cache.misses,
+    ))
+    metrics.gauge('zebzetoon_render_cache_hit_ratio', lambda: hit_ratio(
+        render_cache.hits, render_cache.hits + render_cache.misses,
+    ))
+    metrics.gauge('zebzetoon_catalog_series', lambda: len(series_cache))
+    metrics.gauge('zebzetoon_catalog_age_seconds', lambda: series_cache.age)
+    metrics.gauge('zebzetoon_tracked_chapters', lambda: len(last_chapters))
+    metrics.gauge('zebzetoon_render_cache_entries', lambda: len(render_cache.entries))
+    metrics.gauge('zebzetoon_cover_cache_entries', lambda: len(cover_checker))
+    metrics.gauge('zebzetoon_cover_broken', lambda: cover_checker.broken)
+    metrics.gauge('zebzetoon_unlock_pending', lambda: unlock_scheduler.live)
+    metrics.gauge('zebzetoon_delivery_depth', lambda: delivery_queue.depth)
+    metrics.gauge('zebzetoon_delivery_undelivered', lambda: len(delivery_queue.undelivered))
+    metrics.gauge('zebzetoon_poll_interval_seconds', lambda: poll_scheduler.interval)
+    metrics.gauge('zebzetoon_gateway_latency_seconds', lambda: client.latency if client.is_ready() else None)
+
+
+register_gauges()
+
+
+def format_latency(histogram):
+    """Histogramdaki son ölçümlerden p50/p95 özeti"""
+    if not histogram.count:
+        return "—"
+    return f"p50 {histogram.quantile(0.5) * 1000:.0f} ms · p95 {histogram.quantile(0.95) * 1000:.0f} ms"
+
+
+@client.command()
+@commands.has_permissions(administrator=True)
+async def durum(ctx):
+    """++durum - Bot sağlık özeti (sadece yöneticiler)"""
+    queue = delivery_queue.stats()
+    poll = poll_scheduler.status()
+    
+    embed = discord.Embed(title="📊 ZebzeToon Bot Durumu", color=0x45B7D1)
+    
+    catalog = f"**Seri:** {len(series_cache)}\n"
+    if series_cache.age is not None:
+        catalog += f"**Yaş:** {series_cache.age:.0f} sn\n"
+    catalog += f"**Cache:** {series_cache.hits} isabet · {series_cache.stale_hits} bayat · {series_cache.misses} ıska\n"
+    if series_cache.last_error:
+        catalog += f"**Son hata:** {shorten(str(series_cache.last_error), 100)}\n"
+    embed.add_field(name="📚 Katalog", value=catalog, inline=False)
+    
+    origins = "\n".join(
+        f"{ORIGIN_STATE_ICONS[origin.state]} **{origin.name}** · "
+        + (f"{origin.latency * 1000:.0f} ms · " if origin.latency is not None else "")
+        + f"{origin.successes}/{origin.requests} başarılı"
+        for origin in catalog_fetcher.origins
+    )
+    embed.add_field(name="🛰️ Kaynaklar", value=origins, inline=False)
+    
+    embed.add_field(name="🌐 CSV indirme", value=format_latency(metrics.histogram('zebzetoon_csv_fetch_seconds')), inline=True)
+    embed.add_field(name="🧮 Parse", value=format_latency(metrics.histogram('zebzetoon_csv_parse_seconds')), inline=True)
+    embed.add_field(name="⏱️ Loop gecikmesi", value=format_latency(metrics.histogram('zebzetoon_loop_lag_seconds')), inline=True)
+    
+    embed.add_field(
+        name="📨 Teslimat",
+        value=(
+            f"**Kuyruk:** {queue['depth']} · **Teslim:** {queue['delivered']} · "
+            f"**Hata:** {queue['failed']} · **Tekrar:** {queue['retries']}\n"
+            f"**Bekleyen bölüm:** {len(delivery_queue.undelivered)}\n"
+            f"**DM:** {dm_fanout.sent} gönderildi · {dm_fanout.blocked} ulaşılamadı · {dm_fanout.pruned} takipçi silindi"
+        ),
+        inline=False,
+    )
+    
+    if BOT_MODE == 'gateway':
+        consumer = event_consumer.status()
+        embed.add_field(
+            name="📥 Olay kuyruğu",
+            value=f"**Kayıt:** {consumer['records']} · **Okunmamış:** {consumer['lag']} bayt · **Onaylı ofset:** {consumer['acked']}",
+            inline=False,
+        )
+    else:
+        next_run = poll['next_run'][11:19] if poll['next_run'] else "—"
+        embed.add_field(
+            name="🔁 Kontrol",
+            value=f"**Aralık:** {poll['interval']:.0f} sn · **Sonraki:** {next_run} · **Hata:** {poll['failures']}",
+            inline=False,
+        )
+    
+    if unlock_scheduler.running:
+        upcoming = unlock_scheduler.next_unlock
+        if upcoming:
+            when, series_name, chapter = upcoming
+            next_unlock = f"{series_name} - Bölüm {chapter} <t:{int(when)}:R>"
+        else:
+            next_unlock = "—"
+        embed.add_field(
+            name="🔓 Kilit açılışları",
+            value=f"**Planlı:** {unlock_scheduler.live} · **Duyurulan:** {unlock_scheduler.fired}\n**Sıradaki:** {next_unlock}",
+            inline=False,
+        )
+    
+    embed.set_footer(
+        text=f"Gateway gecikmesi: {client.latency * 1000:.0f} ms · "
+        f"{client.shard_count or 1} shard · {len(client.guilds)} sunucu · "
+        f"{len(active_guild_configs())} duyuru ayarı"
+    )
+    await ctx.send(embed=embed)
+
+
+@durum.error
+async def durum_error(ctx, error):
+    if isinstance(error, commands.MissingPermissions):
+        await ctx.send("❌ Bu komut için yönetici yetkisi gerekli.")
+    else:
+        raise error
 
 
 # ───────────────────────────────────────────────
 # BOT BAŞLAT
 # ───────────────────────────────────────────────
 if __name__ == "__main__":
-    if not DISCORD_TOKEN:
+    if BOT_MODE not in ("all", "poller", "gateway"):
+        print(f"HATA: Geçersiz BOT_MODE: {BOT_MODE} (all, poller veya gateway olmalı)")
+    elif BOT_MODE == "poller":
+        asyncio.run(run_poller())
+    elif BOT_MODE == "gateway" and not event_queue.claim():
+        print(f"HATA: {event_queue.path} kuyruğunu başka bir gateway süreci okuyor (tek gateway desteklenir)")
+    elif not DISCORD_TOKEN:
         print("HATA: DISCORD_TOKEN environment variable tanımlı değil!")
     else:
         client.run(DISCORD_TOKEN)
@@ -0,0 +1,285 @@
+"""
+Kaydedilmiş katalog geçmişini (CATALOG_HISTORY_PATH) çevrimdışı yeniden oynatır.
+
+Her CSV sürümü kayıt sırasıyla bot'un gerçek parse / diff / duyuru yolundan geçirilir;
+Discord yerine gönderilen mesajları kaydeden sahte kanallar kullanılır. Sürümler arası
+bekleme yapılmaz (--speed ile gerçek zamanın katı hızında oynatılabilir).
+Kaçırılan bölüm, çift duyuru veya yanlış thread gibi olayları yeniden üretmek ve aylarca
+süren geçmişi saniyeler içinde ölçmek için kullanılır.
+
+Replay ağa çıkmaz ve aynı geçmiş için hep aynı çıktıyı verir:
+- Kapak kontrolü (HEAD istekleri) yapılmaz; kapak durumu --state kopyasından okunur,
+  bilinmeyen kapaklar bot'taki gibi kullanılabilir sayılır
+- Kilit açılış zamanlayıcısı (UNLOCK_INTERVAL) çalıştırılmaz, kilit açılış duyuruları
+  replay kapsamı dışındadır
+
+Kullanım:
+    python replay.py zebzetoon_history.db
+    python replay.py zebzetoon_history.db --since 2024-05-01 --state zebzetoon_state.db --messages
+    python replay.py zebzetoon_history.db --mode webhook --guilds 3 --output replay_output.txt
+"""
+import os
+import sys
+import json
+import time
+import sqlite3
+import asyncio
+import tempfile
+import argparse
+from collections import Counter
+from datetime import datetime
+
+import main
+from benchmark import FakeRest, FakeChannel, FakeGuild, FakeWebhook, skip_commands
+
+
+# ───────────────────────────────────────────────
+# SAHTE DISCORD (KAYIT EDEN)
+# ───────────────────────────────────────────────
+class Sink:
+    """Tüm sahte kanallara gönderilen mesajları sanal zamanla birlikte toplar"""
+
+    def __init__(self):
+        self.rest = FakeRest()
+        self.now = None
+        self.messages = []
+
+    def log(self, channel_id, thread_id, kwargs):
+        embeds = kwargs.get("embeds") or [kwargs.get("embed")]
+        self.messages.append({
+            "time": datetime.fromtimestamp(self.now).isoformat(timespec="seconds"),
+            "channel": channel_id,
+            "thread": thread_id,
+            "series": [embed_label(embed) for embed in embeds if embed is not None],
+        })
+
+
+class SinkChannel(FakeChannel):
+    def __init__(self, sink, channel_id, guild=None, parent_id=None):
+        super().__init__(sink.rest, channel_id, guild)
+        self.sink = sink
+        self.parent_id = parent_id
+
+    async def send(self, content=None, **kwargs):
+        if self.parent_id is None:
+            self.sink.log(self.id, None, kwargs)
+        else:
+            self.sink.log(self.parent_id, self.id, kwargs)
+        return await super().send(content, **kwargs)
+
+
+class SinkGuild(FakeGuild):
+    def __init__(self, sink, guild_id):
+        super().__init__(sink.rest, guild_id)
+        self.sink = sink
+
+    def get_thread(self, thread_id):
+        if thread_id not in self.threads:
+            parent_id = thread_parents.get(thread_id)
+            self.threads[thread_id] = SinkChannel(self.sink, thread_id, self, parent_id)
+        return self.threads[thread_id]
+
+
+class SinkWebhook(FakeWebhook):
+    async def send(self, thread=None, **kwargs):
+        # Kanal mesajlarında thread discord.utils.MISSING gelir
+        self.channel.sink.log(self.channel.id, getattr(thread, "id", None), kwargs)
+        await super().send(thread=thread, **kwargs)
+
+
+def embed_label(embed):
+    """Duyuru embed'inden "Seri · Bölüm" etiketi"""
+    values = {field.name: field.value.strip("`") for field in embed.fields}
+    if "📚 Seri" in values:
+        return f"{values['📚 Seri']} · {values.get('📄 Bölüm', '?')}"
+    return embed.title
+
+
+# {thread_id: üst kanal} - replay boyunca her seriye sabit bir thread atanır
+thread_parents = {}
+
+
+def assign_threads(series_data, parent_ids):
+    """Henüz thread'i olmayan serilere sahte thread açar (thread oluşturma akışı ölçüm dışı)"""
+    for parent_id in parent_ids:
+        for series_info in series_data.values():
+            key = (parent_id, main.thread_key(series_info.isim))
+            if key not in main.series_threads:
+                thread_id = parent_id * 1_000_000 + len(thread_parents)
+                main.series_threads[key] = thread_id
+                thread_parents[thread_id] = parent_id
+
+
+# ───────────────────────────────────────────────
+# GEÇMİŞTEN OKUYAN KAYNAK
+# ───────────────────────────────────────────────
+class ReplayFetcher:
+    """CatalogFetcher yerine geçer: o anki kayıtlı sürümü döndürür, aynıysa 304"""
+
+    def __init__(self, recorder):
+        self.recorder = recorder
+        self.current = None
+
+    async def fetch(self, digest=None):
+        if digest == self.current:
+            return main.FetchResult(None, 304)
+
+        spool = tempfile.SpooledTemporaryFile(max_size=main.CSV_SPOOL_SIZE)
+        spool.write(self.recorder.load(self.current))
+        spool.seek(0)
+        return main.FetchResult(None, 200, spool, self.current)
+
+    def validators(self):
+        return {}
+
+
+# ───────────────────────────────────────────────
+# YENİDEN OYNATMA
+# ───────────────────────────────────────────────
+def parse_date(value):
+    return datetime.fromisoformat(value).timestamp() if value else None
+
+
+def load_state(path):
+    """Bot'un durum veritabanını bellekteki bir kopyaya alır - asıl dosyaya yazılmaz"""
+    store = main.StateStore(":memory:")
+    if path:
+        source = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+        source.backup(store.conn)
+        source.close()
+    return store
+
+
+async def drain():
+    """Kuyruktaki tüm duyurular teslim edilene kadar bekler"""
+    while main.delivery_queue.depth or main.delivery_queue.in_flight:
+        await asyncio.sleep(0.001)
+
+
+async def run(args):
+    if not os.path.exists(args.history):
+        raise SystemExit(f"{args.history} bulunamadı")
+
+    recorder = main.CatalogRecorder(args.history)
+    history = recorder.history(parse_date(args.since), parse_date(args.until))
+    if not history:
+        raise SystemExit(f"{args.history}: bu aralıkta kayıtlı sürüm yok")
+
+    # Gerçek kaynaklar, kapak kontrolleri, diske yazılan dosyalar ve Discord devre dışı
+    fetcher = ReplayFetcher(recorder)
+    main.catalog_fetcher = fetcher
+    main.catalog_recorder = None
+    main.SNAPSHOT_PATH = None
+    main.state_store = load_state(args.state)
+    main.cover_checker.restore(main.state_store.load_covers())
+    main.cover_checker.schedule = lambda url, series_name, force=False: None
+    main.client.process_commands = skip_commands
+    main.ANNOUNCE_MODE = args.mode
+
+    sink = Sink()
+    guilds = {}
+    for guild_id in range(1, args.guilds + 1):
+        guild = SinkGuild(sink, guild_id)
+        for channel_id in (guild_id * 100, guild_id * 100 + 1):
+            guild.channels[channel_id] = SinkChannel(sink, channel_id, guild)
+        guilds[guild_id] = guild
+        main.guild_configs[guild_id] = main.GuildConfig(guild_id, guild_id * 100, guild_id * 100 + 1)
+    main.client.get_guild = guilds.get
+
+    async def get_webhook(channel):
+        return SinkWebhook(channel)
+
+    main.webhook_cache.get = get_webhook
+
+    delivered = Counter()
+    on_delivered = main.delivery_queue.on_delivered
+
+    def track_delivery(announcement):
+        delivered[announcement.series_name, announcement.chapter, announcement.kind] += 1
+        on_delivered(announcement)
+
+    main.delivery_queue.on_delivered = track_delivery
+
+    parent_ids = [guild_id * 100 + 1 for guild_id in guilds]
+    main.last_chapters.update(main.state_store.load_chapters())
+    seeded = bool(main.last_chapters)
+
+    started = time.perf_counter()
+    previous = None
+    changes = 0
+    try:
+        for timestamp, digest in history:
+            if args.speed and previous is not None:
+                await asyncio.sleep((timestamp - previous) / args.speed)
+            previous = timestamp
+            sink.now = timestamp
+            fetcher.current = digest
+
+            if not seeded:
+                # Durum verilmediyse ilk sürüm ilk kurulum gibi duyurulmadan kaydedilir
+                series_data = await main.fetch_zebzetoon_data(force=True)
+                for series_info in series_data.values():
+                    if series_info.son_bolum:
+                        main.last_chapters[series_info.isim] = series_info.son_bolum
+                main.last_snapshot, main.last_snapshot_digest = series_data, digest
+                seeded = True
+                continue
+
+            assign_threads(await main.fetch_zebzetoon_data(force=True), parent_ids)
+            if await main.check_new_chapters():
+                changes += 1
+            await drain()
+    finally:
+        await main.close_http_session()
+        recorder.close()
+
+    elapsed = time.perf_counter() - started
+    report = {
+        "history": recorder.path,
+        "from": datetime.fromtimestamp(history[0][0]).isoformat(timespec="seconds"),
+        "to": datetime.fromtimestamp(history[-1][0]).isoformat(timespec="seconds"),
+        "versions": len(history),
+        "changed_versions": changes,
+        "mode": args.mode,
+        "guilds": args.guilds,
+        "announcements": sum(delivered.values()),
+        "duplicate_announcements": [
+            {"series": series_name, "chapter": chapter, "kind": kind, "count": count}
+            for (series_name, chapter, kind), count in delivered.items() if count > 1
+        ],
+        "undelivered": dict(main.delivery_queue.undelivered),
+        "rest_calls": sink.rest.calls,
+        "seconds": elapsed,
+    }
+    if args.messages:
+        report["messages"] = sink.messages
+    return report
+
+
+# ───────────────────────────────────────────────
+# BAŞLAT
+# ───────────────────────────────────────────────
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="ZebzeToon katalog geçmişi replay")
+    parser.add_argument("history", help="CATALOG_HISTORY_PATH ile kaydedilen geçmiş veritabanı")
+    parser.add_argument("--since", help="Bu tarihten itibaren (ISO, ör. 2024-05-01)")
+    parser.add_argument("--until", help="Bu tarihe kadar (ISO)")
+    parser.add_argument("--state", help="Başlangıç durumu olarak bot'un durum veritabanı (salt okunur kopyalanır)")
+    parser.add_argument("--mode", choices=["bot", "webhook"], default="bot", help="Duyuru yolu (ANNOUNCE_MODE)")
+    parser.add_argument("--guilds", type=int, default=1, help="Sahte sunucu sayısı")
+    parser.add_argument("--speed", type=float, default=0, help="Gerçek zamanın katı (0: beklemeden)")
+    parser.add_argument("--messages", action="store_true", help="Gönderilen tüm mesajları rapora ekle")
+    parser.add_argument("--output", help="JSON raporun yazılacağı dosya (varsayılan: stdout)")
+    args = parser.parse_args()
+
+    # Rapor çıktısını bot loglarından ayır
+    sys.stdout, log_stream = open(os.devnull, "w"), sys.stdout
+    report = asyncio.run(run(args))
+    sys.stdout = log_stream
+
+    output = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output)
+    else:
+        print(output)
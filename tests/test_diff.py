@@ -0,0 +1,126 @@
+"""diff_snapshots: fixture CSV sürümleri arasındaki tipli event'ler"""
+import os
+import time
+from dataclasses import replace
+
+import main
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures")
+
+
+def load_catalog(name):
+    with open(os.path.join(FIXTURES, name), encoding="utf-8-sig", newline="") as f:
+        return main.parse_zebzetoon_csv(f)
+
+
+def events_by_type(events):
+    grouped = {}
+    for event in events:
+        grouped.setdefault(type(event), []).append(event)
+    return grouped
+
+
+def test_unchanged_snapshot_produces_no_events():
+    before = load_catalog("catalog_before.csv")
+    assert main.diff_snapshots(before, before) == []
+    assert main.diff_snapshots(before, load_catalog("catalog_before.csv")) == []
+
+
+def test_fixture_diff_events():
+    before = load_catalog("catalog_before.csv")
+    after = load_catalog("catalog_after.csv")
+    events = events_by_type(main.diff_snapshots(before, after))
+
+    assert set(events) == {
+        main.NewSeries,
+        main.SeriesRemoved,
+        main.ChapterBump,
+        main.StatusChange,
+        main.CoverChange,
+        main.LockChange,
+    }
+
+    [new_series] = events[main.NewSeries]
+    assert new_series.series.isim == "Yeni Yıldız"
+    assert new_series.series.ozet == "Özet\niki satır"
+
+    [removed] = events[main.SeriesRemoved]
+    assert removed.series.isim == "Eski Seri"
+
+    bumps = {event.series.isim: event for event in events[main.ChapterBump]}
+    assert set(bumps) == {"Ölüm Paktı", "Kayıp Krallık"}
+    # Çok bölümlü atlama 8 -> 11: 9-11 aralığı duyurulur
+    assert (bumps["Ölüm Paktı"].old_chapter, bumps["Ölüm Paktı"].new_chapter) == (8, 11)
+    assert bumps["Ölüm Paktı"].chapter_range == (9, 11)
+    assert bumps["Kayıp Krallık"].chapter_range == 6
+
+    [status] = events[main.StatusChange]
+    assert (status.series.isim, status.old_status, status.new_status) == ("Kayıp Krallık", "Devam Ediyor", "Ara Verildi")
+
+    [cover] = events[main.CoverChange]
+    assert (cover.old_cover, cover.new_cover) == ("kapaklar/kayip.jpg", "kapaklar/kayip-yeni.jpg")
+
+    [lock] = events[main.LockChange]
+    assert lock.series.isim == "Işık Şövalyesi"
+    assert (lock.old_locked, lock.new_locked, lock.old_count, lock.new_count) == (True, True, 2, 3)
+
+
+def test_events_round_trip_through_queue_encoding():
+    before = load_catalog("catalog_before.csv")
+    after = load_catalog("catalog_after.csv")
+    for event in main.diff_snapshots(before, after):
+        assert main.decode_event(main.encode_event(event)) == event
+
+
+def test_date_change_on_locked_series_is_lock_change():
+    before = load_catalog("catalog_before.csv")
+    after = dict(before)
+    after["Işık Şövalyesi"] = replace(before["Işık Şövalyesi"], tarih=before["Işık Şövalyesi"].tarih + 86400)
+    # Kilitsiz seride Tarih açılış planını etkilemez
+    after["Sonsuz Kule"] = replace(before["Sonsuz Kule"], tarih=before["Sonsuz Kule"].tarih + 86400)
+
+    [lock] = main.diff_snapshots(before, after)
+    assert isinstance(lock, main.LockChange)
+    assert lock.series.isim == "Işık Şövalyesi"
+    assert lock.new_date - lock.old_date == 86400
+
+
+def test_replan_all_follows_current_catalog(monkeypatch):
+    monkeypatch.setattr(main, "state_store", main.StateStore(":memory:"))
+    now = time.time()
+    scheduler = main.UnlockScheduler(3600)
+    stale = {"Işık Şövalyesi": replace(load_catalog("catalog_before.csv")["Işık Şövalyesi"], tarih=now)}
+    scheduler.replan_all(stale)
+    assert scheduler.live == 2
+
+    # Bot kapalıyken kilit sayısı ve tarih değişmiş
+    fresh = {"Işık Şövalyesi": replace(stale["Işık Şövalyesi"], tarih=now + 600, kilitliBolumSayisi=3)}
+    scheduler.replan_all(fresh)
+    assert scheduler.live == 3
+    assert [when for when, _ in scheduler.planned["Işık Şövalyesi"]] == [now + 600 + 3600 * i for i in (1, 2, 3)]
+
+
+def test_overdue_unlocks_fire_once_after_restart(monkeypatch):
+    monkeypatch.setattr(main, "state_store", main.StateStore(":memory:"))
+    now = time.time()
+    # 1-20, son 3 bölüm kilitli: 18 ve 19'un açılışı bot kapalıyken geçmiş, 20 ileride
+    series_info = replace(load_catalog("catalog_before.csv")["Işık Şövalyesi"], kilitliBolumSayisi=3, tarih=now - 2.5 * 3600)
+
+    # Hiç açılış kaydı yok: geçmiş açılışlar duyurulmadan kaydedilir
+    fresh = main.UnlockScheduler(3600)
+    fresh.replan_all({series_info.isim: series_info})
+    assert fresh.unlocked[series_info.isim] == 19
+    assert main.state_store.load_unlocks() == {series_info.isim: 19}
+    assert [chapter for _, chapter in fresh.planned[series_info.isim]] == [20]
+
+    # 17'ye kadar duyurulmuş: kaçırılan 18-19 tek kayıtla hemen açılır, 20 planlanır
+    scheduler = main.UnlockScheduler(3600)
+    scheduler.unlocked = {series_info.isim: 17}
+    scheduler.replan_all({series_info.isim: series_info})
+    assert [chapter for _, chapter in scheduler.planned[series_info.isim]] == [19, 20]
+    assert scheduler._pop_due(time.time()) == [(series_info.isim, 19)]
+
+    # Duyurulmuş bölümler tekrar planlanmaz
+    scheduler.unlocked[series_info.isim] = 19
+    scheduler.replan_all({series_info.isim: series_info})
+    assert [chapter for _, chapter in scheduler.planned[series_info.isim]] == [20]
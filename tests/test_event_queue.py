@@ -0,0 +1,50 @@
+"""EventQueue: onaylanan kuyruk dosyasının boşaltılması"""
+import main
+
+
+def test_truncate_only_when_fully_read(tmp_path):
+    queue = main.EventQueue(str(tmp_path / "events.jsonl"))
+    queue.append({"events": [1]})
+    [(first_end, _)] = queue.read(0)
+    queue.append({"events": [2]})
+
+    resets = []
+    # Okunmamış kayıt varken dosyaya dokunulmaz
+    assert not queue.truncate(first_end, lambda: resets.append(0))
+    assert resets == [] and queue.size() > first_end
+
+    end = queue.read(first_end)[-1][0]
+    assert queue.truncate(end, lambda: resets.append(0))
+    assert resets == [0] and queue.size() == 0
+
+    # Sonraki kayıt baştan yazılır
+    queue.append({"events": [3]})
+    assert [record for _, record in queue.read(0)] == [{"events": [3]}]
+
+
+def test_consumer_resets_offset_after_compaction(tmp_path, monkeypatch):
+    monkeypatch.setattr(main, "state_store", main.StateStore(":memory:"))
+    queue = main.EventQueue(str(tmp_path / "events.jsonl"))
+    queue.append({"events": []})
+    consumer = main.EventConsumer(queue, 1)
+    consumer.offset = queue.read(0)[-1][0]
+
+    # Onaylanmadan boşaltılmaz
+    consumer.compact()
+    assert queue.size() == consumer.offset
+
+    consumer.ack()
+    assert main.state_store.get_meta('event_queue_offset') == str(consumer.offset)
+    consumer.compact()
+    assert (consumer.offset, consumer.acked, queue.size()) == (0, 0, 0)
+    assert main.state_store.get_meta('event_queue_offset') == '0'
+
+
+def test_second_reader_cannot_claim_queue(tmp_path):
+    path = str(tmp_path / "events.jsonl")
+    first = main.EventQueue(path)
+    assert first.claim()
+    assert not main.EventQueue(path).claim()
+
+    first._reader_lock.close()
+    assert main.EventQueue(path).claim()
@@ -0,0 +1,128 @@
+"""CatalogFetcher: yerel sunuculara karşı hedging, devre kesici ve koşullu istek"""
+import time
+import asyncio
+
+import main
+from benchmark import CatalogServer, generate_catalog
+
+
+def run_with_servers(count, scenario):
+    """count adet yerel liste.csv sunucusu açıp senaryoyu çalıştırır"""
+    async def runner():
+        servers = [CatalogServer() for _ in range(count)]
+        for server in servers:
+            server.body = generate_catalog(20)
+            await server.start()
+        try:
+            await scenario(*servers)
+        finally:
+            await main.close_http_session()
+            for server in servers:
+                await server.stop()
+
+    asyncio.run(runner())
+
+
+def test_slow_primary_is_hedged_to_mirror():
+    async def scenario(primary, mirror):
+        primary.delay = 1.0
+        fetcher = main.CatalogFetcher([primary.url, mirror.url], hedge_delay=0.1)
+
+        started = time.perf_counter()
+        result = await fetcher.fetch()
+        elapsed = time.perf_counter() - started
+
+        assert result.status == 200
+        assert result.origin is fetcher.origins[1]
+        assert elapsed < primary.delay
+        assert (primary.requests, mirror.requests) == (1, 1)
+        result.spool.close()
+
+    run_with_servers(2, scenario)
+
+
+def test_failing_origin_falls_through_to_mirror():
+    async def scenario(primary, mirror):
+        primary.fail_next = 1
+        fetcher = main.CatalogFetcher([primary.url, mirror.url], hedge_delay=5)
+
+        result = await fetcher.fetch()
+
+        assert result.origin is fetcher.origins[1]
+        assert fetcher.origins[0].errors == 1
+        assert fetcher.origins[0].state == 'closed'
+        result.spool.close()
+
+    run_with_servers(2, scenario)
+
+
+def test_breaker_opens_then_half_opens(monkeypatch):
+    monkeypatch.setattr(main, "BREAKER_COOLDOWN", 0.2)
+
+    async def scenario(primary, mirror):
+        primary.fail_next = main.BREAKER_FAILURES
+        fetcher = main.CatalogFetcher([primary.url, mirror.url], hedge_delay=5)
+        origin = fetcher.origins[0]
+
+        for _ in range(main.BREAKER_FAILURES):
+            (await fetcher.fetch()).spool.close()
+        assert origin.state == 'open'
+
+        # Açık devre atlanır, istek doğrudan yedeğe gider
+        (await fetcher.fetch()).spool.close()
+        assert primary.requests == main.BREAKER_FAILURES
+
+        # Soğuma sonrası tek deneme isteği başarılıysa devre kapanır
+        await asyncio.sleep(main.BREAKER_COOLDOWN)
+        assert origin.state == 'half_open'
+        result = await fetcher.fetch()
+        assert result.origin is origin
+        assert origin.state == 'closed'
+        result.spool.close()
+
+    run_with_servers(2, scenario)
+
+
+def test_failed_probe_reopens_breaker(monkeypatch):
+    monkeypatch.setattr(main, "BREAKER_COOLDOWN", 0.2)
+
+    async def scenario(primary, mirror):
+        primary.fail_next = main.BREAKER_FAILURES + 1
+        fetcher = main.CatalogFetcher([primary.url, mirror.url], hedge_delay=5)
+        origin = fetcher.origins[0]
+
+        for _ in range(main.BREAKER_FAILURES):
+            (await fetcher.fetch()).spool.close()
+        await asyncio.sleep(main.BREAKER_COOLDOWN)
+        assert origin.state == 'half_open'
+
+        (await fetcher.fetch()).spool.close()
+        assert origin.state == 'open'
+
+    run_with_servers(2, scenario)
+
+
+def test_unchanged_catalog_returns_304():
+    async def scenario(server):
+        fetcher = main.CatalogFetcher([server.url], hedge_delay=5)
+
+        first = await fetcher.fetch()
+        assert first.status == 200
+        first.spool.close()
+
+        second = await fetcher.fetch(first.digest)
+        assert second.status == 304
+        assert second.spool is None
+
+        # Farklı bir sürüm elimizdeyse doğrulayıcı gönderilmez, gövde tekrar gelir
+        third = await fetcher.fetch("baska-surum")
+        assert third.status == 200
+        third.spool.close()
+
+        server.body = generate_catalog(20, bump=1)
+        fourth = await fetcher.fetch(first.digest)
+        assert fourth.status == 200
+        assert fourth.digest != first.digest
+        fourth.spool.close()
+
+    run_with_servers(1, scenario)
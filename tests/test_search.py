@@ -0,0 +1,12 @@
+"""SearchIndex: isim ile anahtarlanan katalogda normalize anahtar çözümleme"""
+from test_diff import load_catalog
+
+import main
+
+
+def test_title_resolves_normalized_keys():
+    index = main.SearchIndex(load_catalog("catalog_before.csv"))
+    assert index.title(main.search_key("Ölüm Paktı")) == "Ölüm Paktı"
+    assert index.title("olum pakti") == "Ölüm Paktı"
+    assert index.title("yok boyle seri") is None
+    assert index.get("OLUM PAKTI").isim == "Ölüm Paktı"